@@ -0,0 +1,48 @@
+"""
+Compara as engines de histórico (pydriller x git) num clone local.
+
+    python benchmarks/bench_history.py /caminho/do/clone --since_months 24
+"""
+import argparse
+import time
+from datetime import datetime
+
+import pandas as pd
+from dateutil.relativedelta import relativedelta
+from pydriller import Repository
+
+from itdepends.git_history import analyze_repository_git_history
+from itdepends.history import analyze_repository_commit_history
+
+def run_pydriller(path, since):
+    repo = Repository(path, since=since, only_modifications_with_file_types=['.txt', '.toml', '.pip'])
+    return analyze_repository_commit_history(repo, path)
+
+def run_git(path, since):
+    return analyze_repository_git_history(path, path, since=since)
+
+def timed(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - start
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("path", help="Local clone to analyze")
+    parser.add_argument("--since_months", type=int, default=12)
+    args = parser.parse_args()
+
+    since = datetime.now() - relativedelta(months=args.since_months)
+
+    pydriller_df, pydriller_time = timed(run_pydriller, args.path, since)
+    git_df, git_time = timed(run_git, args.path, since)
+
+    print(f"pydriller: {pydriller_time:8.2f}s  {len(pydriller_df)} records")
+    print(f"git:       {git_time:8.2f}s  {len(git_df)} records")
+    print(f"speedup:   {pydriller_time / git_time:8.1f}x")
+
+    pd.testing.assert_frame_equal(git_df, pydriller_df)
+    print("outputs identical")
+
+if __name__ == "__main__":
+    main()
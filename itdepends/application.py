@@ -1,54 +1,322 @@
-from .history import analyze_repository_commit_history
-from .deprecation import full_deprecation_analysis
-from .utils import create_results_directories, save_to_csv
+from .history import iter_commit_history_records
+from .git_history import iter_history_records
+from .clone_manager import local_repository, MirrorCache, SharedObjectStore, DEFAULT_MIRROR_MAX_BYTES
+from .history_jobs import iter_history_parallel
+from .change_events import iter_git_events
+from .dependency_query import dependency_timeline
+from .git_repo import GitError
+from .history_sampling import iter_baseline_history_records, iter_sampled_history_records, DEFAULT_SAMPLE_LAST
+from .history_sinks import (HistorySummary, OUTPUT_CSV, OUTPUT_PARQUET, iter_frame_records, open_history_sink,
+                            stream_history)
+from .columnar import deprecation_schema, find_result_file, load_history_columns, save_to_parquet
+from .history_checkpoint import HistoryCheckpoint, mine_history_incremental
+from .deprecation import full_deprecation_analysis, offline_deprecation_analysis, DEFAULT_CONCURRENCY, MANIFEST_SOURCE_API
+from .utils import create_results_directories, save_to_csv, results_path
 from .report import get_template_padrao, gerar_relatorio_dependencias
+from .integrations import GitHubClient, PyPiClient, ResponseCache
+from .snapshot import SnapshotDB
+from .blob_cache import BlobCache, DEFAULT_MAX_BYTES
+from .parse_memo import ParseMemo
+from .integrations.http_cache import DEFAULT_TTL_SECONDS
+from .integrations.github_api import DEFAULT_GRAPHQL_BATCH_SIZE
 
 from datetime import datetime
 from dateutil.relativedelta import relativedelta
 
 import click
+import pandas as pd
+from packaging.utils import canonicalize_name
 from pydriller import Repository
 
+import itertools
+import time
 import traceback
+from contextlib import ExitStack
+from dataclasses import dataclass, field
+from typing import Optional
 
-def run(repo_name, path, since_months, max_months):
-    repo_url = f"https://github.com/{repo_name}.git"
+HISTORY_BACKEND_PYDRILLER = "pydriller"
+HISTORY_BACKEND_GIT = "git"
+
+HISTORY_MODE_SNAPSHOT = "snapshot"
+HISTORY_MODE_EVENTS = "events"
+
+class AnalysisCancelled(Exception):
+    pass
+
+@dataclass(slots=True)
+class AnalysisResources:
+    """
+    Caches e clientes HTTP usados pelas etapas de run. O modo batch monta uma única
+    instância e a compartilha entre todos os repositórios.
+    """
+    cache: Optional[ResponseCache] = None
+    blob_cache: Optional[BlobCache] = None
+    parse_memo: ParseMemo = field(default_factory=ParseMemo)
+    mirror_cache: Optional[MirrorCache] = None
+    pypi: Optional[PyPiClient] = None
+    gh: Optional[GitHubClient] = None
+
+def build_resources(cache_dir=None, cache_ttl=DEFAULT_TTL_SECONDS, blob_cache_dir=None,
+                    blob_cache_bytes=DEFAULT_MAX_BYTES, mirror_dir=None, mirror_bytes=DEFAULT_MIRROR_MAX_BYTES,
+                    shared_objects_dir=None, shared_clients=False):
+    """
+    Caches e clientes a partir das opções da CLI. Com ``shared_clients`` os clientes
+    de PyPI/GitHub (e suas sessões keep-alive) são criados aqui e reaproveitados.
+    """
+    cache = ResponseCache(cache_dir, cache_ttl) if cache_dir else None
+    # Manifestos já parseados (nesta ou em execuções anteriores) não são parseados de novo
+    blob_cache = BlobCache(blob_cache_dir, blob_cache_bytes) if blob_cache_dir else None
+    shared_store = SharedObjectStore(shared_objects_dir) if shared_objects_dir else None
+    mirror_cache = MirrorCache(mirror_dir, mirror_bytes, shared_store=shared_store) if mirror_dir else None
     
-    if path:
-        repo_origin = path
-    else:
-        repo_origin = repo_url
+    return AnalysisResources(cache=cache,
+                             blob_cache=blob_cache,
+                             parse_memo=ParseMemo(blob_cache),
+                             mirror_cache=mirror_cache,
+                             pypi=PyPiClient(cache=cache) if shared_clients else None,
+                             gh=GitHubClient(cache=cache) if shared_clients else None)
+
+def check_cancelled(cancel):
+    if cancel is not None and cancel.is_set():
+        raise AnalysisCancelled("analysis cancelled")
+
+def cancellable(records, cancel):
+    """Repassa os registros, interrompendo a mineração assim que ``cancel`` é sinalizado."""
+    for record in records:
+        check_cancelled(cancel)
+        yield record
+
+def run(repo_name, path, since_months, max_months, cache_dir=None, cache_ttl=DEFAULT_TTL_SECONDS,
+        concurrency=DEFAULT_CONCURRENCY, graphql_batch_size=DEFAULT_GRAPHQL_BATCH_SIZE,
+        snapshot_db=None, manifest_source=MANIFEST_SOURCE_API, blob_cache_dir=None,
+        blob_cache_bytes=DEFAULT_MAX_BYTES, history_backend=HISTORY_BACKEND_PYDRILLER, jobs=1,
+        history_checkpoint_dir=None, history_mode=HISTORY_MODE_SNAPSHOT, output_format=OUTPUT_CSV,
+        full_clone=False, mirror_dir=None, mirror_bytes=DEFAULT_MIRROR_MAX_BYTES, shared_objects_dir=None,
+        sample=None, sample_last=DEFAULT_SAMPLE_LAST, baseline=False, resources=None, timings=None,
+        cancel=None):
+    """
+    Histórico, depreciação e relatório de um repositório. ``resources`` substitui os
+    caches montados a partir das opções; ``timings`` recebe a duração de cada etapa
+    (segundos), o número de registros do histórico e, se a análise falhar, a mensagem
+    do erro em ``error``. Quando o ``threading.Event`` ``cancel`` é sinalizado, a
+    análise para no próximo registro ou etapa.
+    """
+    repo_url = f"https://github.com/{repo_name}.git"
+    timings = timings if timings is not None else {}
         
     try:
         since_date = datetime.now() - relativedelta(months= since_months)
         
-        cloned_repo = Repository(repo_origin, since=since_date,
-                                only_modifications_with_file_types=['.txt','.toml', '.pip'])
-                
+        resources = resources or build_resources(cache_dir, cache_ttl, blob_cache_dir, blob_cache_bytes,
+                                                 mirror_dir, mirror_bytes, shared_objects_dir)
+        # Os parses são compartilhados com as outras análises do batch; as contagens, não
+        parse_memo = resources.parse_memo.view()
+        
         click.echo('Evaluating commits history...')
-        history_df = analyze_repository_commit_history(cloned_repo, repo_name)
+        started = time.perf_counter()
+        create_results_directories(repo_name)
+        output_name = 'history_events' if history_mode == HISTORY_MODE_EVENTS else 'history'
+        summary = HistorySummary()
         
+        with ExitStack() as stack:
+            records = history_records(stack, repo_name, path, repo_url, since_date, since_months, history_backend,
+                                      jobs, history_checkpoint_dir, history_mode, resources.blob_cache, parse_memo,
+                                      full_clone, resources.mirror_cache, sample, sample_last, baseline)
+            
+            # Os registros vão direto para o arquivo e para o resumo do relatório, sem DataFrame
+            sink, history_file = open_history_sink(output_format, results_path(repo_name, output_name))
+            with sink:
+                count = stream_history(cancellable(records, cancel), [sink, summary])
+        
+        timings['history'] = time.perf_counter() - started
+        timings['records'] = count
+        
+        click.echo(f'{count} history records saved in "{history_file}".')
+        if parse_memo.hits or parse_memo.misses:
+            click.echo(f'Manifest parses: {parse_memo.misses} distinct blobs, {parse_memo.hits} reused.')
+        
+        check_cancelled(cancel)
         click.echo('Analyzing last version dependencies...')
-        deprecation_df = full_deprecation_analysis(repo_name, max_months)
+        started = time.perf_counter()
+        if snapshot_db:
+            with SnapshotDB(snapshot_db) as snapshot:
+                deprecation_df = offline_deprecation_analysis(path, max_months, snapshot)
+        else:
+            deprecation_df = full_deprecation_analysis(repo_name, max_months, resources.cache, concurrency,
+                                                       graphql_batch_size, manifest_source, repo_path=path,
+                                                       blob_cache=resources.blob_cache, pypi=resources.pypi,
+                                                       gh=resources.gh)
+            
+            for quota in (resources.gh or GitHubClient()).rate_limit_status():
+                click.echo(f"GitHub {quota['resource']} quota ({quota['token']}): {quota['requests']} requests, "
+                           f"{quota['remaining']}/{quota['limit']} remaining")
+        
+        timings['deprecation'] = time.perf_counter() - started
         
+        check_cancelled(cancel)
         click.echo("Saving results and creating report...")
-        create_results_directories(repo_name)
-        save_to_csv(history_df, 'history', repo_name)
-        save_to_csv(deprecation_df, 'deprecation', repo_name)
+        started = time.perf_counter()
+        if output_format == OUTPUT_PARQUET:
+            save_to_parquet(deprecation_df, 'deprecation', repo_name, deprecation_schema(deprecation_df.columns))
+        else:
+            save_to_csv(deprecation_df, 'deprecation', repo_name)
                 
         template = get_template_padrao()
         
-        gerar_relatorio_dependencias(history_df,
+        gerar_relatorio_dependencias(None,
                                      deprecation_df,
                                      nome_projeto=repo_name,
                                      template_html=template,
-                                     output_path=f'results/{repo_name.replace('/', '_')}/report.html')
+                                     output_path=f'results/{repo_name.replace('/', '_')}/report.html',
+                                     resumo=summary)
+        
+        timings['report'] = time.perf_counter() - started
         
         click.echo(f'Report saved in "results/{repo_name.replace('/', '_')}/report.html".')
 
         return 0
     
+    except AnalysisCancelled as e:
+        click.echo(f'{repo_name}: {e}.', err=True)
+        timings['error'] = str(e)
+        return 1
+    
     except Exception as e:
         print("An unexpected error ocurred:", e)
         print(traceback.format_exc())
-        return 1
\ No newline at end of file
+        timings['error'] = f"{type(e).__name__}: {e}"
+        return 1
+
+def render_saved_report(repo_name):
+    """Refaz o relatório a partir dos resultados salvos em results/<owner_repo>/."""
+    directory = results_path(repo_name, "")
+    history_file = find_result_file(directory, 'history') or find_result_file(directory, 'history_events')
+    deprecation_file = find_result_file(directory, 'deprecation')
+    
+    if not history_file or not deprecation_file:
+        click.echo(f'No saved history/deprecation results in "{directory}".', err=True)
+        return 1
+    
+    history_df = load_history_columns(history_file)
+    # Eventos "removed" não têm versão nova
+    history_df = history_df[history_df['Versao'].notna()]
+    
+    if deprecation_file.endswith('.parquet'):
+        deprecation_df = pd.read_parquet(deprecation_file)
+    else:
+        deprecation_df = pd.read_csv(deprecation_file)
+    
+    output_path = results_path(repo_name, 'report.html')
+    gerar_relatorio_dependencias(history_df,
+                                 deprecation_df,
+                                 nome_projeto=repo_name,
+                                 template_html=get_template_padrao(),
+                                 output_path=output_path)
+    
+    click.echo(f'Report saved in "{output_path}".')
+    return 0
+
+def run_dependency_history(repo_name, path, package_name, since_months=None, mirror_dir=None):
+    """
+    Linha do tempo de uma única dependência (``itdepends history --dep``), salva em
+    results/<owner_repo>/dependency_<nome>.csv.
+    """
+    repo_url = f"https://github.com/{repo_name}.git"
+    since_date = datetime.now() - relativedelta(months=since_months) if since_months else None
+    mirror_cache = MirrorCache(mirror_dir) if mirror_dir else None
+    
+    try:
+        with local_repository(path, repo_url, since=since_date, mirror_cache=mirror_cache,
+                              repo_name=repo_name) as repo_path:
+            timeline = dependency_timeline(repo_path, repo_name, package_name, since_date)
+    except GitError as e:
+        click.echo(f'Could not read the repository history: {e}', err=True)
+        return 1
+    
+    if timeline.empty:
+        click.echo(f'No manifest change mentions "{package_name}".')
+        return 0
+    
+    def shown(version):
+        # Versões ausentes chegam do DataFrame como NaN, que é verdadeiro para o ``or``
+        return "-" if pd.isna(version) else version
+    
+    for event in timeline.itertuples(index=False):
+        change = f'{shown(event.Versao_Anterior)} -> {shown(event.Versao)}'
+        click.echo(f'{event.Data_Commit[:10]}  {event.Hash_Commit[:10]}  {event.file}  {event.Evento}: {change}')
+    
+    output_file = save_to_csv(timeline, f'dependency_{canonicalize_name(package_name)}', repo_name)
+    click.echo(f'{len(timeline)} changes saved in "{output_file}".')
+    return 0
+
+def history_records(stack, repo_name, path, repo_url, since_date, since_months, history_backend, jobs,
+                    history_checkpoint_dir, history_mode, blob_cache, parse_memo, full_clone=False,
+                    mirror_cache=None, sample=None, sample_last=DEFAULT_SAMPLE_LAST, baseline=False):
+    """
+    Iterador de registros do histórico conforme o modo e a engine escolhidos. Clones
+    temporários ficam abertos em ``stack`` até o fim do consumo.
+
+    ``baseline`` emite antes o estado dos manifestos no último commit anterior a
+    ``since_date``, sem percorrer o histórico mais antigo.
+
+    Todos os caminhos são lidos sob demanda, exceto ``history_checkpoint_dir``: o
+    checkpoint é regravado inteiro, na ordem da execução completa, então o histórico
+    da janela fica em memória (um único DataFrame, repassado linha a linha).
+    """
+    opened = []
+    
+    # O PyDriller lê os diffs pelo GitPython, blob a blob: num clone parcial cada um seria um fetch
+    uses_pydriller = (history_mode != HISTORY_MODE_EVENTS and not sample and not history_checkpoint_dir
+                      and jobs <= 1 and history_backend != HISTORY_BACKEND_GIT)
+    
+    def open_repository():
+        # Sem --path: clone parcial e raso, limitado à janela da análise, reaproveitado se houver espelho.
+        # Aberto uma única vez: o espelho fica bloqueado enquanto está em uso
+        if not opened:
+            opened.append(stack.enter_context(local_repository(path, repo_url,
+                                                               since=None if full_clone else since_date,
+                                                               partial=not (full_clone or uses_pydriller),
+                                                               mirror_cache=mirror_cache,
+                                                               repo_name=repo_name)))
+        return opened[0]
+    
+    if history_mode == HISTORY_MODE_EVENTS:
+        # Os eventos dependem do estado anterior de cada manifesto: varredura serial pela engine git
+        repo_path = open_repository()
+        return iter_git_events(repo_path, repo_name, since_date, parse_memo, baseline)
+    
+    if baseline:
+        baseline_records = iter_baseline_history_records(open_repository(), repo_name, since_date, parse_memo)
+    else:
+        baseline_records = iter(())
+    
+    if sample:
+        # Estado dos manifestos só nos commits amostrados, lido das árvores
+        repo_path = open_repository()
+        records = iter_sampled_history_records(repo_path, repo_name, sample, since_date, sample_last, parse_memo)
+    
+    elif history_checkpoint_dir:
+        repo_path = open_repository()
+        history_df, mined = mine_history_incremental(repo_path, repo_name, since_date, since_months,
+                                                     HistoryCheckpoint(history_checkpoint_dir), jobs, blob_cache)
+        click.echo(f'{mined} commits mined since the last checkpoint.')
+        records = iter_frame_records(history_df)
+    
+    elif jobs > 1:
+        # Os workers abrem o repositório cada um, então o clone remoto é feito uma vez aqui
+        repo_path = open_repository()
+        records = iter_history_parallel(repo_path, repo_name, since_date, jobs, blob_cache=blob_cache)
+    
+    elif history_backend == HISTORY_BACKEND_GIT:
+        repo_path = open_repository()
+        records = iter_history_records(repo_path, repo_name, since_date, parse_memo=parse_memo)
+    
+    else:
+        # Sem --path nem espelho, o PyDriller faz e remove o próprio clone temporário
+        source = open_repository() if path or mirror_cache is not None or opened else repo_url
+        cloned_repo = Repository(source, since=since_date,
+                                 only_modifications_with_file_types=['.txt','.toml', '.pip'])
+        records = iter_commit_history_records(cloned_repo, repo_name, parse_memo)
+    
+    return itertools.chain(baseline_records, records)
@@ -0,0 +1,82 @@
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import List
+
+import click
+import pandas as pd
+
+from .application import build_resources, run
+from .deprecation import DEFAULT_CONCURRENCY
+from .integrations.http_cache import mount_connection_pool
+
+DEFAULT_BATCH_WORKERS = 4
+
+BATCH_SUMMARY_PATH = "results/batch_summary.csv"
+
+BATCH_SUMMARY_COLUMNS = ['Repositorio', 'Status', 'Registros', 'Historico_s', 'Depreciacao_s', 'Relatorio_s',
+                         'Total_s']
+
+# Opções de run que montam os caches e clientes compartilhados (build_resources)
+RESOURCE_OPTIONS = ('cache_dir', 'cache_ttl', 'blob_cache_dir', 'blob_cache_bytes', 'mirror_dir', 'mirror_bytes',
+                    'shared_objects_dir')
+
+def read_repository_list(path: str) -> List[str]:
+    """Um ``owner/repo`` por linha; linhas vazias, comentários (#) e repetições são ignorados."""
+    with open(path, encoding="utf-8") as f:
+        names = [line.split("#", 1)[0].strip() for line in f]
+
+    return list(dict.fromkeys(name for name in names if name))
+
+def run_batch(repo_names, since_months, max_months, workers=DEFAULT_BATCH_WORKERS,
+              summary_path=BATCH_SUMMARY_PATH, **options) -> pd.DataFrame:
+    """
+    Executa as etapas de application.run para cada repositório num único processo,
+    ``workers`` repositórios por vez. Sessões HTTP, memos de PyPI/GitHub, o cache de
+    respostas, o ParseMemo e os espelhos de clone são compartilhados por todos.
+
+    Cada repositório gera os resultados de sempre em results/<owner_repo>/; o tempo
+    de cada etapa vai para ``summary_path``.
+    """
+    resources = build_resources(**{name: options.pop(name) for name in RESOURCE_OPTIONS if name in options},
+                                shared_clients=True)
+
+    # As análises em paralelo dividem o mesmo pool keep-alive de cada host
+    pool_size = options.get('concurrency', DEFAULT_CONCURRENCY) * workers
+    mount_connection_pool(resources.pypi.session, pool_size)
+    mount_connection_pool(resources.gh.session, pool_size)
+
+    def analyze(repo_name):
+        timings = {}
+        started = time.perf_counter()
+        status = run(repo_name, None, since_months, max_months, resources=resources, timings=timings, **options)
+
+        return {
+            'Repositorio': repo_name,
+            'Status': 'ok' if status == 0 else 'error',
+            'Registros': timings.get('records'),
+            'Historico_s': timings.get('history'),
+            'Depreciacao_s': timings.get('deprecation'),
+            'Relatorio_s': timings.get('report'),
+            'Total_s': time.perf_counter() - started,
+        }
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        rows = list(executor.map(analyze, repo_names))
+    elapsed = time.perf_counter() - started
+
+    summary = pd.DataFrame(rows, columns=BATCH_SUMMARY_COLUMNS)
+
+    os.makedirs(os.path.dirname(summary_path) or ".", exist_ok=True)
+    summary.to_csv(summary_path, index=False, float_format="%.3f")
+
+    failed = int((summary['Status'] != 'ok').sum())
+    click.echo(f'Batch finished: {len(summary) - failed} repositories analyzed, {failed} failed, '
+               f'{elapsed:.1f}s wall time ({summary["Total_s"].sum():.1f}s summed over repositories).')
+    if resources.parse_memo.hits or resources.parse_memo.misses:
+        click.echo(f'Manifest parses: {resources.parse_memo.misses} distinct blobs, '
+                   f'{resources.parse_memo.hits} reused across the batch.')
+    click.echo(f'Timing summary saved in "{summary_path}".')
+
+    return summary
@@ -0,0 +1,147 @@
+import hashlib
+import json
+import os
+import threading
+import time
+from typing import List, Optional
+
+from .models import Dependency
+from .utils import cache_path
+
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024  # 256MB
+
+# Ao estourar o limite, a remoção vai até esta fração dele: o próximo put não dispara outra
+EVICTION_LOW_WATER = 0.8
+
+def git_blob_sha(content: bytes) -> str:
+    """SHA-1 que o git atribuiria ao blob com este conteúdo."""
+    return hashlib.sha1(b"blob %d\0" % len(content) + content).hexdigest()
+
+class BlobCache:
+    """
+    Armazenamento endereçado por conteúdo de manifestos e das listas de Dependency
+    já parseadas, chaveado pelo SHA do blob no git.
+
+    Cada blob é um arquivo JSON com o conteúdo e um dicionário nome do arquivo ->
+    dependências (o parser depende do nome). O tamanho total é limitado por
+    ``max_bytes``; ao estourar, os blobs acessados há mais tempo (mtime) são removidos
+    até ``EVICTION_LOW_WATER`` do limite.
+
+    Tamanho e último acesso de cada blob ficam num índice em memória, montado por
+    um único os.walk na primeira escrita; blobs gravados por outros processos só
+    entram no índice na próxima instância.
+    """
+
+    def __init__(self, directory: Optional[str] = None, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.directory = directory or cache_path("blobs")
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._index = None   # path -> [tamanho, último acesso]
+        self._total_bytes = 0
+
+    def _path(self, sha: str) -> str:
+        return os.path.join(self.directory, sha[:2], sha + ".json")
+
+    def _load(self, sha: str) -> Optional[dict]:
+        path = self._path(sha)
+        try:
+            with open(path, encoding="utf-8") as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+
+        # Marca o acesso para a política LRU
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+
+        index = self._index
+        if index is not None and path in index:
+            index[path][1] = time.time()
+        return entry
+
+    def get(self, sha: str) -> Optional[str]:
+        """Conteúdo do blob, ou None se ele não estiver no cache."""
+        entry = self._load(sha)
+        if entry is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return entry["content"]
+
+    def get_dependencies(self, sha: str, filename: str) -> Optional[List[Dependency]]:
+        entry = self._load(sha)
+        parsed = entry.get("parsed", {}).get(filename) if entry else None
+        if parsed is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return [Dependency.from_dict(dep) for dep in parsed]
+
+    def put(self, sha: str, content: str, filename: Optional[str] = None,
+            dependencies: Optional[List[Dependency]] = None) -> None:
+        with self._lock:
+            path = self._path(sha)
+            entry = self._load(sha) or {"content": content, "parsed": {}}
+
+            if filename is not None and dependencies is not None:
+                entry["parsed"][filename] = [dep.to_dict() for dep in dependencies]
+
+            index = self._load_index()
+            old_size = index[path][0] if path in index else 0
+
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp_path = f"{path}.{os.getpid()}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(entry, f)
+            os.replace(tmp_path, path)
+
+            size = os.path.getsize(path)
+            index[path] = [size, time.time()]
+            self._total_bytes += size - old_size
+
+            if self._total_bytes > self.max_bytes:
+                self._evict(keep=path)
+
+    def total_bytes(self) -> int:
+        with self._lock:
+            self._load_index()
+            return self._total_bytes
+
+    def _load_index(self) -> dict:
+        """Índice path -> [tamanho, mtime], lido do disco uma única vez."""
+        if self._index is None:
+            self._index = {path: [os.path.getsize(path), mtime] for path, mtime in self._files()}
+            self._total_bytes = sum(size for size, _ in self._index.values())
+        return self._index
+
+    def _files(self):
+        if not os.path.isdir(self.directory):
+            return []
+        files = []
+        for root, _, names in os.walk(self.directory):
+            for name in names:
+                if name.endswith(".json"):
+                    path = os.path.join(root, name)
+                    files.append((path, os.path.getmtime(path)))
+        return files
+
+    def _evict(self, keep: str) -> None:
+        target = self.max_bytes * EVICTION_LOW_WATER
+
+        for path, (size, _) in sorted(self._index.items(), key=lambda item: item[1][1]):
+            if self._total_bytes <= target:
+                break
+            if path == keep:
+                continue
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass  # Já removido por outro processo
+            except OSError:
+                continue
+            del self._index[path]
+            self._total_bytes -= size
@@ -0,0 +1,100 @@
+from typing import Dict, List, Optional, Tuple
+
+import pandas as pd
+
+from .git_history import iter_parsed_manifests
+from .history import version_floor
+from .history_sampling import baseline_point, iter_sampled_manifests
+from .models import Dependency
+
+EVENT_ADDED = "added"
+EVENT_REMOVED = "removed"
+EVENT_CHANGED = "changed"
+
+EVENT_COLUMNS = [
+    "Origem", "Hash_Commit", "Autor", "Data_Commit", "file", "Dependencia", "Evento",
+    "Versao_Anterior", "Versao", "Especificador_Anterior", "Especificador",
+]
+
+def dependency_state(deps: List[Dependency]) -> Dict[str, Tuple[str, str]]:
+    """Estado semântico de um manifesto: nome -> (versão mínima, especificador)."""
+    return {dep.name: (version_floor(dep), dep.raw_specifier or "") for dep in deps}
+
+class ChangeEventLog:
+    """
+    Compara cada manifesto parseado com o estado anterior do mesmo caminho e gera só
+    os eventos added/removed/changed. Commits que não mudam o conjunto de dependências
+    (formatação, comentários, reordenação) não geram nada.
+    """
+
+    def __init__(self, repo_full_name: str):
+        self.repo_full_name = repo_full_name
+        self._state: Dict[str, Dict[str, Tuple[str, str]]] = {}
+
+    def update(self, commit_hash: str, author_name: str, commit_date: str, path: str,
+               deps: Optional[List[Dependency]], old_path: Optional[str] = None) -> List[dict]:
+        """Eventos do manifesto ``path`` neste commit; ``deps`` None indica que ele foi removido."""
+        previous = self._state.pop(old_path, None) if old_path else None
+        if previous is None:
+            previous = self._state.get(path, {})
+
+        if deps is None:
+            current = {}
+            self._state.pop(path, None)
+        else:
+            current = dependency_state(deps)
+            self._state[path] = current
+
+        def event(name, kind, old, new):
+            return {
+                "Origem": self.repo_full_name,
+                "Hash_Commit": commit_hash,
+                "Autor": author_name,
+                "Data_Commit": commit_date,
+                "file": path,
+                "Dependencia": name,
+                "Evento": kind,
+                "Versao_Anterior": old[0] if old else None,
+                "Versao": new[0] if new else None,
+                "Especificador_Anterior": old[1] if old else None,
+                "Especificador": new[1] if new else None,
+            }
+
+        events = []
+        for name, new in current.items():
+            old = previous.get(name)
+            if old is None:
+                events.append(event(name, EVENT_ADDED, None, new))
+            elif old != new:
+                events.append(event(name, EVENT_CHANGED, old, new))
+
+        for name, old in previous.items():
+            if name not in current:
+                events.append(event(name, EVENT_REMOVED, old, None))
+
+        return events
+
+def analyze_repository_git_events(repo_path, repo_full_name, since=None, parse_memo=None, baseline=False):
+    """
+    Log de eventos de dependências em vez de um registro por dependência a cada commit
+    que toca o manifesto. Sem histórico anterior a ``since``, o primeiro estado visto
+    de cada manifesto aparece como ``added``.
+
+    ``baseline`` parte do estado dos manifestos no último commit antes de ``since``:
+    esse estado sai como ``added`` no commit de baseline, e as mudanças na janela
+    são comparadas com ele.
+    """
+    return pd.DataFrame(list(iter_git_events(repo_path, repo_full_name, since, parse_memo, baseline)),
+                        columns=EVENT_COLUMNS)
+
+def iter_git_events(repo_path, repo_full_name, since=None, parse_memo=None, baseline=False):
+    log = ChangeEventLog(repo_full_name)
+
+    point = baseline_point(repo_path, since) if baseline and since is not None else None
+    if point is not None:
+        for point, path, parsed in iter_sampled_manifests(repo_path, [point], parse_memo, progress=False):
+            yield from log.update(point.commit_hash, point.author_name, point.author_date, path, parsed)
+
+    for change, parsed in iter_parsed_manifests(repo_path, since, parse_memo=parse_memo, all_changes=True):
+        yield from log.update(change.commit_hash, change.author_name, change.author_date,
+                              change.path, parsed, change.old_path)
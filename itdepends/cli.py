@@ -1,20 +1,208 @@
 import click
 import re
 
-from .application import run
+from .application import (run, render_saved_report, run_dependency_history, HISTORY_BACKEND_PYDRILLER,
+                          HISTORY_BACKEND_GIT, HISTORY_MODE_SNAPSHOT, HISTORY_MODE_EVENTS)
+from .deprecation import DEFAULT_CONCURRENCY, MANIFEST_SOURCE_API, MANIFEST_SOURCE_ARCHIVE
+from .integrations.github_api import DEFAULT_GRAPHQL_BATCH_SIZE
+from .integrations import ResponseCache
+from .integrations.http_cache import DEFAULT_TTL_SECONDS
+from .snapshot import DEFAULT_SNAPSHOT_PATH, SnapshotDB
+from .blob_cache import DEFAULT_MAX_BYTES
+from .clone_manager import DEFAULT_MIRROR_MAX_BYTES
+from .history_sinks import OUTPUT_CSV, OUTPUT_EXTENSIONS
+from .history_sampling import DEFAULT_SAMPLE_LAST, SAMPLE_MODES
+from .utils import cache_path
+from .batch import BATCH_SUMMARY_PATH, DEFAULT_BATCH_WORKERS, read_repository_list, run_batch
+from .job_queue import (DEFAULT_LEASE_SECONDS, DEFAULT_MAX_ATTEMPTS, DEFAULT_QUEUE_PATH, JobQueue,
+                        run_worker)
 
 DEFAULT_MAX_MONTHS = 12
 
-@click.command()
+class DefaultCommandGroup(click.Group):
+    """
+    Grupo que encaminha para ``default_command`` quando o primeiro argumento não é
+    um subcomando, mantendo ``itdepends owner/repo`` funcionando.
+    """
+    def __init__(self, *args, default_command=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.default_command = default_command
+
+    def parse_args(self, ctx, args):
+        if args and args[0] not in self.commands and args[0] not in ctx.help_option_names:
+            args = [self.default_command, *args]
+        return super().parse_args(ctx, args)
+
+ANALYSIS_OPTIONS = [
+    click.option('--since_months', help='Number of months from now, to analyze commits', default=12),
+    click.option('--inactive_months',
+                 help= 'Number of months without commits to consider a repository inactive',
+                 type=int,
+                 default= DEFAULT_MAX_MONTHS),
+    click.option('--cache_dir',
+                 help='Directory of the persistent PyPI/GitHub response cache',
+                 default=cache_path("http"),
+                 show_default=True),
+    click.option('--cache_ttl',
+                 help='Seconds a cached response is reused without revalidation (0 always revalidates)',
+                 type=int,
+                 default=DEFAULT_TTL_SECONDS),
+    click.option('--no_cache', help='Disable the persistent response, manifest blob and mirror clone caches',
+                 is_flag=True),
+    click.option('--concurrency',
+                 help='Maximum simultaneous requests per host (PyPI, GitHub) in the deprecation analysis',
+                 type=click.IntRange(min=1),
+                 default=DEFAULT_CONCURRENCY,
+                 show_default=True),
+    click.option('--graphql_batch_size',
+                 help='Repositories per GitHub GraphQL query (requires a token; 0 uses only the REST API)',
+                 type=click.IntRange(min=0),
+                 default=DEFAULT_GRAPHQL_BATCH_SIZE,
+                 show_default=True),
+    click.option('--manifest_source',
+                 help='How HEAD manifests are fetched: one Contents API call per file, or one streamed tarball',
+                 type=click.Choice([MANIFEST_SOURCE_API, MANIFEST_SOURCE_ARCHIVE]),
+                 default=MANIFEST_SOURCE_API,
+                 show_default=True),
+    click.option('--blob_cache_dir',
+                 help='Content-addressed cache of manifest blobs and their parsed dependencies',
+                 default=cache_path("blobs"),
+                 show_default=True),
+    click.option('--blob_cache_mb',
+                 help='Size cap of the manifest blob cache; least recently used blobs are evicted',
+                 type=click.IntRange(min=1),
+                 default=DEFAULT_MAX_BYTES // (1024 * 1024),
+                 show_default=True),
+    click.option('--history_backend',
+                 help='Commit history engine: pydriller, or git log over manifest paths with a single cat-file reader',
+                 type=click.Choice([HISTORY_BACKEND_PYDRILLER, HISTORY_BACKEND_GIT]),
+                 default=HISTORY_BACKEND_PYDRILLER,
+                 show_default=True),
+    click.option('--jobs',
+                 help='Worker processes for history mining (git engine); commits are split into contiguous partitions',
+                 type=click.IntRange(min=1),
+                 default=1,
+                 show_default=True),
+    click.option('--incremental',
+                 help='Reuse the stored history of previous runs and mine only new commits (git engine)',
+                 is_flag=True),
+    click.option('--history_checkpoint_dir',
+                 help='Where --incremental keeps each repository history and last mined commit',
+                 default=cache_path("history"),
+                 show_default=True),
+    click.option('--history_mode',
+                 help='snapshot: every dependency of every touched manifest; '
+                     'events: only added/removed/changed dependencies per manifest path (git engine)',
+                 type=click.Choice([HISTORY_MODE_SNAPSHOT, HISTORY_MODE_EVENTS]),
+                 default=HISTORY_MODE_SNAPSHOT,
+                 show_default=True),
+    click.option('--sample',
+                 help='Instead of every manifest-touching commit, read the manifests of one commit per tag, '
+                      'per month or week, or of the last --sample_last manifest-touching commits',
+                 type=click.Choice(list(SAMPLE_MODES)),
+                 default=None),
+    click.option('--sample_last',
+                 help='Commits read by --sample last',
+                 type=click.IntRange(min=1),
+                 default=DEFAULT_SAMPLE_LAST,
+                 show_default=True),
+    click.option('--baseline',
+                 help='Also record the manifests of the last commit before the window, so dependencies that did '
+                      'not change during it appear in the history',
+                 is_flag=True),
+    click.option('--output_format',
+                 help='Format of the saved results: history in any of these, deprecation as parquet or csv '
+                     '(parquet requires pyarrow)',
+                 type=click.Choice(list(OUTPUT_EXTENSIONS)),
+                 default=OUTPUT_CSV,
+                 show_default=True),
+    click.option('--full_clone',
+                 help='Without --path, clone every commit and blob instead of a blob-less clone shallow to the window',
+                 is_flag=True),
+    click.option('--mirror_dir',
+                 help='Bare mirrors reused across runs when --path is not given (fetched instead of re-cloned)',
+                 default=cache_path("mirrors"),
+                 show_default=True),
+    click.option('--mirror_cache_mb',
+                 help='Size cap of the mirror directory; least recently used mirrors are removed',
+                 type=click.IntRange(min=1),
+                 default=DEFAULT_MIRROR_MAX_BYTES // (1024 * 1024),
+                 show_default=True),
+    click.option('--shared_objects',
+                 help='Mirrors of forks and related repositories share commits and trees through git alternates, '
+                     'so each new fork downloads only its own objects',
+                 is_flag=True),
+    click.option('--shared_objects_dir',
+                 help='Where --shared_objects keeps the shared object store',
+                 default=cache_path("objects"),
+                 show_default=True),
+]
+
+def analysis_options(func):
+    """Opções de análise comuns a analyze e batch."""
+    for option in reversed(ANALYSIS_OPTIONS):
+        func = option(func)
+    return func
+
+def run_options(since_months, inactive_months, cache_dir, cache_ttl, no_cache, concurrency, graphql_batch_size,
+                manifest_source, blob_cache_dir, blob_cache_mb, history_backend, jobs, incremental,
+                history_checkpoint_dir, history_mode, sample, sample_last, baseline, output_format, full_clone,
+                mirror_dir, mirror_cache_mb, shared_objects, shared_objects_dir):
+    """Argumentos de application.run a partir das opções de ANALYSIS_OPTIONS."""
+    if sample and history_mode == HISTORY_MODE_EVENTS:
+        raise click.UsageError("--sample reads whole snapshots and cannot be combined with --history_mode events")
+    if history_mode == HISTORY_MODE_EVENTS and jobs > 1:
+        raise click.UsageError("--history_mode events is a serial walk and cannot be combined with --jobs")
+    if history_mode == HISTORY_MODE_EVENTS and incremental:
+        raise click.UsageError("--history_mode events has no checkpoint and cannot be combined with --incremental")
+
+    return dict(
+        since_months=since_months,
+        max_months=inactive_months,
+        cache_dir=None if no_cache else cache_dir,
+        cache_ttl=cache_ttl,
+        concurrency=concurrency,
+        graphql_batch_size=graphql_batch_size,
+        manifest_source=manifest_source,
+        blob_cache_dir=None if no_cache else blob_cache_dir,
+        blob_cache_bytes=blob_cache_mb * 1024 * 1024,
+        history_backend=history_backend,
+        jobs=jobs,
+        history_checkpoint_dir=history_checkpoint_dir if incremental else None,
+        history_mode=history_mode,
+        sample=sample,
+        sample_last=sample_last,
+        baseline=baseline,
+        output_format=output_format,
+        full_clone=full_clone,
+        mirror_dir=None if no_cache else mirror_dir,
+        mirror_bytes=mirror_cache_mb * 1024 * 1024,
+        shared_objects_dir=shared_objects_dir if shared_objects else None)
+
+@click.group(cls=DefaultCommandGroup, default_command="analyze")
+def cli():
+    """
+    itDepends: dependency history and deprecation analysis for GitHub repositories.
+
+    \b
+    Running `itdepends <repository_name>` is the same as `itdepends analyze <repository_name>`.
+    """
+
+@cli.command("analyze")
 @click.argument('repository_name', metavar = "<repository_name>")
 @click.option('--path', help='Path to the previously cloned repository', default=None)
-@click.option('--since_months', help='Number of months from now, to analyze commits', default=12)
-@click.option('--inactive_months',
-              help= 'Number of months without commits to consider a repository inactive',
-              type=int,
-              default= DEFAULT_MAX_MONTHS)
-def cli(repository_name, inactive_months, since_months, path):
+@click.option('--offline',
+              help='Run without network: requires --path, PyPI/GitHub data comes from the snapshot database',
+              is_flag=True)
+@click.option('--snapshot_db',
+              help='SQLite package-health snapshot used by --offline',
+              default=DEFAULT_SNAPSHOT_PATH,
+              show_default=True)
+@analysis_options
+def analyze(repository_name, path, offline, snapshot_db, **options):
     """
+    Analyze dependency history and deprecation of a repository.
+
     \b
     <repository_name>: Target repository on GitHub.
         Format: owner/repo
@@ -26,10 +214,173 @@ def cli(repository_name, inactive_months, since_months, path):
     if not valid:
         raise click.UsageError(f"Invalid repository name: {repository_name}")
 
-    run(repository_name, path, since_months, inactive_months)
+    if offline and not path:
+        raise click.UsageError("--offline requires --path to a local clone")
+
+    run(repository_name, path, snapshot_db=snapshot_db if offline else None, **run_options(**options))
     
     return
 
+@cli.command("batch")
+@click.argument('repos_file', metavar="<repos_file>", type=click.Path(exists=True, dir_okay=False))
+@click.option('--workers',
+              help='Repositories analyzed at the same time; caches, HTTP sessions and mirrors are shared',
+              type=click.IntRange(min=1),
+              default=DEFAULT_BATCH_WORKERS,
+              show_default=True)
+@click.option('--summary_path',
+              help='CSV with the duration of each stage per repository',
+              default=BATCH_SUMMARY_PATH,
+              show_default=True)
+@analysis_options
+def batch(repos_file, workers, summary_path, **options):
+    """
+    Analyze many repositories in a single process.
+
+    \b
+    <repos_file>: One repository per line (owner/repo); blank lines and # comments are ignored.
+    Each repository gets the usual results/<owner_repo>/ outputs.
+    """
+    repository_names = read_repository_list(repos_file)
+
+    invalid = [name for name in repository_names if not parse_repo_name(name)]
+    if invalid:
+        raise click.UsageError(f"Invalid repository names: {', '.join(invalid)}")
+
+    summary = run_batch(repository_names, workers=workers, summary_path=summary_path, **run_options(**options))
+
+    raise SystemExit(0 if (summary['Status'] == 'ok').all() else 1)
+
+@cli.group()
+def queue():
+    """Manage the shared job queue consumed by `itdepends worker`."""
+
+@queue.command("add")
+@click.argument('repos_file', metavar="<repos_file>", type=click.Path(exists=True, dir_okay=False))
+@click.option('--queue_db', help='Job queue database (may live on a shared volume)', default=DEFAULT_QUEUE_PATH,
+              show_default=True)
+@click.option('--requeue', help='Also queue again repositories already done or failed', is_flag=True)
+def queue_add(repos_file, queue_db, requeue):
+    """Queue the repositories of <repos_file> (one owner/repo per line)."""
+    repository_names = read_repository_list(repos_file)
+
+    invalid = [name for name in repository_names if not parse_repo_name(name)]
+    if invalid:
+        raise click.UsageError(f"Invalid repository names: {', '.join(invalid)}")
+
+    added = JobQueue(queue_db).enqueue(repository_names, requeue=requeue)
+
+    click.echo(f'{added} repositories queued in "{queue_db}".')
+
+@queue.command("status")
+@click.option('--queue_db', help='Job queue database (may live on a shared volume)', default=DEFAULT_QUEUE_PATH,
+              show_default=True)
+def queue_status(queue_db):
+    """Show how many jobs are pending, running, done and failed."""
+    job_queue = JobQueue(queue_db)
+
+    for status, count in job_queue.counts().items():
+        click.echo(f'{status}: {count}')
+
+    for repo_name, attempts, error in job_queue.failures():
+        click.echo(f'  {repo_name} failed after {attempts} attempts: {error}')
+
+@cli.command("worker")
+@click.option('--queue_db', help='Job queue database (may live on a shared volume)', default=DEFAULT_QUEUE_PATH,
+              show_default=True)
+@click.option('--worker_id',
+              help='Stable worker name; a restarted worker with the same id resumes its unfinished jobs '
+                   '[default: <hostname>-<pid>]',
+              default=None)
+@click.option('--lease_seconds',
+              help='How long a job stays reserved without a heartbeat before another worker takes it over',
+              type=click.IntRange(min=10),
+              default=DEFAULT_LEASE_SECONDS,
+              show_default=True)
+@click.option('--max_attempts',
+              help='Attempts per repository before it is marked as failed',
+              type=click.IntRange(min=1),
+              default=DEFAULT_MAX_ATTEMPTS,
+              show_default=True)
+@click.option('--exit_when_empty', help='Stop when no job is pending or running instead of polling', is_flag=True)
+@analysis_options
+def worker(queue_db, worker_id, lease_seconds, max_attempts, exit_when_empty, **options):
+    """
+    Analyze repositories leased from the job queue until it is drained.
+
+    \b
+    Several workers, on one or more hosts, can share the same queue database.
+    """
+    job_queue = JobQueue(queue_db, max_attempts=max_attempts)
+
+    processed = run_worker(job_queue, worker_id=worker_id, lease_seconds=lease_seconds,
+                           exit_when_empty=exit_when_empty, **run_options(**options))
+
+    click.echo(f'{processed} jobs processed.')
+
+@cli.command("history")
+@click.argument('repository_name', metavar = "<repository_name>")
+@click.option('--dep', 'package_name', help='Dependency to follow (any PEP 503 spelling)', required=True)
+@click.option('--path', help='Path to the previously cloned repository', default=None)
+@click.option('--since_months', help='Only commits of the last N months [default: whole history]', type=int,
+              default=None)
+@click.option('--mirror_dir',
+              help='Bare mirrors reused across runs when --path is not given (fetched instead of re-cloned)',
+              default=cache_path("mirrors"),
+              show_default=True)
+@click.option('--no_cache', help='Clone into a temporary directory instead of the mirror cache', is_flag=True)
+def history(repository_name, package_name, path, since_months, mirror_dir, no_cache):
+    """
+    Version timeline of a single dependency.
+
+    \b
+    Only the commits whose manifest diffs mention the package (git log -G) are read,
+    instead of mining every dependency of every manifest commit.
+    """
+    if not parse_repo_name(repository_name):
+        raise click.UsageError(f"Invalid repository name: {repository_name}")
+
+    raise SystemExit(run_dependency_history(repository_name, path, package_name, since_months,
+                                            mirror_dir=None if no_cache else mirror_dir))
+
+@cli.command("report")
+@click.argument('repository_name', metavar = "<repository_name>")
+def report(repository_name):
+    """
+    Rebuild the HTML report from the results saved by a previous analysis.
+
+    \b
+    Parquet histories are memory-mapped and only the report columns are read.
+    """
+    raise SystemExit(render_saved_report(repository_name))
+
+@cli.group()
+def snapshot():
+    """Manage the offline package-health snapshot."""
+
+@snapshot.command("import")
+@click.argument('dump_file', type=click.Path(exists=True, dir_okay=False))
+@click.option('--db', help='Snapshot database to write', default=DEFAULT_SNAPSHOT_PATH, show_default=True)
+def snapshot_import(dump_file, db):
+    """Build the snapshot from an NDJSON dump file (one package per line)."""
+    with SnapshotDB(db) as snapshot_db:
+        count = snapshot_db.import_dump(dump_file)
+
+    click.echo(f'Imported {count} packages into "{db}".')
+
+@snapshot.command("export")
+@click.option('--db', help='Snapshot database to write', default=DEFAULT_SNAPSHOT_PATH, show_default=True)
+@click.option('--cache_dir',
+              help='Response cache directory of a previous online run',
+              default=cache_path("http"),
+              show_default=True)
+def snapshot_export(db, cache_dir):
+    """Build the snapshot from the response cache of an online run."""
+    with SnapshotDB(db) as snapshot_db:
+        packages, repos = snapshot_db.export_from_cache(ResponseCache(cache_dir))
+
+    click.echo(f'Exported {packages} packages and {repos} repositories into "{db}".')
+
 def parse_repo_name(repository_name):
     regex_match = re.match(r'^[a-zA-Z0-9-]+/[a-zA-Z0-9._-]+(?:/[a-zA-Z0-9._/-]+)*$', repository_name)
 
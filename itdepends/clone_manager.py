@@ -0,0 +1,275 @@
+import os
+import shutil
+import tempfile
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Iterable, Iterator, Optional
+
+from .file_lock import FileLock, LockTimeout
+from .git_repo import GitError, run_git
+from .utils import cache_path
+
+# Blobs pedidos por fetch; cada lote é uma única negociação com o servidor
+PREFETCH_BATCH_SIZE = 5000
+
+DEFAULT_MIRROR_MAX_BYTES = 5 * 1024 * 1024 * 1024  # 5GB
+
+def clone_repository(url: str, directory: str, since: Optional[datetime] = None, partial: bool = True,
+                     reference: Optional[str] = None) -> str:
+    """
+    Clone bare de ``url`` só com o necessário para minerar manifestos:
+
+    - ``partial``: ``--filter=blob:none``, commits e árvores sem nenhum blob; os
+      blobs dos manifestos vêm depois, em lote, por prefetch_blobs;
+    - ``since``: ``--shallow-since`` limitado à janela da análise, aprofundado em um
+      commit para que os commits de fronteira tenham o pai e o diff correto;
+    - ``reference``: repositório (SharedObjectStore) usado como alternate; só os
+      objetos que ele ainda não tem são baixados e guardados no clone.
+    """
+    directory = os.path.abspath(directory)
+    parent = os.path.dirname(directory)
+
+    args = ["clone", "--quiet", "--bare"]
+    if partial:
+        args.append("--filter=blob:none")
+    if reference:
+        args += ["--reference-if-able", reference]
+
+    if since is None:
+        run_git(parent, *args, url, directory)
+    else:
+        try:
+            run_git(parent, *args, _shallow_since(since), url, directory)
+        except GitError:
+            # Nenhum commit na janela: basta a ponta do branch para a análise de HEAD
+            shutil.rmtree(directory, ignore_errors=True)
+            run_git(parent, *args, "--depth=1", url, directory)
+
+    # Clones bare não atualizam os branches no fetch sem este refspec (reuso por MirrorCache)
+    run_git(directory, "config", "remote.origin.fetch", "+refs/heads/*:refs/heads/*")
+
+    _deepen_boundary(directory)
+    return directory
+
+def update_repository(directory: str, since: Optional[datetime] = None) -> str:
+    """
+    Traz para um clone existente os commits novos do remoto. Um clone raso passa a
+    cobrir a janela ``since`` (ou o histórico inteiro, sem ``since``).
+    """
+    args = ["fetch", "--quiet", "--prune", "origin"]
+
+    if not _is_shallow(directory):
+        run_git(directory, *args)
+    elif since is None:
+        run_git(directory, *args, "--unshallow")
+    else:
+        try:
+            run_git(directory, *args, _shallow_since(since))
+        except GitError:
+            run_git(directory, *args)
+
+    _deepen_boundary(directory)
+    return directory
+
+def _shallow_since(since: datetime) -> str:
+    return f"--shallow-since={since.strftime('%Y-%m-%d %H:%M:%S')}"
+
+def _is_shallow(directory: str) -> bool:
+    return os.path.exists(os.path.join(directory, "shallow"))
+
+def _deepen_boundary(directory: str):
+    # Um commit além da janela: os commits de fronteira ganham o pai e um diff correto
+    if _is_shallow(directory):
+        run_git(directory, "fetch", "--quiet", "--deepen=1")
+
+def is_partial_clone(repo_path: str) -> bool:
+    try:
+        return run_git(repo_path, "config", "--get", "remote.origin.promisor").strip() == b"true"
+    except GitError:
+        return False
+
+def prefetch_blobs(repo_path: str, shas: Iterable[str], batch_size: int = PREFETCH_BATCH_SIZE) -> int:
+    """
+    Busca de uma vez os blobs ``shas`` num clone parcial, no lugar do fetch sob
+    demanda que o git faria para cada objeto lido. Retorna quantos foram pedidos.
+    """
+    shas = list(dict.fromkeys(shas))
+
+    for start in range(0, len(shas), batch_size):
+        batch = shas[start:start + batch_size]
+        # Mesmos argumentos que o git usa para buscar objetos de um remoto promisor
+        run_git(repo_path, "-c", "fetch.negotiationAlgorithm=noop", "fetch", "--quiet", "--no-tags",
+                "--no-write-fetch-head", "--recurse-submodules=no", "--filter=blob:none", "--stdin", "origin",
+                input="\n".join(batch).encode() + b"\n")
+
+    return len(shas)
+
+def add_alternate(repo_path: str, reference: str) -> None:
+    """Passa a ler objetos de ``reference`` em ``repo_path`` (objects/info/alternates)."""
+    objects = os.path.join(os.path.abspath(reference), "objects")
+    alternates = os.path.join(repo_path, "objects", "info", "alternates")
+
+    current = []
+    if os.path.exists(alternates):
+        with open(alternates, encoding="utf-8") as f:
+            current = f.read().split()
+
+    if objects not in current:
+        os.makedirs(os.path.dirname(alternates), exist_ok=True)
+        with open(alternates, "a", encoding="utf-8") as f:
+            f.write(objects + "\n")
+
+class SharedObjectStore:
+    """
+    Repositório bare com os commits e árvores (sem blobs) de todos os repositórios
+    relacionados, cada um como um remoto com os branches em ``refs/forks/<owner_repo>/``.
+    Os espelhos o usam como alternate: um fork novo só baixa e guarda os seus
+    próprios commits.
+
+    O git não aceita alternates rasos, então o store busca o histórico completo;
+    os espelhos continuam rasos e parciais. Nada é removido do store, para que os
+    espelhos que dependem dele continuem íntegros.
+    """
+
+    def __init__(self, path: Optional[str] = None, lock_timeout: float = 600):
+        self.path = os.path.abspath(path or cache_path("objects"))
+        self.lock_timeout = lock_timeout
+
+    def add(self, repo_name: str, url: str) -> str:
+        """Busca para o store os objetos de ``url`` que ele ainda não tem."""
+        remote = repo_name.replace('/', '_')
+
+        os.makedirs(self.path, exist_ok=True)
+        with FileLock(self.path + ".lock", timeout=self.lock_timeout):
+            if not os.path.isdir(os.path.join(self.path, "objects")):
+                run_git(self.path, "init", "--quiet", "--bare")
+
+            run_git(self.path, "config", f"remote.{remote}.url", url)
+            run_git(self.path, "config", f"remote.{remote}.promisor", "true")
+            run_git(self.path, "config", f"remote.{remote}.partialclonefilter", "blob:none")
+            # As refs dos outros forks entram na negociação: o servidor só manda o que é novo
+            run_git(self.path, "fetch", "--quiet", "--no-tags", "--prune", "--filter=blob:none", remote,
+                    f"+refs/heads/*:refs/forks/{remote}/*")
+
+        return self.path
+
+def _directory_size(path: str) -> int:
+    total = 0
+    for root, _, names in os.walk(path):
+        for name in names:
+            try:
+                total += os.path.getsize(os.path.join(root, name))
+            except OSError:
+                pass
+    return total
+
+class MirrorCache:
+    """
+    Clones bare reaproveitados entre execuções em ``<directory>/<owner_repo>.git``:
+    a primeira execução clona, as seguintes só fazem ``fetch`` dos objetos novos.
+
+    Cada espelho é protegido por um FileLock durante a atualização e a mineração.
+    Ao passar de ``max_bytes``, os espelhos usados há mais tempo (mtime) que não
+    estejam em uso são removidos.
+
+    Com ``shared_store``, os espelhos parciais de forks e repositórios relacionados
+    compartilham os objetos pelo SharedObjectStore. Um espelho completo atende
+    também pedidos parciais; o contrário é refeito como clone completo.
+    """
+
+    def __init__(self, directory: Optional[str] = None, max_bytes: int = DEFAULT_MIRROR_MAX_BYTES,
+                 lock_timeout: float = 600, shared_store: Optional[SharedObjectStore] = None):
+        self.directory = directory or cache_path("mirrors")
+        self.max_bytes = max_bytes
+        self.lock_timeout = lock_timeout
+        self.shared_store = shared_store
+
+    def path(self, repo_name: str) -> str:
+        return os.path.join(self.directory, repo_name.replace('/', '_') + ".git")
+
+    @contextmanager
+    def checkout(self, repo_name: str, url: str, since: Optional[datetime] = None,
+                 partial: bool = True) -> Iterator[str]:
+        path = self.path(repo_name)
+        os.makedirs(self.directory, exist_ok=True)
+
+        # O store não tem blobs: um clone completo não pode contar com ele
+        reference = None
+        if self.shared_store is not None and partial:
+            reference = self.shared_store.add(repo_name, url)
+
+        with FileLock(path + ".lock", timeout=self.lock_timeout):
+            if os.path.isdir(path) and not partial and is_partial_clone(path):
+                # Um espelho parcial não vira completo com fetch: quem precisa de todos os blobs clona de novo
+                shutil.rmtree(path, ignore_errors=True)
+
+            if os.path.isdir(path):
+                try:
+                    if reference:
+                        add_alternate(path, reference)
+                    update_repository(path, since)
+                except GitError:
+                    # Espelho corrompido ou remoto reescrito de forma incompatível: clona de novo
+                    shutil.rmtree(path, ignore_errors=True)
+                    clone_repository(url, path, since, partial, reference)
+            else:
+                try:
+                    clone_repository(url, path, since, partial, reference)
+                except GitError:
+                    shutil.rmtree(path, ignore_errors=True)
+                    raise
+
+            os.utime(path)
+            yield path
+
+        self.evict(keep=path)
+
+    def mirrors(self):
+        if not os.path.isdir(self.directory):
+            return []
+        return [os.path.join(self.directory, name) for name in os.listdir(self.directory)
+                if name.endswith(".git") and os.path.isdir(os.path.join(self.directory, name))]
+
+    def evict(self, keep: Optional[str] = None) -> None:
+        mirrors = sorted(self.mirrors(), key=os.path.getmtime)
+        sizes = {path: _directory_size(path) for path in mirrors}
+        total = sum(sizes.values())
+
+        for path in mirrors:
+            if total <= self.max_bytes:
+                break
+            if path == keep:
+                continue
+
+            # Espelho em uso por outro processo fica para a próxima
+            try:
+                with FileLock(path + ".lock", timeout=0):
+                    shutil.rmtree(path, ignore_errors=True)
+            except LockTimeout:
+                continue
+
+            total -= sizes[path]
+
+@contextmanager
+def local_repository(path: Optional[str], url: str, since: Optional[datetime] = None,
+                     partial: bool = True, mirror_cache: Optional[MirrorCache] = None,
+                     repo_name: Optional[str] = None) -> Iterator[str]:
+    """
+    Caminho de um repositório local: ``path`` quando informado, o espelho de
+    ``repo_name`` em ``mirror_cache``, ou um clone temporário de ``url`` feito por
+    clone_repository e removido ao sair.
+    """
+    if path:
+        yield path
+        return
+
+    if mirror_cache is not None:
+        with mirror_cache.checkout(repo_name, url, since, partial) as mirror:
+            yield mirror
+        return
+
+    directory = tempfile.mkdtemp(prefix="itdepends-")
+    try:
+        yield clone_repository(url, os.path.join(directory, "repo.git"), since, partial)
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
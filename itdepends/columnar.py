@@ -0,0 +1,156 @@
+import os
+import sqlite3
+from datetime import datetime, timezone
+from typing import Iterable, List, Optional
+
+import pandas as pd
+
+# Colunas que gerar_relatorio_dependencias lê do histórico
+REPORT_COLUMNS = ['Data_Commit', 'Hash_Commit', 'Dependencia', 'Versao']
+
+# Extensões dos resultados salvos, na ordem de preferência de find_result_file
+RESULT_EXTENSIONS = ("parquet", "csv", "ndjson", "sqlite3")
+
+# Poucos valores distintos repetidos em milhões de linhas: codificação por dicionário
+DICTIONARY_COLUMNS = {"Origem", "Hash_Commit", "Autor", "file", "Dependencia", "Evento"}
+TIMESTAMP_COLUMNS = {"Data_Commit"}
+
+# Flags da tabela de depreciação; as demais colunas dela são texto
+BOOLEAN_COLUMNS = {"Arquivado", "Inativo"}
+
+def parse_commit_date(value) -> datetime:
+    """Data_Commit (ISO 8601 ou datetime) convertida para UTC; sem fuso, assume UTC."""
+    if isinstance(value, datetime):
+        date = value
+    else:
+        date = datetime.fromisoformat(str(value))
+    if date.tzinfo is None:
+        date = date.replace(tzinfo=timezone.utc)
+    return date.astimezone(timezone.utc)
+
+def require_pyarrow():
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError as e:
+        raise ImportError("Parquet output requires pyarrow: pip install pyarrow") from e
+
+def history_schema(columns: Iterable[str]):
+    """
+    Schema Arrow dos registros do histórico: datas como timestamp UTC, colunas
+    repetitivas como dicionário e as demais como texto.
+    """
+    import pyarrow as pa
+
+    fields = []
+    for column in columns:
+        if column in TIMESTAMP_COLUMNS:
+            fields.append(pa.field(column, pa.timestamp("us", tz="UTC")))
+        elif column in DICTIONARY_COLUMNS:
+            fields.append(pa.field(column, pa.dictionary(pa.int32(), pa.string())))
+        else:
+            fields.append(pa.field(column, pa.string()))
+
+    return pa.schema(fields)
+
+def records_to_table(records: List[dict], schema):
+    """Tabela Arrow de um lote de registros; as datas ISO 8601 são convertidas para UTC."""
+    import pyarrow as pa
+
+    arrays = []
+    for field in schema:
+        values = [record.get(field.name) for record in records]
+        if field.name in TIMESTAMP_COLUMNS:
+            values = [parse_commit_date(value) if value is not None else None for value in values]
+        else:
+            values = [str(value) if value is not None else None for value in values]
+        arrays.append(pa.array(values, type=field.type))
+
+    return pa.Table.from_arrays(arrays, schema=schema)
+
+def deprecation_schema(columns: Iterable[str]):
+    """
+    Schema Arrow da tabela de depreciação. ``Status (PyPi)`` mistura texto e False
+    (pacote não resolvido), o que o pyarrow não infere: as colunas são tipadas aqui.
+    """
+    import pyarrow as pa
+
+    return pa.schema([pa.field(column, pa.bool_() if column in BOOLEAN_COLUMNS else pa.string())
+                      for column in columns])
+
+def frame_to_table(df: pd.DataFrame, schema):
+    """
+    Tabela Arrow de ``df`` com ``schema``. Nas colunas de texto, False e valores
+    ausentes viram nulo; nas booleanas, só os ausentes.
+    """
+    import pyarrow as pa
+
+    arrays = []
+    for field in schema:
+        values = df[field.name].tolist()
+        if pa.types.is_boolean(field.type):
+            values = [None if pd.isna(value) else bool(value) for value in values]
+        else:
+            values = [None if value is False or pd.isna(value) else str(value) for value in values]
+        arrays.append(pa.array(values, type=field.type))
+
+    return pa.Table.from_arrays(arrays, schema=schema)
+
+def save_to_parquet(df: pd.DataFrame, output_name: str, repo_name: str, schema=None) -> str:
+    """Equivalente de save_to_csv em Parquet; sem ``schema``, os tipos são inferidos pelo pyarrow."""
+    require_pyarrow()
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    from .utils import create_results_directories, results_path
+
+    create_results_directories(repo_name)
+    output_file = results_path(repo_name, f"{output_name}.parquet")
+
+    if schema is None:
+        table = pa.Table.from_pandas(df, preserve_index=False)
+    else:
+        table = frame_to_table(df, schema)
+
+    pq.write_table(table, output_file)
+
+    return output_file
+
+def load_history_columns(path: str, columns: Optional[List[str]] = None) -> pd.DataFrame:
+    """
+    Lê só ``columns`` (por padrão as do relatório) de um histórico salvo em qualquer
+    formato de ``--output_format``. Parquet é lido por memory map e projeção de
+    colunas; CSV, por ``usecols``; SQLite, por um SELECT só dessas colunas.
+    """
+    columns = columns or REPORT_COLUMNS
+
+    if path.endswith(".parquet"):
+        require_pyarrow()
+        import pyarrow.parquet as pq
+
+        return pq.read_table(path, columns=columns, memory_map=True).to_pandas()
+
+    if path.endswith(".ndjson"):
+        if os.path.getsize(path) == 0:
+            return pd.DataFrame(columns=columns, dtype=str)
+        return pd.read_json(path, lines=True, dtype=False, convert_dates=False)[columns]
+
+    if path.endswith(".sqlite3"):
+        conn = sqlite3.connect(path)
+        try:
+            # O sink só cria a tabela no primeiro registro
+            if conn.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'history'").fetchone() is None:
+                return pd.DataFrame(columns=columns, dtype=str)
+            selected = ", ".join(f'"{column}"' for column in columns)
+            return pd.read_sql_query(f'SELECT {selected} FROM "history"', conn)
+        finally:
+            conn.close()
+
+    return pd.read_csv(path, usecols=columns, dtype=str)
+
+def find_result_file(directory: str, output_name: str) -> Optional[str]:
+    """Resultado salvo em ``directory``, preferindo Parquet a CSV e CSV a NDJSON/SQLite."""
+    for extension in RESULT_EXTENSIONS:
+        path = os.path.join(directory, f"{output_name}.{extension}")
+        if os.path.exists(path):
+            return path
+    return None
@@ -0,0 +1,95 @@
+import os
+import re
+from datetime import datetime
+from typing import Iterator, Optional
+
+import pandas as pd
+from packaging.utils import canonicalize_name
+
+from .change_events import EVENT_ADDED, EVENT_CHANGED, EVENT_COLUMNS, EVENT_REMOVED, dependency_state
+from .clone_manager import is_partial_clone, prefetch_blobs
+from .git_history import iter_manifest_changes, list_manifest_blobs
+from .git_repo import CatFileBatch
+from .parsers import parse_dependency_file
+from .parse_memo import ParseMemo
+
+# Caracteres que podem fazer parte de um nome de pacote: fora deles, o nome acabou
+NAME_BOUNDARY = r"[^A-Za-z0-9._-]"
+
+def pickaxe_pattern(package_name: str) -> str:
+    """
+    Regex estendida para ``git log -G`` que encontra ``package_name`` em qualquer grafia
+    equivalente pelo PEP 503 (``zope.interface``, ``Zope-Interface``, ``zope_interface``).
+    """
+    parts = [re.escape(part) for part in re.split(r"[-_.]+", package_name) if part]
+    name = "[-_.]+".join(parts)
+    return f"(^|{NAME_BOUNDARY}){name}({NAME_BOUNDARY}|$)"
+
+def iter_dependency_events(repo_path: str, repo_full_name: str, package_name: str,
+                           since: Optional[datetime] = None, parse_memo: Optional[ParseMemo] = None,
+                           rev: str = "HEAD") -> Iterator[dict]:
+    """
+    Eventos (no formato de change_events) de uma única dependência. O pickaxe do git
+    seleciona só os manifestos cujo diff menciona o pacote; para cada um, apenas a
+    versão anterior e a nova do blob são parseadas e comparadas.
+    """
+    parse_memo = parse_memo or ParseMemo()
+    key = canonicalize_name(package_name)
+
+    if is_partial_clone(repo_path):
+        # O -G lê o conteúdo dos blobs: sem o prefetch o git buscaria um por vez
+        prefetch_blobs(repo_path, list_manifest_blobs(repo_path, since, rev))
+
+    changes = iter_manifest_changes(repo_path, since, rev, all_changes=True, pickaxe=pickaxe_pattern(package_name))
+
+    with CatFileBatch(repo_path) as cat_file:
+
+        def version(sha, filename):
+            if sha is None:
+                return None, None
+            deps = parse_memo.parse(filename, cat_file.read_text(sha), parse_dependency_file, sha=sha)
+            matches = [dep for dep in deps if canonicalize_name(dep.name) == key]
+            if not matches:
+                return None, None
+            return matches[-1].name, dependency_state(matches)[matches[-1].name]
+
+        for change in changes:
+            filename = os.path.basename(change.path)
+            old_filename = os.path.basename(change.old_path) if change.old_path else filename
+
+            try:
+                old_name, old = version(change.old_blob_sha, old_filename)
+                new_name, new = version(change.blob_sha, filename)
+            except Exception as e:
+                print(f"Erro ao analisar o arquivo {filename} no commit {change.commit_hash}: {e}")
+                continue
+
+            # O padrão casou com outra coisa (comentário, pacote de nome parecido) ou nada mudou
+            if old == new:
+                continue
+
+            if old is None:
+                event = EVENT_ADDED
+            elif new is None:
+                event = EVENT_REMOVED
+            else:
+                event = EVENT_CHANGED
+
+            yield {
+                "Origem": repo_full_name,
+                "Hash_Commit": change.commit_hash,
+                "Autor": change.author_name,
+                "Data_Commit": change.author_date,
+                "file": change.path,
+                "Dependencia": new_name or old_name,
+                "Evento": event,
+                "Versao_Anterior": old[0] if old else None,
+                "Versao": new[0] if new else None,
+                "Especificador_Anterior": old[1] if old else None,
+                "Especificador": new[1] if new else None,
+            }
+
+def dependency_timeline(repo_path, repo_full_name, package_name, since=None, parse_memo=None) -> pd.DataFrame:
+    """Linha do tempo de versões de ``package_name`` no repositório, do commit mais antigo ao mais recente."""
+    return pd.DataFrame(list(iter_dependency_events(repo_path, repo_full_name, package_name, since, parse_memo)),
+                        columns=EVENT_COLUMNS)
@@ -1,45 +1,180 @@
 from .integrations import GitHubClient, PyPiClient
+from .integrations.http_cache import mount_connection_pool
+from .integrations.github_api import DEFAULT_GRAPHQL_BATCH_SIZE, repo_exists, is_archived, is_inactive
+from .integrations.pypi_api import extract_github_repo, extract_development_status
 import pandas as pd
 
+import asyncio
 import os
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlparse
 
+from .blob_cache import git_blob_sha
+from .git_repo import iter_tree_files, resolve_default_branch
 from .parsers import parse_dependency_file
 from .utils import file_is_suitable
 
 TARGET_FILES = {"pyproject.toml", "requirements.txt"}
 
-def full_deprecation_analysis(repo_name, max_months):
-    dependency_files = get_dependency_files(repo_name)
+DEFAULT_CONCURRENCY = 8
+
+MANIFEST_SOURCE_API = "api"
+MANIFEST_SOURCE_ARCHIVE = "archive"
+
+DEPRECATION_COLUMNS = ['Nome', 'Github_encontrado', 'Arquivado', 'Inativo', 'Status (PyPi)']
+
+def full_deprecation_analysis(repo_name, max_months, cache=None, concurrency=DEFAULT_CONCURRENCY,
+                              graphql_batch_size=DEFAULT_GRAPHQL_BATCH_SIZE, manifest_source=MANIFEST_SOURCE_API,
+                              repo_path=None, blob_cache=None, pypi=None, gh=None):
+    if repo_path:
+        # Com um clone local a API do GitHub fica só para os repositórios dos pacotes
+        dependency_files = get_local_dependency_files(repo_path)
+    else:
+        dependency_files = get_dependency_files(repo_name, cache, manifest_source, blob_cache, gh)
+    
+    return run_deprecation_pipeline(collect_dependency_names(dependency_files, blob_cache), max_months, cache,
+                                    concurrency, pypi, gh, graphql_batch_size=graphql_batch_size)
+
+def offline_deprecation_analysis(repo_path, max_months, snapshot):
+    """
+    Mesma tabela de full_deprecation_analysis, sem rede: manifestos lidos do git
+    do clone local e metadados de PyPI/GitHub lidos do SnapshotDB.
+    """
+    dependency_files = get_local_dependency_files(repo_path)
+    
+    results = []
+    for package_name in collect_dependency_names(dependency_files):
+        archived, repo, inactive, status, available = check_deprecation_offline(package_name, max_months, snapshot)
+        results.append(deprecation_row(package_name, archived, repo, inactive, status))
     
+    return pd.DataFrame(results, columns=DEPRECATION_COLUMNS)
+
+def collect_dependency_names(dependency_files, blob_cache=None):
     dependencies = {}
     for file in dependency_files:
-        deps = parse_dependency_file(filename=file['name'], content=file['content'])
+        deps = parse_manifest(file, blob_cache)
         for dep in deps:
             dependencies[dep.name] = dep
 
-    dependencies = list(dependencies.values())
+    return list(dependencies)
+
+def parse_manifest(file, blob_cache=None):
+    """Parseia um manifesto, reaproveitando o resultado já guardado para o mesmo blob."""
+    sha = file.get('sha')
     
-    results = []
-    for dependency in dependencies:
-        archived, repo, inactive, status, available = check_deprecation(dependency.name, max_months)
-        
-        results.append({
-            'Nome': dependency.name,
-            'Github_encontrado': repo,
-            'Arquivado': archived,
-            'Inativo': inactive,
-            'Status (PyPi)': status,
-        })
+    if blob_cache is not None and sha:
+        deps = blob_cache.get_dependencies(sha, file['name'])
+        if deps is not None:
+            return deps
+    
+    deps = parse_dependency_file(filename=file['name'], content=file['content'])
     
-    df = pd.DataFrame(results)
-    return df
+    if blob_cache is not None and sha:
+        blob_cache.put(sha, file['content'], file['name'], deps)
+    
+    return deps
+
+def deprecation_row(package_name, archived, repo, inactive, status):
+    return {
+        'Nome': package_name,
+        'Github_encontrado': repo,
+        'Arquivado': archived,
+        'Inativo': inactive,
+        'Status (PyPi)': status,
+    }
+
+class HostLimiter:
+    """
+    Limita quantas chamadas bloqueantes ficam em voo por host, executando-as
+    em threads para que o event loop continue despachando os demais hosts.
+    """
+    def __init__(self, limit):
+        self.limit = limit
+        self._semaphores = {}
+
+    def semaphore(self, url):
+        host = urlparse(url).netloc
+        if host not in self._semaphores:
+            self._semaphores[host] = asyncio.Semaphore(self.limit)
+        return self._semaphores[host]
+
+    async def run(self, url, func, *args):
+        async with self.semaphore(url):
+            return await asyncio.to_thread(func, *args)
+
+async def deprecation_pipeline(package_names, max_months, pypi, gh, concurrency=DEFAULT_CONCURRENCY,
+                               graphql_batch_size=0):
+    limiter = HostLimiter(concurrency)
+
+    async def resolve(package_name):
+        return await limiter.run(pypi.base_url, get_dependency_pypi_info, package_name, None, pypi)
+
+    async def inspect(package_name, repo, status):
+        if status == False:
+            return deprecation_row(package_name, False, None, False, False)
+
+        archived, inactive, available = await limiter.run(gh.base_url, get_github_info, repo, max_months, None, gh)
+
+        return deprecation_row(package_name, archived, repo, inactive, status)
+
+    if not graphql_batch_size or not gh.can_use_graphql():
+        async def analyze(package_name):
+            repo, status = await resolve(package_name)
+            return await inspect(package_name, repo, status)
+
+        # gather preserva a ordem de entrada, então a tabela sai na mesma ordem do loop sequencial
+        return await asyncio.gather(*(analyze(name) for name in package_names))
+
+    # Com GraphQL os repositórios precisam estar todos resolvidos antes de montar os lotes
+    resolved = await asyncio.gather(*(resolve(name) for name in package_names))
+
+    repos = list(dict.fromkeys(repo for repo, status in resolved if status != False))
+    chunks = [repos[i:i + graphql_batch_size] for i in range(0, len(repos), graphql_batch_size)]
+
+    # Falhas do lote ficam fora do memo e seguem pelo REST em inspect()
+    await asyncio.gather(*(
+        limiter.run(gh.graphql_url, gh.get_repo_info_batch, chunk, graphql_batch_size, False)
+        for chunk in chunks
+    ))
+
+    return await asyncio.gather(*(
+        inspect(name, repo, status) for name, (repo, status) in zip(package_names, resolved)
+    ))
+
+def run_deprecation_pipeline(package_names, max_months, cache=None, concurrency=DEFAULT_CONCURRENCY,
+                             pypi=None, gh=None, graphql_batch_size=DEFAULT_GRAPHQL_BATCH_SIZE):
+    pypi = pypi or PyPiClient(cache=cache)
+    gh = gh or GitHubClient(cache=cache)
+
+    # Um pool keep-alive por cliente, dimensionado para as requisições simultâneas
+    mount_connection_pool(pypi.session, concurrency)
+    mount_connection_pool(gh.session, concurrency)
+
+    async def main():
+        # Uma thread por requisição em voo em cada host
+        executor = ThreadPoolExecutor(max_workers=2 * concurrency)
+        asyncio.get_running_loop().set_default_executor(executor)
+        return await deprecation_pipeline(package_names, max_months, pypi, gh, concurrency, graphql_batch_size)
+
+    results = asyncio.run(main())
+
+    return pd.DataFrame(results, columns=DEPRECATION_COLUMNS)
     
 TARGET_FILES = {"pyproject.toml", "requirements.txt"}
 
-def get_dependency_files(repo_name):
-    gh = GitHubClient()
+def get_dependency_files(repo_name, cache=None, source=MANIFEST_SOURCE_API, blob_cache=None, gh=None):
+    gh = gh or GitHubClient(cache=cache)
     
     branch = gh.get_default_branch_name(repo_name)
+    
+    if source == MANIFEST_SOURCE_ARCHIVE:
+        # Um único download do tarball no lugar de uma chamada à Contents API por manifesto
+        return [
+            {"name": os.path.basename(path), "content": content,
+             "sha": git_blob_sha(content.encode("utf-8"))}
+            for path, content in gh.iter_archive_files(repo_name, branch, TARGET_FILES)
+        ]
+    
     tree = gh.get_file_tree(repo_name, branch)
     
     dep_files = []
@@ -52,42 +187,84 @@ def get_dependency_files(repo_name):
         
         #if file_is_suitable(dirname, filename):
         if filename in TARGET_FILES:
-            url = file.get('url')
+            sha = file.get('sha')
+            
+            # Blob inalterado desde a última execução: nenhuma requisição
+            contents = blob_cache.get(sha) if blob_cache is not None and sha else None
             
-            contents = gh.get_file_contents(url)
-            dep_files.append({"name": filename, "content": contents})
+            if contents is None:
+                url = file.get('url')
+                contents = gh.get_file_contents(url)
+                
+                if blob_cache is not None and sha:
+                    blob_cache.put(sha, contents)
+            
+            dep_files.append({"name": filename, "content": contents, "sha": sha})
             
     return dep_files
 
-def check_deprecation(package_name, max_months):
+def get_local_dependency_files(repo_path):
+    """
+    Manifestos da ponta do branch padrão lidos direto do banco de objetos do clone
+    local, sem depender do working tree nem da API do GitHub.
+    """
+    head = resolve_default_branch(repo_path)
+    
+    return [
+        {"name": os.path.basename(path), "content": content, "sha": sha}
+        for sha, path, content in iter_tree_files(repo_path, head, TARGET_FILES)
+    ]
+
+def check_deprecation(package_name, max_months, cache=None, pypi=None, gh=None):
     repo = []
-    repo, status = get_dependency_pypi_info(package_name)
+    repo, status = get_dependency_pypi_info(package_name, cache, pypi)
     
     if status == False:
         return False, None, False, False, False
 
-    archived, inactive, available = get_github_info(repo, max_months)
+    archived, inactive, available = get_github_info(repo, max_months, cache, gh)
     
     return archived, repo, inactive, status, available
     
-def get_dependency_pypi_info(package_name):
-    pypi = PyPiClient()
+def get_dependency_pypi_info(package_name, cache=None, pypi=None):
+    pypi = pypi or PyPiClient(cache=cache)
 
-    success_gh, repo_name = pypi.get_github_repo_name(package_name)
-    succes_pypi, stage = pypi.verify_development_status(package_name)
+    project, error = pypi.get_project(package_name)
+    
+    if error:
+        return "no_repo_found", False
+
+    success_gh, repo_name = extract_github_repo(project)
+    succes_pypi, stage = extract_development_status(project)
     
     if success_gh and succes_pypi:
         return repo_name, stage
 
     return "no_repo_found", False
 
-def get_github_info(repo_name, max_months):
-    gh = GitHubClient()
+def get_github_info(repo_name, max_months, cache=None, gh=None):
+    gh = gh or GitHubClient(cache=cache)
+    
+    info = gh.get_repo_info(repo_name)
     
-    if gh.verify_repo_existance(repo_name):
-        archived = gh.verify_archived(repo_name)
-        inactive = gh.verify_inactivity(repo_name, max_months)
+    if repo_exists(info):
+        archived = is_archived(info)
+        inactive = is_inactive(info, max_months)
     
         return archived, inactive, True
     
-    return False, False, False
\ No newline at end of file
+    return False, False, False
+
+def check_deprecation_offline(package_name, max_months, snapshot):
+    package = snapshot.get_package(package_name)
+    
+    if package is None or not package[2]:
+        return False, None, False, False, False
+    
+    repo, status, _ = package
+    info = snapshot.get_repo(repo)
+    
+    if repo_exists(info):
+        return is_archived(info), repo, is_inactive(info, max_months), status, True
+    
+    return False, repo, False, status, False
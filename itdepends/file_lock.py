@@ -0,0 +1,135 @@
+import os
+import threading
+import time
+import uuid
+from typing import Optional
+
+class LockTimeout(Exception):
+    pass
+
+class FileLock:
+    """
+    Lock entre processos baseado na criação exclusiva de um arquivo
+    (``O_CREAT | O_EXCL``), que funciona em qualquer sistema e em volumes
+    compartilhados. Locks mais antigos que ``stale_after`` segundos são
+    considerados abandonados por um processo que morreu e são removidos.
+
+    Enquanto o lock está em uso, uma thread renova o mtime do arquivo a cada
+    ``stale_after / 3`` segundos: uma mineração longa nunca parece abandonada.
+    """
+
+    def __init__(self, path: str, timeout: float = 600, poll_interval: float = 0.2,
+                 stale_after: Optional[float] = 6 * 3600):
+        self.path = path
+        self.timeout = timeout
+        self.poll_interval = poll_interval
+        self.stale_after = stale_after
+        self.locked = False
+        self._token = f"{os.getpid()} {uuid.uuid4().hex}"
+        self._stop = threading.Event()
+        self._keeper = None
+
+    def _is_stale(self, path: Optional[str] = None) -> bool:
+        if self.stale_after is None:
+            return False
+        try:
+            return time.time() - os.path.getmtime(path or self.path) > self.stale_after
+        except OSError:
+            return False
+
+    def _break_stale(self):
+        """
+        Remove um lock abandonado. O rename é atômico: de vários processos que o
+        acharam abandonado, só um o leva. Entre a checagem e o rename outro processo
+        pode ter criado um lock novo no lugar; nesse caso ele é devolvido.
+
+        Retorna True quando vale tentar criar o lock de novo.
+        """
+        stale_path = f"{self.path}.stale.{uuid.uuid4().hex}"
+        try:
+            os.rename(self.path, stale_path)
+        except OSError:
+            # Outro processo já o removeu
+            return True
+
+        if not self._is_stale(stale_path):
+            try:
+                # link não sobrescreve: se já há outro lock no lugar, o dono dele prevalece
+                os.link(stale_path, self.path)
+            except FileExistsError:
+                # Um terceiro processo criou o lock nesse meio tempo. O arquivo levado
+                # é de um dono vivo e não é apagado; este processo volta a esperar.
+                return False
+            except OSError:
+                os.rename(stale_path, self.path)
+                return False
+            os.remove(stale_path)
+            return False
+
+        try:
+            os.remove(stale_path)
+        except OSError:
+            pass
+        return True
+
+    def _owned(self) -> bool:
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                return f.read() == self._token
+        except OSError:
+            return False
+
+    def _refresh(self, interval: float):
+        while not self._stop.wait(interval):
+            if not self._owned():
+                return
+            try:
+                os.utime(self.path)
+            except OSError:
+                pass
+
+    def acquire(self):
+        deadline = time.monotonic() + self.timeout
+
+        while True:
+            try:
+                fd = os.open(self.path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+            except FileExistsError:
+                if self._is_stale() and self._break_stale():
+                    continue
+
+                if time.monotonic() >= deadline:
+                    raise LockTimeout(f"Timed out waiting for lock {self.path}")
+                time.sleep(self.poll_interval)
+                continue
+
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                f.write(self._token)
+            self.locked = True
+
+            if self.stale_after is not None:
+                self._stop.clear()
+                self._keeper = threading.Thread(target=self._refresh, args=(self.stale_after / 3,), daemon=True)
+                self._keeper.start()
+            return self
+
+    def release(self):
+        if self.locked:
+            if self._keeper is not None:
+                self._stop.set()
+                self._keeper.join()
+                self._keeper = None
+
+            # Um lock tomado por outro processo (este foi dado como abandonado) não é removido
+            if self._owned():
+                try:
+                    os.remove(self.path)
+                except OSError:
+                    pass
+            self.locked = False
+
+    def __enter__(self):
+        return self.acquire()
+
+    def __exit__(self, *exc):
+        self.release()
@@ -0,0 +1,226 @@
+import os
+import subprocess
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Iterator, List, Optional, Tuple
+
+import pandas as pd
+from tqdm import tqdm
+
+from .clone_manager import is_partial_clone, prefetch_blobs
+from .git_repo import CatFileBatch, GitError, run_git
+from .history import history_record
+from .models import Dependency
+from .parsers import parse_dependency_file
+from .parse_memo import ParseMemo
+from .utils import file_is_suitable
+
+# Mesmos tipos que o pydriller filtra em application.run (only_modifications_with_file_types)
+MANIFEST_EXTENSIONS = ('.txt', '.toml', '.pip')
+
+# Pathspecs do git log: os tipos acima e qualquer caminho com "requirements", que
+# file_is_suitable aceita independentemente da extensão
+MANIFEST_PATHSPECS = ['*.txt', '*.toml', '*.pip', '*requirements*']
+
+NULL_SHA = "0" * 40
+
+COMMIT_MARKER = b"\x01"
+FIELD_SEPARATOR = b"\x1f"
+LOG_FORMAT = "%x01%H%x1f%an%x1f%aI"
+
+@dataclass(slots=True, frozen=True)
+class ManifestChange:
+    commit_hash: str
+    author_name: str
+    author_date: str   # ISO 8601 com offset, igual a author_date.isoformat() do pydriller
+    path: str
+    blob_sha: Optional[str]         # None quando o arquivo foi removido
+    old_path: Optional[str] = None  # caminho anterior em renomeações
+    old_blob_sha: Optional[str] = None  # conteúdo anterior; None quando o arquivo foi adicionado
+
+@dataclass(slots=True)
+class _LogCommit:
+    commit_hash: str
+    author_name: str
+    author_date: str
+    files: List[tuple]
+
+def _iter_nul_tokens(stream, chunk_size=1 << 16) -> Iterator[bytes]:
+    buffer = b""
+    while True:
+        chunk = stream.read(chunk_size)
+        if not chunk:
+            break
+        buffer += chunk
+        *tokens, buffer = buffer.split(b"\0")
+        yield from tokens
+    if buffer:
+        yield buffer
+
+def _log_args(since=None, rev="HEAD", pickaxe=None):
+    args = ["--reverse", "--no-merges", "--full-history", rev]
+    if since is not None:
+        args.insert(0, f"--since={since.isoformat()}")
+    if pickaxe is not None:
+        # Só os commits (e arquivos) cujo diff adiciona ou remove linhas com o padrão
+        args[:0] = ["--extended-regexp", "--regexp-ignore-case", f"-G{pickaxe}"]
+    return args + ["--", *MANIFEST_PATHSPECS]
+
+def _iter_log_commits(repo_path, log_args, stdin=None) -> Iterator[_LogCommit]:
+    process = subprocess.Popen(
+        ["git", "-C", repo_path, "log", "-z", "--raw", "--no-abbrev", "-M",
+         f"--format={LOG_FORMAT}", *log_args],
+        stdin=subprocess.PIPE if stdin is not None else subprocess.DEVNULL,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+    )
+
+    if stdin is not None:
+        # Com --stdin o git lê todas as revisões antes de começar a escrever
+        process.stdin.write(stdin)
+        process.stdin.close()
+
+    current = None
+    tokens = _iter_nul_tokens(process.stdout)
+
+    for token in tokens:
+        token = token.lstrip(b"\n")
+
+        if token.startswith(COMMIT_MARKER):
+            if current is not None:
+                yield current
+            commit_hash, author_name, author_date = token[1:].split(FIELD_SEPARATOR)
+            current = _LogCommit(commit_hash.decode(), author_name.decode("utf-8", errors="ignore"),
+                                 author_date.decode(), [])
+
+        elif token.startswith(b":"):
+            _, new_mode, old_sha, new_sha, status = token[1:].decode().split()
+            old_path = None
+            if status[0] in "RC":
+                old_path = next(tokens).decode("utf-8", errors="surrogateescape")
+            path = next(tokens).decode("utf-8", errors="surrogateescape")
+            current.files.append((path, old_path, old_sha, new_sha, new_mode, status[0]))
+
+    if current is not None:
+        yield current
+
+    stderr = process.stderr.read()
+    if process.wait() != 0:
+        raise GitError(f"git log: {stderr.decode('utf-8', errors='ignore').strip()}")
+
+def list_manifest_commits(repo_path: str, since: Optional[datetime] = None, rev: str = "HEAD") -> List[str]:
+    """Hashes dos commits (sem merge) que tocam manifestos, do mais antigo para o mais recente."""
+    output = run_git(repo_path, "log", "--format=%H", *_log_args(since, rev))
+    return output.decode().split()
+
+def list_manifest_blobs(repo_path: str, since: Optional[datetime] = None, rev: str = "HEAD") -> List[str]:
+    """
+    Blobs (versões novas e anteriores) de todos os arquivos nos pathspecs de manifesto
+    alterados no período, para um prefetch antes de comandos que leem conteúdo, como
+    o pickaxe (``-G``), num clone parcial.
+    """
+    shas = {}
+    for commit in _iter_log_commits(repo_path, _log_args(since, rev)):
+        for path, old_path, old_sha, new_sha, mode, status in commit.files:
+            if mode != "160000":
+                shas.update(dict.fromkeys(sha for sha in (old_sha, new_sha) if sha != NULL_SHA))
+    return list(shas)
+
+def iter_manifest_changes(repo_path: str, since: Optional[datetime] = None, rev: str = "HEAD",
+                          commits: Optional[List[str]] = None,
+                          all_changes: bool = False, pickaxe: Optional[str] = None) -> Iterator[ManifestChange]:
+    """
+    Arquivos de dependência adicionados/modificados por commit, do mais antigo para o
+    mais recente, com os mesmos critérios de analyze_repository_commit_history:
+    commits sem merge que tocam .txt/.toml/.pip e arquivos aceitos por file_is_suitable.
+
+    ``commits`` (de list_manifest_commits) restringe a leitura a esses commits, na
+    ordem dada, no lugar de ``since``/``rev``.
+
+    ``all_changes`` inclui também remoções (``blob_sha`` None) e renomeações sem
+    mudança de conteúdo, que o log de eventos precisa para acompanhar cada caminho.
+
+    ``pickaxe`` (regex estendida, sem diferenciar maiúsculas) limita o resultado aos
+    arquivos cujo diff adiciona ou remove linhas com o padrão (``git log -G``).
+    """
+    if commits is None:
+        log_commits = _iter_log_commits(repo_path, _log_args(since, rev, pickaxe))
+    elif commits:
+        log_commits = _iter_log_commits(repo_path, ["--no-walk=unsorted", "--stdin", "--", *MANIFEST_PATHSPECS],
+                                        stdin="\n".join(commits).encode() + b"\n")
+    else:
+        return
+
+    for commit in log_commits:
+        # Mesmo filtro do pydriller: ao menos um arquivo do commit com essas extensões
+        if not any(path.endswith(MANIFEST_EXTENSIONS) for path, *_ in commit.files):
+            continue
+
+        for path, old_path, old_sha, blob_sha, mode, status in commit.files:
+            if mode == "160000" or (status == "D" and not all_changes):
+                continue
+
+            # Renomeação sem mudança de conteúdo: o patch do pydriller não traz o blob,
+            # então a engine original não gera registros para ela
+            if status in "RC" and old_sha == blob_sha and not all_changes:
+                continue
+
+            if not file_is_suitable(os.path.dirname(path), os.path.basename(path)):
+                continue
+
+            yield ManifestChange(commit.commit_hash, commit.author_name, commit.author_date, path,
+                                 None if status == "D" else blob_sha,
+                                 old_path if status == "R" else None,
+                                 None if old_sha == NULL_SHA else old_sha)
+
+def iter_parsed_manifests(repo_path, since=None, commits=None, parse_memo=None, all_changes=False,
+                          progress=True) -> Iterator[Tuple[ManifestChange, Optional[List[Dependency]]]]:
+    """
+    (ManifestChange, dependências) de cada manifesto alterado, lendo os blobs por um
+    único processo ``git cat-file --batch``. Remoções (com ``all_changes``) vêm com
+    dependências None; arquivos que o parser rejeita são reportados e pulados.
+    """
+    parse_memo = parse_memo or ParseMemo()
+    changes = iter_manifest_changes(repo_path, since=since, commits=commits, all_changes=all_changes)
+
+    if is_partial_clone(repo_path):
+        # Clone sem blobs: um fetch em lote para os manifestos, não um por blob lido
+        changes = list(changes)
+        prefetch_blobs(repo_path, (change.blob_sha for change in changes if change.blob_sha))
+
+    with CatFileBatch(repo_path) as cat_file:
+
+        for change in tqdm(changes, desc="Traversing manifest changes", disable=not progress):
+            if change.blob_sha is None:
+                yield change, None
+                continue
+
+            filename = os.path.basename(change.path)
+
+            try:
+                parsed = parse_memo.parse(filename, cat_file.read_text(change.blob_sha), parse_dependency_file,
+                                          sha=change.blob_sha)
+            except Exception as e:
+                print(f"Erro ao analisar o arquivo {filename} no commit {change.commit_hash}: {e}")
+                continue
+
+            yield change, parsed
+
+def analyze_repository_git_history(repo_path, repo_full_name, since=None, commits=None, progress=True,
+                                   parse_memo=None):
+    """
+    Alternativa ao analyze_repository_commit_history que não usa o pydriller: pede ao
+    git só os commits que tocam manifestos e lê os blobs por um único processo
+    ``git cat-file --batch``. Produz os mesmos registros, na mesma ordem.
+
+    ``commits`` limita a análise a uma fatia de list_manifest_commits (ver history_jobs).
+    """
+    return pd.DataFrame(list(iter_history_records(repo_path, repo_full_name, since, commits, progress, parse_memo)))
+
+def iter_history_records(repo_path, repo_full_name, since=None, commits=None, progress=True, parse_memo=None):
+    """Registros de analyze_repository_git_history, um por vez, para os sinks de history_sinks."""
+    for change, parsed in iter_parsed_manifests(repo_path, since, commits, parse_memo, progress=progress):
+        filename = os.path.basename(change.path)
+        for dep in parsed:
+            yield history_record(repo_full_name, change.commit_hash, change.author_name,
+                                 change.author_date, filename, dep)
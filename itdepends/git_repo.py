@@ -0,0 +1,113 @@
+import os
+import subprocess
+from typing import Iterator, List, Optional, Tuple
+
+class GitError(Exception):
+    pass
+
+def run_git(repo_path: str, *args: str, input: Optional[bytes] = None) -> bytes:
+    """Executa ``git -C repo_path <args>`` e retorna a saída crua (bytes)."""
+    result = subprocess.run(
+        ["git", "-C", repo_path, *args],
+        input=input,
+        capture_output=True,
+    )
+
+    if result.returncode != 0:
+        message = result.stderr.decode("utf-8", errors="ignore").strip()
+        raise GitError(f"git {' '.join(args)}: {message}")
+
+    return result.stdout
+
+def resolve_default_branch(repo_path: str) -> str:
+    """
+    Commit da ponta do branch padrão: ``origin/HEAD`` quando o clone o conhece,
+    senão o ``HEAD`` local.
+    """
+    try:
+        ref = run_git(repo_path, "symbolic-ref", "--quiet", "refs/remotes/origin/HEAD").decode().strip()
+    except GitError:
+        ref = "HEAD"
+
+    return run_git(repo_path, "rev-parse", "--verify", f"{ref}^{{commit}}").decode().strip()
+
+def is_ancestor(repo_path: str, ancestor: str, rev: str = "HEAD") -> bool:
+    """Se ``ancestor`` é ancestral de ``rev``; falso também quando o commit não existe mais."""
+    try:
+        run_git(repo_path, "merge-base", "--is-ancestor", ancestor, rev)
+    except GitError:
+        return False
+    return True
+
+def list_tree(repo_path: str, rev: str) -> List[Tuple[str, str]]:
+    """Lista (blob_sha, path) de todos os arquivos da árvore de ``rev``."""
+    output = run_git(repo_path, "ls-tree", "-r", "-z", "--full-tree", rev)
+
+    entries = []
+    for record in output.split(b"\0"):
+        if not record:
+            continue
+        meta, path = record.split(b"\t", 1)
+        mode, obj_type, sha = meta.decode().split()
+        if obj_type == "blob":
+            entries.append((sha, path.decode("utf-8", errors="surrogateescape")))
+
+    return entries
+
+class CatFileBatch:
+    """
+    Processo ``git cat-file --batch`` de longa duração: cada objeto é lido pelo
+    mesmo processo, sem um fork por arquivo.
+    """
+
+    def __init__(self, repo_path: str):
+        self.process = subprocess.Popen(
+            ["git", "-C", repo_path, "cat-file", "--batch"],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+        )
+
+    def read(self, sha: str) -> Optional[bytes]:
+        """Conteúdo do objeto ``sha`` ou None se ele não existir."""
+        self.process.stdin.write(sha.encode() + b"\n")
+        self.process.stdin.flush()
+
+        header = self.process.stdout.readline().split()
+        if len(header) < 3 or header[1] == b"missing":
+            return None
+
+        size = int(header[2])
+        content = self.process.stdout.read(size)
+        self.process.stdout.read(1)  # "\n" que encerra cada objeto
+        return content
+
+    def read_text(self, sha: str) -> Optional[str]:
+        content = self.read(sha)
+        if content is None:
+            return None
+        return content.decode("utf-8", errors="ignore")
+
+    def close(self):
+        if self.process.poll() is None:
+            self.process.stdin.close()
+            self.process.wait()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+def iter_tree_files(repo_path: str, rev: str, filenames) -> Iterator[Tuple[str, str, str]]:
+    """(blob_sha, path, conteúdo) dos arquivos de ``rev`` cujo nome está em ``filenames``."""
+    entries = [(sha, path) for sha, path in list_tree(repo_path, rev)
+               if os.path.basename(path) in filenames]
+
+    if not entries:
+        return
+
+    with CatFileBatch(repo_path) as cat_file:
+        for sha, path in entries:
+            content = cat_file.read_text(sha)
+            if content is not None:
+                yield sha, path, content
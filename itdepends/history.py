@@ -7,11 +7,16 @@ from tqdm import tqdm
 
 from .utils import save_to_csv, file_is_suitable
 from .parsers import parse_dependency_file
+from .parse_memo import ParseMemo
 
 TARGET_FILES = {"pyproject.toml", "requirements.txt"}
 
-def analyze_repository_commit_history(cloned_repo, repo_full_name):
-    records = []
+def analyze_repository_commit_history(cloned_repo, repo_full_name, parse_memo=None):
+    df = pd.DataFrame(list(iter_commit_history_records(cloned_repo, repo_full_name, parse_memo)))
+    return df
+
+def iter_commit_history_records(cloned_repo, repo_full_name, parse_memo=None):
+    parse_memo = parse_memo or ParseMemo()
     
     for commit in tqdm(cloned_repo.traverse_commits(), desc="Traversing commits"):
     
@@ -21,33 +26,36 @@ def analyze_repository_commit_history(cloned_repo, repo_full_name):
             
             if file_is_suitable(dirname, filename):
                 try:
-                    parsed = parse_dependency_file(filename, mod.source_code)
+                    parsed = parse_memo.parse(filename, mod.source_code, parse_dependency_file)
                     
                 except Exception as e:
                     print(f"Erro ao analisar o arquivo {filename} no commit {commit.hash}: {e}")
 
                 for dep in parsed:
-                                    
-                    version_floor = None
-                    for cond in dep.version_rules:
-                        if cond.operator in ['==', '>=', '^']:
-                            version_floor = cond.version
-                            
-                    if version_floor == None:
-                        version_floor = '*'
-                    
-                    records.append({
-                        "Origem": repo_full_name,
-                        "Hash_Commit": commit.hash,
-                        "Autor": commit.author.name,
-                        "Data_Commit": commit.author_date.isoformat(),
-                        "file": filename,
-                        "Dependencia": dep.name, 
-                        "Versao": version_floor,
-                    })
+                    yield history_record(repo_full_name, commit.hash, commit.author.name,
+                                         commit.author_date.isoformat(), filename, dep)
 
-    df = pd.DataFrame(records)
-    return df
+def version_floor(dep):
+    floor = None
+    for cond in dep.version_rules:
+        if cond.operator in ['==', '>=', '^']:
+            floor = cond.version
+            
+    if floor == None:
+        floor = '*'
+    
+    return floor
+
+def history_record(repo_full_name, commit_hash, author_name, commit_date, filename, dep):
+    return {
+        "Origem": repo_full_name,
+        "Hash_Commit": commit_hash,
+        "Autor": author_name,
+        "Data_Commit": commit_date,
+        "file": filename,
+        "Dependencia": dep.name, 
+        "Versao": version_floor(dep),
+    }
 
 def main():
     if len(sys.argv) < 2:
@@ -0,0 +1,103 @@
+import json
+import os
+from typing import Optional
+
+import pandas as pd
+
+from .git_history import analyze_repository_git_history, list_manifest_commits
+from .git_repo import is_ancestor, run_git
+from .history_jobs import mine_history_parallel
+from .parse_memo import ParseMemo
+from .utils import cache_path
+
+class HistoryCheckpoint:
+    """
+    Histórico já minerado de cada repositório, com o commit HEAD em que a mineração
+    parou e a janela (``since_months``) usada. Cada repositório ocupa um diretório
+    com ``meta.json`` e ``history.csv``.
+    """
+
+    def __init__(self, directory: Optional[str] = None):
+        self.directory = directory or cache_path("history")
+
+    def _dir(self, repo_name: str) -> str:
+        return os.path.join(self.directory, repo_name.replace('/', '_'))
+
+    def load(self, repo_name: str):
+        """(meta, DataFrame) do último checkpoint, ou None se não houver um legível."""
+        directory = self._dir(repo_name)
+        try:
+            with open(os.path.join(directory, "meta.json"), encoding="utf-8") as f:
+                meta = json.load(f)
+            # Tudo como texto: versões como "1.20" não podem virar float
+            df = pd.read_csv(os.path.join(directory, "history.csv"), dtype=str, keep_default_na=False)
+        except pd.errors.EmptyDataError:
+            df = pd.DataFrame()
+        except (OSError, ValueError):
+            return None
+
+        return meta, df
+
+    def save(self, repo_name: str, meta: dict, df: pd.DataFrame):
+        directory = self._dir(repo_name)
+        os.makedirs(directory, exist_ok=True)
+
+        # Grava em arquivos temporários e troca: um checkpoint interrompido não fica pela metade
+        history_tmp = os.path.join(directory, "history.csv.tmp")
+        df.to_csv(history_tmp, index=False)
+        os.replace(history_tmp, os.path.join(directory, "history.csv"))
+
+        meta_tmp = os.path.join(directory, "meta.json.tmp")
+        with open(meta_tmp, "w", encoding="utf-8") as f:
+            json.dump(meta, f)
+        os.replace(meta_tmp, os.path.join(directory, "meta.json"))
+
+def _mine(repo_path, repo_full_name, commits, jobs, blob_cache):
+    if jobs > 1:
+        return mine_history_parallel(repo_path, repo_full_name, jobs=jobs, commits=commits, blob_cache=blob_cache)
+    return analyze_repository_git_history(repo_path, repo_full_name, commits=commits,
+                                          parse_memo=ParseMemo(blob_cache))
+
+def mine_history_incremental(repo_path, repo_full_name, since, since_months, checkpoint, jobs=1, blob_cache=None):
+    """
+    Histórico da janela ``since`` reaproveitando o checkpoint: só os commits novos
+    desde o HEAD salvo são minerados. A mineração é refeita do zero quando não há
+    checkpoint, a janela mudou ou o HEAD salvo deixou de ser ancestral (force-push).
+
+    Retorna (DataFrame, quantidade de commits minerados).
+    """
+    head = run_git(repo_path, "rev-parse", "HEAD").decode().strip()
+
+    # Listar os commits da janela é barato (nenhum blob lido) e fixa a ordem da execução completa
+    window = list_manifest_commits(repo_path, since)
+
+    saved = checkpoint.load(repo_full_name)
+    reusable = (
+        saved is not None
+        and saved[0].get("since_months") == since_months
+        and is_ancestor(repo_path, saved[0].get("head", ""), head)
+    )
+
+    if reusable:
+        meta, previous = saved
+        mined = set(list_manifest_commits(repo_path, since, rev=f"{meta['head']}..{head}"))
+        new_commits = [commit for commit in window if commit in mined]
+    else:
+        previous = pd.DataFrame()
+        new_commits = window
+
+    new_df = _mine(repo_path, repo_full_name, new_commits, jobs, blob_cache)
+
+    frames = [frame for frame in (previous, new_df) if not frame.empty]
+    df = pd.concat(frames, ignore_index=True) if frames else pd.DataFrame()
+
+    if not df.empty:
+        # Commits que saíram da janela caem; os demais seguem a ordem da execução completa
+        position = {commit: index for index, commit in enumerate(window)}
+        df = df[df["Hash_Commit"].isin(position)]
+        df = df.sort_values("Hash_Commit", key=lambda hashes: hashes.map(position), kind="stable")
+        df = df.reset_index(drop=True)
+
+    checkpoint.save(repo_full_name, {"head": head, "since_months": since_months}, df)
+
+    return df, len(new_commits)
@@ -0,0 +1,69 @@
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+from tqdm import tqdm
+
+from .blob_cache import BlobCache
+from .git_history import analyze_repository_git_history, list_manifest_commits
+from .parse_memo import ParseMemo
+
+# Fatias por processo: mais de uma por worker equilibra commits com manifestos grandes
+PARTITIONS_PER_JOB = 4
+
+def split_commits(commits, parts):
+    """Divide ``commits`` em até ``parts`` fatias contíguas de tamanho quase igual."""
+    parts = max(1, min(parts, len(commits)))
+    size, extra = divmod(len(commits), parts)
+
+    chunks = []
+    start = 0
+    for index in range(parts):
+        end = start + size + (1 if index < extra else 0)
+        chunks.append(commits[start:end])
+        start = end
+
+    return chunks
+
+def mine_partition(repo_path, repo_full_name, commits, blob_cache_dir=None, blob_cache_bytes=None):
+    """Minera uma fatia de commits com um ``git cat-file --batch`` e um ParseMemo próprios do worker."""
+    store = BlobCache(blob_cache_dir, blob_cache_bytes) if blob_cache_dir else None
+    return analyze_repository_git_history(repo_path, repo_full_name, commits=commits, progress=False,
+                                          parse_memo=ParseMemo(store))
+
+def iter_history_parallel(repo_path, repo_full_name, since=None, jobs=2, commits=None, blob_cache=None):
+    """
+    Minera o histórico de ``repo_path`` em ``jobs`` processos. Os commits que tocam
+    manifestos são divididos em fatias contíguas e os registros saem na ordem das
+    fatias, então a saída é a mesma da execução serial. Cada fatia é repassada assim
+    que chega e descartada em seguida: o histórico inteiro nunca fica em memória.
+
+    As fatias usam sempre a engine git: o pydriller reescreve o .git/config a cada
+    abertura do repositório, e handles simultâneos no mesmo clone falham no lock.
+
+    ``commits`` substitui a listagem por ``since`` (ex.: só os commits novos de um checkpoint).
+    Com ``blob_cache`` cada worker abre o mesmo diretório para persistir os parses.
+    """
+    if commits is None:
+        commits = list_manifest_commits(repo_path, since)
+    chunks = split_commits(commits, jobs * PARTITIONS_PER_JOB)
+
+    # spawn: o processo principal pode ter threads (tqdm, pools HTTP) e fork herdaria locks
+    context = multiprocessing.get_context("spawn")
+
+    store_args = (blob_cache.directory, blob_cache.max_bytes) if blob_cache is not None else (None, None)
+    count = len(chunks)
+
+    with ProcessPoolExecutor(max_workers=jobs, mp_context=context) as executor:
+        frames = tqdm(
+            executor.map(mine_partition, [repo_path] * count, [repo_full_name] * count, chunks,
+                         [store_args[0]] * count, [store_args[1]] * count),
+            total=count,
+            desc="Mining commit partitions",
+        )
+        for frame in frames:
+            yield from frame.to_dict('records')
+
+def mine_history_parallel(repo_path, repo_full_name, since=None, jobs=2, commits=None, blob_cache=None):
+    """DataFrame com os registros de iter_history_parallel."""
+    return pd.DataFrame(list(iter_history_parallel(repo_path, repo_full_name, since, jobs, commits, blob_cache)))
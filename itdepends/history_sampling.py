@@ -0,0 +1,158 @@
+import os
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Iterator, List, Optional, Tuple
+
+from tqdm import tqdm
+
+from .clone_manager import is_partial_clone, prefetch_blobs
+from .git_history import MANIFEST_PATHSPECS
+from .git_repo import CatFileBatch, list_tree, run_git
+from .history import history_record
+from .models import Dependency
+from .parsers import parse_dependency_file
+from .parse_memo import ParseMemo
+from .utils import file_is_suitable
+
+SAMPLE_TAGS = "tags"
+SAMPLE_MONTH = "month"
+SAMPLE_WEEK = "week"
+SAMPLE_LAST = "last"
+
+SAMPLE_MODES = (SAMPLE_TAGS, SAMPLE_MONTH, SAMPLE_WEEK, SAMPLE_LAST)
+
+DEFAULT_SAMPLE_LAST = 10
+
+SAMPLE_FORMAT = "%H%x1f%an%x1f%aI%x1f%D"
+
+@dataclass(slots=True, frozen=True)
+class SamplePoint:
+    commit_hash: str
+    author_name: str
+    author_date: str
+    label: str   # tag, período (2024-05, 2024-W19) ou posição entre os últimos commits
+
+def _log_points(repo_path, *args) -> List[Tuple[str, str, str, str]]:
+    output = run_git(repo_path, "log", "-z", f"--format={SAMPLE_FORMAT}", *args)
+    return [tuple(record.decode("utf-8", errors="ignore").split("\x1f"))
+            for record in output.split(b"\0") if record]
+
+def _period(author_date: str, mode: str) -> str:
+    date = datetime.fromisoformat(author_date)
+    if mode == SAMPLE_WEEK:
+        year, week, _ = date.isocalendar()
+        return f"{year}-W{week:02d}"
+    return date.strftime("%Y-%m")
+
+def sample_commits(repo_path: str, mode: str, since: Optional[datetime] = None, last: int = DEFAULT_SAMPLE_LAST,
+                   rev: str = "HEAD") -> List[SamplePoint]:
+    """
+    Commits amostrados do histórico, do mais antigo para o mais recente:
+
+    - ``tags``: o commit de cada tag;
+    - ``month``/``week``: o último commit de cada mês/semana ISO no first-parent de ``rev``;
+    - ``last``: os ``last`` últimos commits (sem merge) que tocam manifestos.
+
+    Só os metadados dos commits são lidos; nenhum diff é calculado.
+    """
+    since_args = [f"--since={since.isoformat()}"] if since is not None else []
+
+    if mode == SAMPLE_TAGS:
+        points = []
+        for commit_hash, author_name, author_date, decoration in _log_points(repo_path, "--no-walk", "--tags",
+                                                                             *since_args):
+            tags = [ref[len("tag: "):] for ref in decoration.split(", ") if ref.startswith("tag: ")]
+            points.append(SamplePoint(commit_hash, author_name, author_date, ",".join(tags)))
+
+    elif mode in (SAMPLE_MONTH, SAMPLE_WEEK):
+        points = {}
+        # Do mais recente para o mais antigo: o primeiro commit de cada período é o seu estado final
+        for commit_hash, author_name, author_date, _ in _log_points(repo_path, "--first-parent", *since_args, rev):
+            period = _period(author_date, mode)
+            points.setdefault(period, SamplePoint(commit_hash, author_name, author_date, period))
+        points = list(points.values())
+
+    elif mode == SAMPLE_LAST:
+        log = _log_points(repo_path, f"--max-count={last}", "--no-merges", *since_args, rev,
+                          "--", *MANIFEST_PATHSPECS)
+        points = [SamplePoint(commit_hash, author_name, author_date, f"-{position}")
+                  for position, (commit_hash, author_name, author_date, _) in enumerate(log)]
+
+    else:
+        raise ValueError(f"Unknown sample mode: {mode}")
+
+    return sorted(points, key=lambda point: datetime.fromisoformat(point.author_date))
+
+def baseline_point(repo_path: str, since: datetime, rev: str = "HEAD") -> Optional[SamplePoint]:
+    """
+    Último commit anterior a ``since`` no first-parent de ``rev``: o estado dos manifestos
+    no início da janela. Em clones rasos é o commit de fronteira que clone_repository
+    já busca (``--deepen=1``). None quando o histórico começa dentro da janela.
+    """
+    log = _log_points(repo_path, "--max-count=1", "--first-parent", f"--before={since.isoformat()}", rev)
+    if not log:
+        return None
+
+    commit_hash, author_name, author_date, _ = log[0]
+    return SamplePoint(commit_hash, author_name, author_date, "baseline")
+
+def manifest_tree(repo_path: str, commit_hash: str) -> List[Tuple[str, str]]:
+    """(blob_sha, path) dos manifestos na árvore de ``commit_hash``, com o filtro de file_is_suitable."""
+    return [(sha, path) for sha, path in list_tree(repo_path, commit_hash)
+            if file_is_suitable(os.path.dirname(path), os.path.basename(path))]
+
+def iter_sampled_manifests(repo_path: str, points: List[SamplePoint], parse_memo: Optional[ParseMemo] = None,
+                           progress: bool = True) -> Iterator[Tuple[SamplePoint, str, List[Dependency]]]:
+    """
+    (SamplePoint, caminho, dependências) de cada manifesto presente em cada ponto
+    amostrado, lido direto da árvore do commit. Blobs repetidos entre amostras são
+    parseados uma vez (ParseMemo).
+    """
+    parse_memo = parse_memo or ParseMemo()
+    trees = [(point, manifest_tree(repo_path, point.commit_hash)) for point in points]
+
+    if is_partial_clone(repo_path):
+        prefetch_blobs(repo_path, (sha for _, entries in trees for sha, _ in entries))
+
+    with CatFileBatch(repo_path) as cat_file:
+
+        for point, entries in tqdm(trees, desc="Reading sampled manifests", disable=not progress):
+            for sha, path in entries:
+                filename = os.path.basename(path)
+
+                try:
+                    parsed = parse_memo.parse(filename, cat_file.read_text(sha), parse_dependency_file, sha=sha)
+                except Exception as e:
+                    print(f"Erro ao analisar o arquivo {filename} no commit {point.commit_hash}: {e}")
+                    continue
+
+                yield point, path, parsed
+
+def iter_baseline_history_records(repo_path, repo_full_name, since, parse_memo=None):
+    """
+    Registros do estado dos manifestos no início da janela (baseline_point), para que
+    dependências estáveis durante a janela também apareçam na linha do tempo.
+    """
+    point = baseline_point(repo_path, since)
+    if point is None:
+        return
+
+    for point, path, parsed in iter_sampled_manifests(repo_path, [point], parse_memo, progress=False):
+        filename = os.path.basename(path)
+        for dep in parsed:
+            yield history_record(repo_full_name, point.commit_hash, point.author_name, point.author_date,
+                                 filename, dep)
+
+def iter_sampled_history_records(repo_path, repo_full_name, mode, since=None, last=DEFAULT_SAMPLE_LAST,
+                                 parse_memo=None, progress=True):
+    """
+    Registros no formato de analyze_repository_commit_history, um conjunto por ponto
+    amostrado: o custo cresce com o número de amostras, não com o tamanho do histórico.
+    """
+    points = sample_commits(repo_path, mode, since, last)
+
+    for point, path, parsed in iter_sampled_manifests(repo_path, points, parse_memo, progress):
+        filename = os.path.basename(path)
+        for dep in parsed:
+            yield history_record(repo_full_name, point.commit_hash, point.author_name, point.author_date,
+                                 filename, dep)
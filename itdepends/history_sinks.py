@@ -0,0 +1,262 @@
+import csv
+import json
+import sqlite3
+from abc import ABC, abstractmethod
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+import pandas as pd
+
+from .columnar import history_schema, parse_commit_date, records_to_table, require_pyarrow
+
+OUTPUT_CSV = "csv"
+OUTPUT_NDJSON = "ndjson"
+OUTPUT_SQLITE = "sqlite"
+OUTPUT_PARQUET = "parquet"
+
+OUTPUT_EXTENSIONS = {
+    OUTPUT_CSV: "csv",
+    OUTPUT_NDJSON: "ndjson",
+    OUTPUT_SQLITE: "sqlite3",
+    OUTPUT_PARQUET: "parquet",
+}
+
+class HistorySink(ABC):
+    """
+    Destino de registros do histórico: recebe um registro por vez (``write``) e
+    libera recursos em ``close``. As colunas vêm do primeiro registro.
+    """
+
+    @abstractmethod
+    def write(self, record: dict) -> None:
+        pass
+
+    def close(self) -> None:
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+class CsvSink(HistorySink):
+    def __init__(self, path: str, encoding: str = "utf-8", fieldnames: Optional[List[str]] = None):
+        self.file = open(path, "w", newline="", encoding=encoding)
+        self.fieldnames = fieldnames
+        self.writer = None
+
+    def write(self, record):
+        if self.writer is None:
+            self.writer = csv.DictWriter(self.file, fieldnames=self.fieldnames or list(record))
+            self.writer.writeheader()
+        self.writer.writerow(record)
+
+    def close(self):
+        if self.writer is None and self.fieldnames:
+            csv.DictWriter(self.file, fieldnames=self.fieldnames).writeheader()
+        self.file.close()
+
+class NdjsonSink(HistorySink):
+    def __init__(self, path: str):
+        self.file = open(path, "w", encoding="utf-8")
+
+    def write(self, record):
+        self.file.write(json.dumps(record, ensure_ascii=False, default=str) + "\n")
+
+    def close(self):
+        self.file.close()
+
+class SqliteSink(HistorySink):
+    """Tabela ``table`` num banco SQLite, inserida em lotes de ``batch_size`` registros."""
+
+    def __init__(self, path: str, table: str = "history", batch_size: int = 1000):
+        self.conn = sqlite3.connect(path)
+        self.table = table
+        self.batch_size = batch_size
+        self.columns = None
+        self.batch = []
+
+    def write(self, record):
+        if self.columns is None:
+            self.columns = list(record)
+            columns = ", ".join(f'"{column}"' for column in self.columns)
+            self.conn.execute(f'DROP TABLE IF EXISTS "{self.table}"')
+            self.conn.execute(f'CREATE TABLE "{self.table}" ({columns})')
+
+        self.batch.append(tuple(record.get(column) for column in self.columns))
+        if len(self.batch) >= self.batch_size:
+            self._flush()
+
+    def _flush(self):
+        if self.batch:
+            placeholders = ", ".join("?" for _ in self.columns)
+            self.conn.executemany(f'INSERT INTO "{self.table}" VALUES ({placeholders})', self.batch)
+            self.batch = []
+
+    def close(self):
+        if self.columns is not None:
+            self._flush()
+            self.conn.commit()
+        self.conn.close()
+
+class ParquetSink(HistorySink):
+    """
+    Arquivo Parquet escrito em row groups de ``batch_size`` registros (requer pyarrow),
+    com o schema de columnar.history_schema: Data_Commit como timestamp e
+    Dependencia/Hash_Commit/Autor codificadas por dicionário.
+    """
+
+    def __init__(self, path: str, batch_size: int = 50_000):
+        require_pyarrow()
+
+        self.path = path
+        self.batch_size = batch_size
+        self.batch = []
+        self.writer = None
+
+    def write(self, record):
+        self.batch.append(record)
+        if len(self.batch) >= self.batch_size:
+            self._flush()
+
+    def _flush(self):
+        import pyarrow.parquet as pq
+
+        if not self.batch:
+            return
+
+        if self.writer is None:
+            self.writer = pq.ParquetWriter(self.path, history_schema(self.batch[0]))
+        self.writer.write_table(records_to_table(self.batch, self.writer.schema))
+        self.batch = []
+
+    def close(self):
+        self._flush()
+        if self.writer is not None:
+            self.writer.close()
+
+SINKS = {
+    OUTPUT_CSV: CsvSink,
+    OUTPUT_NDJSON: NdjsonSink,
+    OUTPUT_SQLITE: SqliteSink,
+    OUTPUT_PARQUET: ParquetSink,
+}
+
+def open_history_sink(output_format: str, path_without_extension: str) -> Tuple[HistorySink, str]:
+    """Abre o sink do formato pedido e retorna (sink, caminho do arquivo)."""
+    path = f"{path_without_extension}.{OUTPUT_EXTENSIONS[output_format]}"
+    return SINKS[output_format](path), path
+
+@dataclass(slots=True)
+class _DependencySummary:
+    first_version: str
+    first_date: datetime
+    last_version: str
+    last_date: datetime
+    versions: Set[str] = field(default_factory=set)
+    commits: Set[str] = field(default_factory=set)
+    timeline: List[tuple] = field(default_factory=list)
+    latest: Optional[tuple] = None
+
+class HistorySummary(HistorySink):
+    """
+    Resumo por dependência calculado em uma passada sobre os registros (o que o
+    groupby de gerar_relatorio_dependencias faria com o histórico inteiro em memória):
+    primeira/última versão, primeira/última data, versões e commits distintos.
+
+    Para a linha do tempo do relatório guarda só os pontos em que a versão de cada
+    dependência muda, mais o último registro de cada uma. Registros sem versão
+    (eventos ``removed``) são ignorados.
+    """
+
+    def __init__(self):
+        self.dependencies: Dict[str, _DependencySummary] = {}
+        self.commits: Set[str] = set()
+        self.records = 0
+
+    def write(self, record):
+        version = record.get("Versao")
+        if version is None or version != version:  # None ou NaN
+            return
+
+        version = str(version)
+        name = record["Dependencia"]
+        commit = record["Hash_Commit"]
+        date = parse_commit_date(record["Data_Commit"])
+        point = (date, version, commit)
+
+        self.records += 1
+        self.commits.add(commit)
+
+        summary = self.dependencies.get(name)
+        if summary is None:
+            summary = self.dependencies[name] = _DependencySummary(version, date, version, date)
+
+        if date < summary.first_date:
+            summary.first_version, summary.first_date = version, date
+        if date >= summary.last_date:
+            summary.last_version, summary.last_date = version, date
+
+        summary.versions.add(version)
+        summary.commits.add(commit)
+
+        if not summary.timeline or summary.timeline[-1][1] != version:
+            summary.timeline.append(point)
+        summary.latest = point
+
+    @property
+    def total_commits(self) -> int:
+        return len(self.commits)
+
+    @property
+    def total_dependencies(self) -> int:
+        return len(self.dependencies)
+
+    def to_frame(self) -> pd.DataFrame:
+        """Mesmas colunas do ``resumo_dep`` do relatório."""
+        return pd.DataFrame(
+            [
+                {
+                    "Dependencia": name,
+                    "primeira_versao": summary.first_version,
+                    "ultima_versao": summary.last_version,
+                    "primeiro_commit": pd.Timestamp(summary.first_date),
+                    "ultimo_commit": pd.Timestamp(summary.last_date),
+                    "qtd_versoes": len(summary.versions),
+                    "qtd_commits": len(summary.commits),
+                }
+                for name, summary in sorted(self.dependencies.items())
+            ],
+            columns=["Dependencia", "primeira_versao", "ultima_versao", "primeiro_commit",
+                     "ultimo_commit", "qtd_versoes", "qtd_commits"],
+        )
+
+    def timeline(self) -> pd.DataFrame:
+        """Pontos da linha do tempo com as colunas que o relatório usa."""
+        rows = []
+        for name, summary in self.dependencies.items():
+            points = list(summary.timeline)
+            if summary.latest is not points[-1]:
+                points.append(summary.latest)
+            for date, version, commit in points:
+                rows.append({"Data_Commit": date, "Hash_Commit": commit, "Dependencia": name, "Versao": version})
+
+        return pd.DataFrame(rows, columns=["Data_Commit", "Hash_Commit", "Dependencia", "Versao"])
+
+def iter_frame_records(df: pd.DataFrame) -> Iterator[dict]:
+    """Registros de ``df`` um a um, sem a lista inteira que to_dict('records') criaria."""
+    columns = list(df.columns)
+    for values in df.itertuples(index=False, name=None):
+        yield dict(zip(columns, values))
+
+def stream_history(records: Iterable[dict], sinks: Iterable[HistorySink]) -> int:
+    """Envia cada registro a todos os sinks sem acumulá-los; retorna quantos passaram."""
+    sinks = list(sinks)
+    count = 0
+    for record in records:
+        for sink in sinks:
+            sink.write(record)
+        count += 1
+    return count
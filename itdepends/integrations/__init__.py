@@ -1,2 +1,3 @@
 from .github_api import GitHubClient
-from .pypi_api import PyPiClient, create_session
\ No newline at end of file
+from .pypi_api import PyPiClient, create_session
+from .http_cache import ResponseCache
\ No newline at end of file
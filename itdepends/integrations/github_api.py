@@ -1,90 +1,277 @@
 import requests
 
 from base64 import b64decode
+import json
 import os
+import tarfile
 from datetime import datetime, timezone
 from ..utils import diff_in_months
+from ..models import RepoInfo
+from .http_cache import ResponseMemo, cached_get, memo_ttl
+from .rate_limit import (MAX_RATE_LIMIT_RETRIES, RESOURCE_GRAPHQL, ScheduledRequest, get_scheduler, parse_tokens,
+                         tokens_identity)
+
+GITHUB_API_URL = "https://api.github.com"
+
+DEFAULT_GRAPHQL_BATCH_SIZE = 50
 
 class GitHubClient:
-    def __init__(self, token=None, timeout=10):
+    def __init__(self, token=None, timeout=10, cache=None, api_url=GITHUB_API_URL):
+        self.tokens = parse_tokens(token if token else os.environ.get("GITHUB_TOKEN"))
         self.session = create_github_session(token)
+        self.scheduler = get_scheduler(self.tokens)
         self.session.timeout = timeout
-        self.base_url = "https://api.github.com/repos/"
+        self.api_url = api_url
+        self.base_url = f"{api_url}/repos/"
+        self.graphql_url = f"{api_url}/graphql"
+        self.cache = cache
+        self.cache_identity = tokens_identity(self.tokens)
+        # (identidade, "owner/repo") -> RepoInfo, com a validade do cache de respostas
+        self.repo_memo = ResponseMemo(memo_ttl(cache))
     
     def do_safe_request(self, url):
-        try:
-            response = self.session.get(url)
+        # Respostas barradas por rate limit são repetidas; o scheduler troca de token ou espera o reset
+        for _ in range(MAX_RATE_LIMIT_RETRIES + 1):
+            attempt = ScheduledRequest(self.scheduler)
             
-            if response.status_code == 200:
-                return response.json(), None
+            data, error = cached_get(self.session, url, self.cache, self.cache_identity,
+                                     prepare=attempt.headers, on_response=attempt.on_response)
+            
+            if not attempt.limited:
+                break
+        
+        return data, error
+    
+    def rate_limit_status(self):
+        return self.scheduler.status()
+        
+    def get_repo_info(self, repo_name):
+        """
+        Retorna o RepoInfo de repos/<owner>/<repo>. A consulta é feita uma vez por
+        cliente dentro da validade do memo, mesmo com várias threads pedindo o mesmo
+        repositório ao mesmo tempo; apenas respostas definitivas (200 ou 404) são
+        memorizadas.
+        """
+        key = (self.cache_identity, repo_name)
+        info = self.repo_memo.get(key)
+        
+        if info is not None:
+            return info
+        
+        with self.repo_memo.fetching(key):
+            # Outra thread pode ter concluído a mesma busca enquanto esta esperava
+            info = self.repo_memo.get(key)
             
-            return None, response.status_code
+            if info is not None:
+                return info
             
-        except requests.exceptions.Timeout:
-            return None, "timeout"
+            url = self.base_url + repo_name
+            
+            data, error = self.do_safe_request(url)
+            
+            if error:
+                info = RepoInfo(full_name=repo_name, error=error)
+            else:
+                info = RepoInfo.from_json(repo_name, data)
+            
+            if not error or error == 404:
+                self.repo_memo.set(key, info)
         
-    def verify_repo_existance(self, repo_name):
-        url = self.base_url + repo_name
+        return info
     
-        response = self.session.get(url)
+    def clear_repo_cache(self):
+        self.repo_memo.clear()
         
-        return response.status_code == 200
+    def can_use_graphql(self):
+        # A API GraphQL não aceita requisições anônimas
+        return bool(self.tokens)
     
-    def get_default_branch_name(self, repo_name):
-        url = self.base_url + repo_name
+    def get_repo_info_batch(self, repo_names, batch_size=DEFAULT_GRAPHQL_BATCH_SIZE, fallback=True):
+        """
+        Busca o RepoInfo de vários repositórios via GraphQL, ``batch_size`` por consulta,
+        usando aliases. Repositórios que a consulta não resolve (não encontrados, erros,
+        falha de rede) são consultados via REST quando ``fallback`` é True.
         
-        data, error = self.do_safe_request(url)
+        Retorna um dicionário "owner/repo" -> RepoInfo com os valores também memorizados
+        e, com cache, gravados como respostas de repos/<owner>/<repo>.
+        """
+        results = {}
+        pending = []
         
-        if (error): raise Exception(error);
+        for repo_name in dict.fromkeys(repo_names):
+            info = self.repo_memo.get((self.cache_identity, repo_name))
+            if info is not None:
+                results[repo_name] = info
+            else:
+                pending.append(repo_name)
         
-        return data.get('default_branch')
-    
-    def get_file_contents(self, url):
-        data, erros = self.do_safe_request(url)
+        failed = []
         
-        content = b64decode(data.get('content')).decode("utf-8")
+        for start in range(0, len(pending), batch_size):
+            chunk = pending[start:start + batch_size]
+            
+            found = self._query_repo_batch(chunk) if self.can_use_graphql() else {}
+            
+            for repo_name, info in found.items():
+                self.repo_memo.set((self.cache_identity, repo_name), info)
+            
+            if self.cache is not None:
+                # Gravado como a resposta REST equivalente: execuções seguintes e o
+                # export do snapshot (export_from_cache) leem o mesmo lugar
+                for repo_name, info in found.items():
+                    self.cache.set(self.base_url + repo_name, self.cache_identity, info.to_json())
+            
+            results.update(found)
+            failed.extend(name for name in chunk if name not in found)
         
-        return content
+        if fallback:
+            for repo_name in failed:
+                results[repo_name] = self.get_repo_info(repo_name)
+        
+        return results
     
-    def get_file_tree(self, repo_name, branch):
-        url = f"https://api.github.com/repos/{repo_name}/git/trees/{branch}?recursive=1"
+    def _query_repo_batch(self, repo_names):
+        aliases = {}
+        fields = []
         
-        data, error = self.do_safe_request(url)
+        for i, repo_name in enumerate(repo_names):
+            owner, _, name = repo_name.partition("/")
+            if not owner or not name:
+                continue
+            
+            alias = f"r{i}"
+            aliases[alias] = repo_name
+            fields.append(
+                f"{alias}: repository(owner: {json.dumps(owner)}, name: {json.dumps(name)}) "
+                "{ isArchived pushedAt defaultBranchRef { name } }"
+            )
         
-        return data.get('tree')
-    
-    def verify_inactivity(self, repo_name, max_months=6):
-        url = self.base_url + repo_name
+        if not fields:
+            return {}
         
-        data, error = self.do_safe_request(url)
+        query = "query {\n  " + "\n  ".join(fields) + "\n}"
+        
+        attempt = ScheduledRequest(self.scheduler, RESOURCE_GRAPHQL)
+        
+        try:
+            response = self.session.post(self.graphql_url, json={"query": query}, headers=attempt.headers())
+        except requests.exceptions.RequestException:
+            return {}
         
-        pushed_at_str = data.get("pushed_at")
+        attempt.on_response(response)
         
-        if not pushed_at_str: # New repo
-            return True
+        if response.status_code != 200:
+            return {}
         
-        today = datetime.now(timezone.utc)
-        last_push_data = datetime.strptime(pushed_at_str, "%Y-%m-%dT%H:%M:%SZ").replace(tzinfo=timezone.utc)
+        data = response.json().get("data") or {}
         
-        diff = diff_in_months(last_push_data, today)
+        found = {}
+        for alias, repo_name in aliases.items():
+            repo = data.get(alias)
+            
+            # null: repositório inexistente ou erro parcial; fica para o fallback REST
+            if not repo:
+                continue
+            
+            found[repo_name] = RepoInfo(
+                full_name=repo_name,
+                exists=True,
+                archived=repo.get("isArchived", False),
+                pushed_at=repo.get("pushedAt"),
+                default_branch=(repo.get("defaultBranchRef") or {}).get("name"),
+            )
         
-        if (diff > max_months): return True
+        return found
         
-        return False
+    def verify_repo_existance(self, repo_name):
+        return repo_exists(self.get_repo_info(repo_name))
     
-    def verify_archived(self, repo_name):
-        url = self.base_url + repo_name
+    def get_default_branch_name(self, repo_name):
+        info = self.get_repo_info(repo_name)
+        
+        if (info.error): raise Exception(info.error);
+        
+        return info.default_branch
+    
+    def get_file_contents(self, url):
+        data, erros = self.do_safe_request(url)
+        
+        content = b64decode(data.get('content')).decode("utf-8")
+        
+        return content
+    
+    def get_file_tree(self, repo_name, branch):
+        url = f"{self.base_url}{repo_name}/git/trees/{branch}?recursive=1"
         
         data, error = self.do_safe_request(url)
         
-        is_archived = data.get("archived", False)
+        return data.get('tree')
+    
+    def iter_archive_files(self, repo_name, ref, filenames):
+        """
+        Percorre o tarball de ``ref`` em streaming e devolve (path, conteúdo) apenas dos
+        membros cujo nome está em ``filenames``. Nada é extraído para o disco e só o
+        conteúdo dos manifestos fica em memória.
+        """
+        url = f"{self.base_url}{repo_name}/tarball/{ref}"
         
-        return is_archived
+        attempt = ScheduledRequest(self.scheduler)
+        response = self.session.get(url, headers=attempt.headers(), stream=True)
+        attempt.on_response(response)
         
+        try:
+            if response.status_code != 200:
+                raise Exception(response.status_code)
+            
+            # "r|gz": leitura sequencial do stream, sem seek
+            with tarfile.open(fileobj=response.raw, mode="r|gz") as archive:
+                for member in archive:
+                    if not member.isfile():
+                        continue
+                    
+                    # Os membros vêm sob um diretório raiz "<owner>-<repo>-<sha>/"
+                    path = member.name.split("/", 1)[-1]
+                    
+                    if os.path.basename(path) not in filenames:
+                        continue
+                    
+                    content = archive.extractfile(member).read().decode("utf-8", errors="ignore")
+                    yield path, content
+        finally:
+            response.close()
+    
+    def verify_inactivity(self, repo_name, max_months=6):
+        return is_inactive(self.get_repo_info(repo_name), max_months)
+    
+    def verify_archived(self, repo_name):
+        return is_archived(self.get_repo_info(repo_name))
+
+def repo_exists(info):
+    return info.exists
+
+def is_archived(info):
+    return info.archived
+
+def is_inactive(info, max_months=6, now=None):
+    if not info.pushed_at: # New repo
+        return True
+    
+    today = now or datetime.now(timezone.utc)
+    last_push_data = datetime.strptime(info.pushed_at, "%Y-%m-%dT%H:%M:%SZ").replace(tzinfo=timezone.utc)
+    
+    diff = diff_in_months(last_push_data, today)
+    
+    if (diff > max_months): return True
+    
+    return False
+
 def create_github_session(token=None):
     session = requests.Session()
     
-    final_token = token if token else os.environ.get("GITHUB_TOKEN")
+    tokens = parse_tokens(token if token else os.environ.get("GITHUB_TOKEN"))
+    
+    # Com vários tokens o Authorization é definido por requisição pelo RateLimitScheduler
+    final_token = tokens[0] if len(tokens) == 1 else None
     
     headers = {
         "Accept": "application/vnd.github.v3+json",
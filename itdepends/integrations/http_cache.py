@@ -0,0 +1,254 @@
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterator, Optional
+
+import requests
+
+from ..utils import cache_path
+
+DEFAULT_TTL_SECONDS = 60 * 60
+
+@dataclass(slots=True)
+class CacheEntry:
+    url: str
+    body: Any
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+    stored_at: float = field(default_factory=time.time)
+
+    def conditional_headers(self) -> Dict[str, str]:
+        """Cabeçalhos para revalidar a entrada (If-None-Match / If-Modified-Since)."""
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+class ResponseCache:
+    """
+    Cache persistente de respostas JSON em disco.
+
+    Cada entrada é um arquivo JSON identificado pela URL e pela identidade de
+    autenticação (hash do token), guardando o corpo junto com ETag/Last-Modified.
+    Entradas com idade menor que ``ttl`` segundos são servidas sem rede; as demais
+    são revalidadas com requisições condicionais.
+    """
+
+    def __init__(self, directory: Optional[str] = None, ttl: float = DEFAULT_TTL_SECONDS):
+        self.directory = directory or cache_path("http")
+        self.ttl = ttl
+        self.hits = 0
+        self.revalidated = 0
+        self.misses = 0
+
+    def _key(self, url: str, identity: Optional[str]) -> str:
+        return hashlib.sha256(f"{identity or ''}\n{url}".encode("utf-8")).hexdigest()
+
+    def _entry_path(self, url: str, identity: Optional[str]) -> str:
+        key = self._key(url, identity)
+        return os.path.join(self.directory, key[:2], key + ".json")
+
+    def get(self, url: str, identity: Optional[str] = None) -> Optional[CacheEntry]:
+        try:
+            with open(self._entry_path(url, identity), encoding="utf-8") as f:
+                return CacheEntry(**json.load(f))
+        except (OSError, ValueError, TypeError):
+            return None
+
+    def entries(self) -> Iterator[CacheEntry]:
+        """Percorre todas as entradas gravadas no diretório do cache."""
+        if not os.path.isdir(self.directory):
+            return
+        for root, _, files in os.walk(self.directory):
+            for name in files:
+                if not name.endswith(".json"):
+                    continue
+                try:
+                    with open(os.path.join(root, name), encoding="utf-8") as f:
+                        yield CacheEntry(**json.load(f))
+                except (OSError, ValueError, TypeError):
+                    continue
+
+    def is_fresh(self, entry: CacheEntry) -> bool:
+        return self.ttl > 0 and (time.time() - entry.stored_at) < self.ttl
+
+    def set(self, url: str, identity: Optional[str], body: Any,
+            etag: Optional[str] = None, last_modified: Optional[str] = None) -> CacheEntry:
+        entry = CacheEntry(url=url, body=body, etag=etag, last_modified=last_modified)
+        self._write(self._entry_path(url, identity), entry)
+        return entry
+
+    def refresh(self, url: str, identity: Optional[str], entry: CacheEntry) -> None:
+        """Renova o ``stored_at`` de uma entrada revalidada (resposta 304)."""
+        entry.stored_at = time.time()
+        self._write(self._entry_path(url, identity), entry)
+
+    def _write(self, path: str, entry: CacheEntry) -> None:
+        directory = os.path.dirname(path)
+        os.makedirs(directory, exist_ok=True)
+        # Nome temporário único: threads e processos gravando a mesma entrada não se atropelam
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump({
+                    "url": entry.url,
+                    "body": entry.body,
+                    "etag": entry.etag,
+                    "last_modified": entry.last_modified,
+                    "stored_at": entry.stored_at,
+                }, f)
+            os.replace(tmp_path, path)
+        except BaseException:
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+            raise
+
+class KeyedLocks:
+    """
+    Um lock por chave, criado sob demanda e descartado quando ninguém o usa. Serve
+    para que duas threads não busquem ao mesmo tempo o mesmo recurso ainda ausente
+    de um memo: a segunda espera a primeira e encontra o valor já memorizado.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._locks = {}
+
+    @contextmanager
+    def hold(self, key):
+        with self._lock:
+            lock, users = self._locks.get(key, (None, 0))
+            lock = lock or threading.Lock()
+            self._locks[key] = (lock, users + 1)
+
+        try:
+            with lock:
+                yield
+        finally:
+            with self._lock:
+                lock, users = self._locks[key]
+                if users == 1:
+                    del self._locks[key]
+                else:
+                    self._locks[key] = (lock, users - 1)
+
+class ResponseMemo:
+    """
+    Valores já convertidos das respostas de um cliente (RepoInfo, PyPiProject),
+    guardados em memória por ``ttl`` segundos. Vive com o cliente: num processo
+    longo (batch, worker) os metadados expiram junto com o ResponseCache, em vez de
+    ficarem congelados desde a primeira consulta.
+
+    ``fetching(key)`` serializa as buscas de uma mesma chave ainda ausente.
+    """
+
+    def __init__(self, ttl: float = DEFAULT_TTL_SECONDS, clock=time.monotonic):
+        self.ttl = ttl
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._values = {}
+        self._purge_at = 1024
+        self._fetches = KeyedLocks()
+
+    def get(self, key):
+        with self._lock:
+            item = self._values.get(key)
+            if item is None:
+                return None
+            value, expires = item
+            if self._clock() >= expires:
+                del self._values[key]
+                return None
+            return value
+
+    def set(self, key, value) -> None:
+        if self.ttl <= 0:
+            return
+        now = self._clock()
+        with self._lock:
+            self._values[key] = (value, now + self.ttl)
+            # Entradas vencidas que ninguém mais pediu são descartadas de tempos em tempos
+            if len(self._values) >= self._purge_at:
+                self._values = {k: item for k, item in self._values.items() if item[1] > now}
+                self._purge_at = max(1024, 2 * len(self._values))
+
+    def clear(self) -> None:
+        with self._lock:
+            self._values.clear()
+
+    def fetching(self, key):
+        return self._fetches.hold(key)
+
+def memo_ttl(cache: Optional[ResponseCache]) -> float:
+    """Validade do memo de um cliente: nunca maior que o TTL do cache de respostas."""
+    return cache.ttl if cache is not None else DEFAULT_TTL_SECONDS
+
+def mount_connection_pool(session: requests.Session, pool_size: int) -> None:
+    """
+    Monta um pool keep-alive com ``pool_size`` conexões reutilizáveis por host. Um
+    pool já montado com essa capacidade é mantido, com as conexões abertas.
+    """
+    current = session.adapters.get("https://")
+    if getattr(current, "_pool_maxsize", 0) >= pool_size:
+        return
+
+    adapter = requests.adapters.HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+
+def cached_get(session: requests.Session, url: str, cache: Optional[ResponseCache] = None,
+               identity: Optional[str] = None, prepare=None, on_response=None):
+    """
+    GET com cache opcional. Retorna (data, error) no mesmo formato de ``do_safe_request``.
+
+    ``prepare`` é chamado apenas quando a rede será usada e devolve cabeçalhos extras;
+    ``on_response`` recebe a resposta crua (ex: para ler cabeçalhos de rate limit).
+    """
+    entry = cache.get(url, identity) if cache is not None else None
+
+    if entry is not None and cache.is_fresh(entry):
+        cache.hits += 1
+        return entry.body, None
+
+    try:
+        headers = dict(prepare()) if prepare is not None else {}
+        if entry is not None:
+            headers.update(entry.conditional_headers())
+
+        if headers:
+            response = session.get(url, headers=headers)
+        else:
+            response = session.get(url)
+
+        if on_response is not None:
+            on_response(response)
+
+        if response.status_code == 304 and entry is not None:
+            cache.revalidated += 1
+            cache.refresh(url, identity, entry)
+            return entry.body, None
+
+        if response.status_code == 200:
+            data = response.json()
+
+            if cache is not None:
+                cache.misses += 1
+                cache.set(url, identity, data,
+                          etag=response.headers.get("ETag"),
+                          last_modified=response.headers.get("Last-Modified"))
+
+            return data, None
+
+        return None, response.status_code
+
+    except requests.exceptions.Timeout:
+        return None, "timeout"
@@ -1,84 +1,121 @@
 import requests
 import re
 
+from packaging.utils import canonicalize_name
+
+from ..models import PyPiProject
+from .http_cache import ResponseMemo, cached_get, memo_ttl
+
+PYPI_URL = "https://pypi.org/pypi/"
+
+STATUS_REGEX = re.compile(r"Development Status :: (\d - [A-Za-z/]+)")
+
 class PyPiClient():
-    def __init__(self, timeout=10):
+    def __init__(self, timeout=10, cache=None, base_url=PYPI_URL):
         self.session = create_session()
         self.session.timeout = timeout
-        self.base_url = "https://pypi.org/pypi/"
+        self.base_url = base_url
+        self.cache = cache
+        # Nome canônico -> PyPiProject, com a validade do cache de respostas
+        self.project_memo = ResponseMemo(memo_ttl(cache))
         
     def do_safe_request(self, url):
-        try:
-            response = self.session.get(url)
+        return cached_get(self.session, url, self.cache)
+    
+    def get_project(self, package_name):
+        """
+        Retorna (PyPiProject, None) ou (None, erro). O documento de cada pacote
+        é baixado uma única vez por cliente dentro da validade do memo, mesmo com
+        várias threads pedindo o mesmo pacote ao mesmo tempo; falhas não são
+        memorizadas.
+        """
+        key = canonicalize_name(package_name)
+        project = self.project_memo.get(key)
+        
+        if project is not None:
+            return project, None
+        
+        with self.project_memo.fetching(key):
+            # Outra thread pode ter concluído a mesma busca enquanto esta esperava
+            project = self.project_memo.get(key)
+            
+            if project is not None:
+                return project, None
             
-            if response.status_code == 200:
-                return response.json(), None
+            url = self.base_url + package_name + "/json"
             
-            return None, response.status_code
+            data, error = self.do_safe_request(url)
             
-        except requests.exceptions.Timeout:
-            return None, "timeout"
+            if error:
+                return None, error
+            
+            project = PyPiProject.from_json(package_name, data)
+            
+            self.project_memo.set(key, project)
         
-    def verify_development_status(self, package_name):
-        url = self.base_url + package_name + "/json"
+        return project, None
+    
+    def clear_project_cache(self):
+        self.project_memo.clear()
         
-        data, error = self.do_safe_request(url)
+    def verify_development_status(self, package_name):
+        project, error = self.get_project(package_name)
         
         if error:
             return False, error
 
-        classifiers = data.get("info", {}).get("classifiers", [])
-
-        if not classifiers:
-            return False, "no_classifiers_available"
-        
-        status_regex = re.compile(r"Development Status :: (\d - [A-Za-z/]+)")
-        
-        status_number = None
-        for classifier in classifiers:
-            match = status_regex.search(classifier)
-            if match:
-                status_number = match.group(1)
-                break    
-            
-        return True, status_number
+        return extract_development_status(project)
     
     def get_github_repo_name(self, package_name):
-        url = self.base_url + package_name + "/json"
-        
-        data, error = self.do_safe_request(url)
+        project, error = self.get_project(package_name)
         
         if error:
             return False, error
 
-        info = data.get("info", {})
-        
-        project_urls = info.get("project_urls", {})
+        return extract_github_repo(project)
+
+def extract_development_status(project):
+    classifiers = project.classifiers
+
+    if not classifiers:
+        return False, "no_classifiers_available"
+    
+    status_number = None
+    for classifier in classifiers:
+        match = STATUS_REGEX.search(classifier)
+        if match:
+            status_number = match.group(1)
+            break    
         
-        if not project_urls:
-            return False, "There was no urls linked to the project"
+    return True, status_number
 
-        package_github = []
+def extract_github_repo(project):
+    project_urls = project.project_urls
+    
+    if not project_urls:
+        return False, "There was no urls linked to the project"
+
+    package_github = []
+    
+    for section in project_urls:
+        url = project_urls.get(section, None)
         
-        for section in project_urls:
-            url = project_urls.get(section, None)
-            
-            if "github.com" in url:
-                package_github.append(url)
+        if "github.com" in url:
+            package_github.append(url)
 
-        if len(package_github) == 0:
-            return False, f"Couldn't find file with name '{package_name}'."
+    if len(package_github) == 0:
+        return False, f"Couldn't find file with name '{project.name}'."
+    
+    for val in package_github:
+        match = re.search(r"github\.com/([^/]+)/([^/]+)", val)
         
-        for val in package_github:
-            match = re.search(r"github\.com/([^/]+)/([^/]+)", val)
-            
-            if match:
-                owner = match.group(1)
-                repo = match.group(2).split(".")[0]
-                return True, owner + "/" + repo
-            
-        return False, f"URLs found, but couldn't parse owner/repo."
+        if match:
+            owner = match.group(1)
+            repo = match.group(2).split(".")[0]
+            return True, owner + "/" + repo
         
+    return False, f"URLs found, but couldn't parse owner/repo."
+
 def create_session():
     session = requests.Session()
     
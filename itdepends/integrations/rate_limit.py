@@ -0,0 +1,202 @@
+import hashlib
+import threading
+import time
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+# Abaixo desta fração do limite as requisições passam a ser espaçadas até o reset
+PACE_THRESHOLD = 0.1
+
+# Quantas vezes uma requisição barrada por rate limit é reenviada com outro token
+MAX_RATE_LIMIT_RETRIES = 3
+
+# Orçamentos (X-RateLimit-Resource) independentes de cada token
+RESOURCE_CORE = "core"
+RESOURCE_GRAPHQL = "graphql"
+
+@dataclass(slots=True)
+class TokenQuota:
+    token: Optional[str]
+    resource: str = RESOURCE_CORE
+    limit: Optional[int] = None
+    remaining: Optional[int] = None
+    reset_at: float = 0.0         # epoch em que a cota é renovada (X-RateLimit-Reset)
+    blocked_until: float = 0.0    # epoch até onde o GitHub pediu espera (Retry-After)
+    next_request_at: float = 0.0  # espaçamento aplicado quando a cota está baixa
+    requests: int = 0
+    rate_limited: int = 0
+
+    @property
+    def label(self) -> str:
+        if not self.token:
+            return "anonymous"
+        return f"...{self.token[-4:]}"
+
+    def available_at(self, now: float) -> float:
+        """Primeiro instante em que o token pode ser usado novamente."""
+        ready = max(self.blocked_until, self.next_request_at)
+        if self.remaining is not None and self.remaining <= 0 and now < self.reset_at:
+            ready = max(ready, self.reset_at)
+        return ready
+
+class RateLimitScheduler:
+    """
+    Controla a cota da API do GitHub de um ou mais tokens.
+
+    ``acquire`` escolhe o token com mais cota restante, espaçando as requisições
+    quando a cota fica baixa, e só dorme quando todos os tokens estão esgotados.
+    ``update`` lê X-RateLimit-* e Retry-After de cada resposta. Cada recurso da API
+    (REST ``core``, ``graphql``...) tem a sua própria cota por token.
+    """
+
+    def __init__(self, tokens: List[Optional[str]], clock=time.time, sleep=time.sleep):
+        self.tokens = list(tokens) or [None]
+        self.resources: Dict[str, List[TokenQuota]] = {}
+        self.clock = clock
+        self.sleep = sleep
+        self.lock = threading.Lock()
+        self.slept_seconds = 0.0
+        self.quotas = self._quotas(RESOURCE_CORE)
+
+    @property
+    def rotates(self) -> bool:
+        return len(self.tokens) > 1
+
+    def _quotas(self, resource: str) -> List[TokenQuota]:
+        quotas = self.resources.get(resource)
+        if quotas is None:
+            quotas = self.resources[resource] = [TokenQuota(token, resource) for token in self.tokens]
+        return quotas
+
+    def acquire(self, resource: str = RESOURCE_CORE) -> TokenQuota:
+        while True:
+            with self.lock:
+                quotas = self._quotas(resource)
+                now = self.clock()
+                ready = [q for q in quotas if q.available_at(now) <= now]
+
+                if ready:
+                    quota = max(ready, key=lambda q: float("inf") if q.remaining is None else q.remaining)
+                    quota.requests += 1
+                    if quota.remaining is not None:
+                        quota.remaining -= 1
+                    self._pace(quota, now)
+                    return quota
+
+                wait = min(q.available_at(now) for q in quotas) - now
+                if wait > 0:
+                    self.slept_seconds += wait
+
+            if wait > 0:
+                self.sleep(wait)
+
+    def _pace(self, quota: TokenQuota, now: float) -> None:
+        if not quota.limit or quota.remaining is None:
+            return
+        if quota.remaining >= quota.limit * PACE_THRESHOLD or now >= quota.reset_at:
+            return
+        # Distribui o que resta da cota até o próximo reset
+        quota.next_request_at = now + (quota.reset_at - now) / max(quota.remaining, 1)
+
+    def update(self, quota: TokenQuota, response) -> bool:
+        """
+        Atualiza a cota a partir da resposta. Retorna True se a resposta foi
+        barrada por rate limit e deve ser repetida.
+
+        Os cabeçalhos valem para o recurso que o GitHub informa em
+        X-RateLimit-Resource, que pode não ser o de ``quota`` (ex: search).
+        """
+        headers = response.headers
+        resource = headers.get("X-RateLimit-Resource")
+
+        now = self.clock()
+        remaining = _int_header(headers, "X-RateLimit-Remaining")
+        limit = _int_header(headers, "X-RateLimit-Limit")
+        reset = _int_header(headers, "X-RateLimit-Reset")
+        retry_after = _int_header(headers, "Retry-After")
+
+        with self.lock:
+            if isinstance(resource, str) and resource != quota.resource:
+                quota = next(q for q in self._quotas(resource) if q.token == quota.token)
+
+            if limit is not None:
+                quota.limit = limit
+            if remaining is not None:
+                quota.remaining = remaining
+            if reset is not None:
+                quota.reset_at = float(reset)
+            if retry_after is not None:
+                quota.blocked_until = now + retry_after
+
+            limited = response.status_code in (403, 429) and (remaining == 0 or retry_after is not None)
+            if limited:
+                quota.rate_limited += 1
+                if quota.remaining is None:
+                    quota.remaining = 0
+
+        return limited
+
+    def status(self) -> List[Dict]:
+        """Contadores de cota por token e recurso usado (tokens mascarados)."""
+        with self.lock:
+            return [{
+                "token": q.label,
+                "resource": q.resource,
+                "limit": q.limit,
+                "remaining": q.remaining,
+                "reset_at": q.reset_at or None,
+                "requests": q.requests,
+                "rate_limited": q.rate_limited,
+            } for quotas in self.resources.values() for q in quotas
+                if q.resource == RESOURCE_CORE or q.requests or q.limit is not None]
+
+def _int_header(headers, name) -> Optional[int]:
+    value = headers.get(name)
+    if not isinstance(value, (str, int)):
+        return None
+    try:
+        return int(value)
+    except ValueError:
+        return None
+
+def parse_tokens(token: Optional[str]) -> List[str]:
+    """Aceita um token ou vários separados por vírgula (ex: GITHUB_TOKEN=tok1,tok2)."""
+    if not token:
+        return []
+    return [t.strip() for t in token.split(",") if t.strip()]
+
+def tokens_identity(tokens: List[str]) -> Optional[str]:
+    """Identidade estável do conjunto de tokens, sem expor nenhum deles."""
+    if not tokens:
+        return None
+    return hashlib.sha256(",".join(sorted(tokens)).encode("utf-8")).hexdigest()[:16]
+
+# Um scheduler por conjunto de tokens, compartilhado por todos os clientes do processo
+_SCHEDULERS: Dict[tuple, RateLimitScheduler] = {}
+_SCHEDULERS_LOCK = threading.Lock()
+
+def get_scheduler(tokens: List[str]) -> RateLimitScheduler:
+    key = tuple(tokens)
+    with _SCHEDULERS_LOCK:
+        if key not in _SCHEDULERS:
+            _SCHEDULERS[key] = RateLimitScheduler(list(tokens))
+        return _SCHEDULERS[key]
+
+class ScheduledRequest:
+    """Uma tentativa de requisição: reserva um token e registra a resposta no scheduler."""
+
+    def __init__(self, scheduler: RateLimitScheduler, resource: str = RESOURCE_CORE):
+        self.scheduler = scheduler
+        self.resource = resource
+        self.quota: Optional[TokenQuota] = None
+        self.limited = False
+
+    def headers(self) -> Dict[str, str]:
+        self.quota = self.scheduler.acquire(self.resource)
+        # Com um único token o Authorization já está na sessão
+        if self.scheduler.rotates and self.quota.token:
+            return {"Authorization": f"token {self.quota.token}"}
+        return {}
+
+    def on_response(self, response) -> None:
+        self.limited = self.scheduler.update(self.quota, response)
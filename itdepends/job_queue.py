@@ -0,0 +1,334 @@
+import os
+import socket
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Dict, Iterable, Optional
+
+import click
+
+from .application import build_resources, run
+from .batch import RESOURCE_OPTIONS
+from .utils import cache_path
+
+DEFAULT_QUEUE_PATH = cache_path("queue.sqlite3")
+
+DEFAULT_LEASE_SECONDS = 15 * 60
+DEFAULT_MAX_ATTEMPTS = 3
+DEFAULT_RETRY_DELAY = 60
+
+# Falhas seguidas do heartbeat (banco travado, volume indisponível) até o lease ser dado como perdido:
+# com a renovação a cada terço do lease, a segunda falha acontece a um terço de ele expirar
+MAX_HEARTBEAT_FAILURES = 2
+
+JOB_PENDING = "pending"
+JOB_RUNNING = "running"
+JOB_DONE = "done"
+JOB_FAILED = "failed"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    repo_name TEXT PRIMARY KEY,
+    status TEXT NOT NULL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    worker TEXT,
+    lease_expires REAL,
+    not_before REAL NOT NULL DEFAULT 0,
+    enqueued_at REAL NOT NULL,
+    finished_at REAL,
+    last_error TEXT
+);
+CREATE INDEX IF NOT EXISTS jobs_status ON jobs (status, not_before, enqueued_at);
+"""
+
+@dataclass(slots=True, frozen=True)
+class Job:
+    repo_name: str
+    attempts: int
+    worker: str
+
+def default_worker_id() -> str:
+    return f"{socket.gethostname()}-{os.getpid()}"
+
+class JobQueue:
+    """
+    Fila de repositórios a analisar num banco SQLite, que pode ficar num volume
+    compartilhado por várias máquinas.
+
+    Um worker recebe um job por ``lease``: o job fica ``running`` até
+    ``lease_expires`` e o worker o renova (``heartbeat``) enquanto trabalha. Se o
+    worker morre, o lease expira e outro worker retoma o job. Falhas voltam para a
+    fila até ``max_attempts`` tentativas; depois o job fica ``failed``.
+
+    Cada operação abre a sua conexão e usa ``BEGIN IMMEDIATE``: dois workers
+    nunca recebem o mesmo job, e nenhum lock fica preso entre operações. O banco usa
+    o journal padrão (rollback), já que o WAL não funciona em volumes de rede.
+    """
+
+    def __init__(self, path: str = DEFAULT_QUEUE_PATH, max_attempts: int = DEFAULT_MAX_ATTEMPTS,
+                 retry_delay: float = DEFAULT_RETRY_DELAY, timeout: float = 60):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.path = path
+        self.max_attempts = max_attempts
+        self.retry_delay = retry_delay
+        self.timeout = timeout
+
+        conn = self._connect()
+        try:
+            conn.executescript(SCHEMA)
+        finally:
+            conn.close()
+
+    def _connect(self):
+        return sqlite3.connect(self.path, timeout=self.timeout, isolation_level=None)
+
+    @contextmanager
+    def _transaction(self):
+        conn = self._connect()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield conn
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+            conn.execute("COMMIT")
+        finally:
+            conn.close()
+
+    # ---------------------------------------------------------------
+    # Produtor
+    # ---------------------------------------------------------------
+
+    def enqueue(self, repo_names: Iterable[str], requeue: bool = False) -> int:
+        """
+        Adiciona os repositórios que ainda não estão na fila. ``requeue`` devolve para a
+        fila também os já concluídos ou com falha. Retorna quantos ficaram pendentes.
+        """
+        now = time.time()
+        added = 0
+
+        with self._transaction() as conn:
+            for repo_name in repo_names:
+                cursor = conn.execute(
+                    "INSERT OR IGNORE INTO jobs (repo_name, status, enqueued_at) VALUES (?, ?, ?)",
+                    (repo_name, JOB_PENDING, now),
+                )
+                if not cursor.rowcount and requeue:
+                    cursor = conn.execute(
+                        "UPDATE jobs SET status = ?, attempts = 0, worker = NULL, lease_expires = NULL, "
+                        "not_before = 0, enqueued_at = ?, finished_at = NULL, last_error = NULL "
+                        "WHERE repo_name = ? AND status IN (?, ?)",
+                        (JOB_PENDING, now, repo_name, JOB_DONE, JOB_FAILED),
+                    )
+                added += cursor.rowcount
+
+        return added
+
+    # ---------------------------------------------------------------
+    # Workers
+    # ---------------------------------------------------------------
+
+    def lease(self, worker: str, lease_seconds: float = DEFAULT_LEASE_SECONDS) -> Optional[Job]:
+        """Próximo job disponível (pendente ou com lease expirado), reservado para ``worker``."""
+        now = time.time()
+
+        with self._transaction() as conn:
+            # Leases expirados de workers que morreram: a tentativa conta, e a última vira falha
+            conn.execute(
+                "UPDATE jobs SET status = CASE WHEN attempts >= ? THEN ? ELSE ? END, worker = NULL, "
+                "lease_expires = NULL, last_error = 'lease expired', "
+                "finished_at = CASE WHEN attempts >= ? THEN ? END "
+                "WHERE status = ? AND lease_expires < ?",
+                (self.max_attempts, JOB_FAILED, JOB_PENDING, self.max_attempts, now, JOB_RUNNING, now),
+            )
+
+            row = conn.execute(
+                "SELECT repo_name, attempts FROM jobs WHERE status = ? AND not_before <= ? "
+                "ORDER BY enqueued_at, rowid LIMIT 1",
+                (JOB_PENDING, now),
+            ).fetchone()
+
+            if row is None:
+                return None
+
+            repo_name, attempts = row
+            conn.execute(
+                "UPDATE jobs SET status = ?, worker = ?, lease_expires = ?, attempts = attempts + 1 "
+                "WHERE repo_name = ?",
+                (JOB_RUNNING, worker, now + lease_seconds, repo_name),
+            )
+
+        return Job(repo_name, attempts + 1, worker)
+
+    def heartbeat(self, job: Job, lease_seconds: float = DEFAULT_LEASE_SECONDS) -> bool:
+        """Renova o lease; False quando o job já não pertence a este worker."""
+        with self._transaction() as conn:
+            cursor = conn.execute(
+                "UPDATE jobs SET lease_expires = ? WHERE repo_name = ? AND status = ? AND worker = ?",
+                (time.time() + lease_seconds, job.repo_name, JOB_RUNNING, job.worker),
+            )
+            return cursor.rowcount == 1
+
+    def release(self, worker: str) -> int:
+        """
+        Devolve para a fila os jobs em execução por ``worker``: um worker reiniciado com
+        o mesmo id retoma o que deixou, sem esperar o lease expirar.
+        """
+        with self._transaction() as conn:
+            cursor = conn.execute(
+                "UPDATE jobs SET status = ?, worker = NULL, lease_expires = NULL WHERE status = ? AND worker = ?",
+                (JOB_PENDING, JOB_RUNNING, worker),
+            )
+            return cursor.rowcount
+
+    def complete(self, job: Job) -> bool:
+        with self._transaction() as conn:
+            cursor = conn.execute(
+                "UPDATE jobs SET status = ?, lease_expires = NULL, finished_at = ?, last_error = NULL "
+                "WHERE repo_name = ? AND status = ? AND worker = ?",
+                (JOB_DONE, time.time(), job.repo_name, JOB_RUNNING, job.worker),
+            )
+            return cursor.rowcount == 1
+
+    def fail(self, job: Job, error: str) -> bool:
+        """Devolve o job para a fila (com espera crescente) ou o marca como ``failed``."""
+        now = time.time()
+
+        with self._transaction() as conn:
+            cursor = conn.execute(
+                "UPDATE jobs SET status = CASE WHEN attempts >= ? THEN ? ELSE ? END, worker = NULL, "
+                "lease_expires = NULL, not_before = ?, last_error = ?, "
+                "finished_at = CASE WHEN attempts >= ? THEN ? END "
+                "WHERE repo_name = ? AND status = ? AND worker = ?",
+                (self.max_attempts, JOB_FAILED, JOB_PENDING, now + self.retry_delay * job.attempts, error,
+                 self.max_attempts, now, job.repo_name, JOB_RUNNING, job.worker),
+            )
+            return cursor.rowcount == 1
+
+    # ---------------------------------------------------------------
+    # Consulta
+    # ---------------------------------------------------------------
+
+    def counts(self) -> Dict[str, int]:
+        conn = self._connect()
+        try:
+            rows = conn.execute("SELECT status, COUNT(*) FROM jobs GROUP BY status").fetchall()
+        finally:
+            conn.close()
+
+        counts = {status: 0 for status in (JOB_PENDING, JOB_RUNNING, JOB_DONE, JOB_FAILED)}
+        counts.update(rows)
+        return counts
+
+    def failures(self):
+        """(repo_name, attempts, last_error) dos jobs que esgotaram as tentativas."""
+        conn = self._connect()
+        try:
+            return conn.execute(
+                "SELECT repo_name, attempts, last_error FROM jobs WHERE status = ? ORDER BY repo_name",
+                (JOB_FAILED,),
+            ).fetchall()
+        finally:
+            conn.close()
+
+class LeaseKeeper:
+    """
+    Renova o lease de ``job`` numa thread enquanto o bloco ``with`` executa. Um erro
+    do SQLite é tentado de novo na próxima renovação; ``lost`` indica que o job passou
+    para outro worker ou que o lease não pôde ser renovado ``MAX_HEARTBEAT_FAILURES``
+    vezes seguidas. Nesse momento ``cancelled`` é sinalizado, para a análise parar.
+    """
+
+    def __init__(self, queue: JobQueue, job: Job, lease_seconds: float = DEFAULT_LEASE_SECONDS):
+        self.queue = queue
+        self.job = job
+        self.lease_seconds = lease_seconds
+        self.cancelled = threading.Event()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._renew, daemon=True)
+
+    @property
+    def lost(self) -> bool:
+        return self.cancelled.is_set()
+
+    def _renew(self):
+        failures = 0
+
+        while not self._stop.wait(self.lease_seconds / 3):
+            try:
+                renewed = self.queue.heartbeat(self.job, self.lease_seconds)
+            except sqlite3.Error as e:
+                failures += 1
+                click.echo(f'[{self.job.worker}] heartbeat of {self.job.repo_name} failed: {e}', err=True)
+                if failures >= MAX_HEARTBEAT_FAILURES:
+                    self.cancelled.set()
+                    return
+                continue
+
+            failures = 0
+            if not renewed:
+                self.cancelled.set()
+                return
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+
+def run_worker(queue: JobQueue, since_months, max_months, worker_id: Optional[str] = None,
+               lease_seconds: float = DEFAULT_LEASE_SECONDS, poll_interval: float = 10,
+               exit_when_empty: bool = False, max_jobs: Optional[int] = None, **options) -> int:
+    """
+    Consome jobs de ``queue`` com application.run até a fila esvaziar
+    (``exit_when_empty``) ou ``max_jobs`` jobs. Os caches e clientes HTTP são
+    compartilhados entre os jobs, como no modo batch. Retorna quantos jobs executou.
+    """
+    worker_id = worker_id or default_worker_id()
+    resources = build_resources(**{name: options.pop(name) for name in RESOURCE_OPTIONS if name in options},
+                                shared_clients=True)
+    processed = 0
+
+    released = queue.release(worker_id)
+    if released:
+        click.echo(f'[{worker_id}] {released} unfinished jobs of a previous run returned to the queue.')
+
+    while max_jobs is None or processed < max_jobs:
+        job = queue.lease(worker_id, lease_seconds)
+
+        if job is None:
+            counts = queue.counts()
+            # Jobs em execução em outros workers ainda podem voltar para a fila
+            if exit_when_empty and not counts[JOB_PENDING] and not counts[JOB_RUNNING]:
+                break
+            time.sleep(poll_interval)
+            continue
+
+        click.echo(f'[{worker_id}] {job.repo_name} (attempt {job.attempts}/{queue.max_attempts})')
+
+        timings = {}
+        with LeaseKeeper(queue, job, lease_seconds) as keeper:
+            # Sem o lease o job pode estar com outro worker: a análise é abandonada
+            status = run(job.repo_name, None, since_months, max_months, resources=resources, timings=timings,
+                         cancel=keeper.cancelled, **options)
+
+        processed += 1
+
+        if keeper.lost:
+            click.echo(f'[{worker_id}] lease of {job.repo_name} was lost; analysis abandoned', err=True)
+        elif status == 0:
+            if not queue.complete(job):
+                click.echo(f'[{worker_id}] {job.repo_name} finished, but the job no longer belongs to this worker',
+                           err=True)
+        elif not queue.fail(job, timings.get('error') or f"analysis exited with status {status}"):
+            click.echo(f'[{worker_id}] {job.repo_name} failed, but the job no longer belongs to this worker',
+                       err=True)
+
+    return processed
@@ -71,4 +71,70 @@ class Dependency:
             "git_ref": self.git_ref,
             "line_number": self.line_number,
             "required_by_extra": self.required_by_extra,
-        }
\ No newline at end of file
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "Dependency":
+        # Inverso de to_dict; 'pinned_version' é derivado e por isso ignorado
+        return cls(
+            name=data["name"],
+            source_file=data["source_file"],
+            dependency_type=DependencyType(data["dependency_type"]),
+            category=DependencyCategory(data["category"]),
+            raw_specifier=data.get("raw_specifier"),
+            version_rules=[VersionRule(**rule) for rule in data.get("version_rules", [])],
+            marker=data.get("marker"),
+            extras_requested=list(data.get("extras_requested") or []),
+            source_url=data.get("source_url"),
+            source_path=data.get("source_path"),
+            git_ref=data.get("git_ref"),
+            line_number=data.get("line_number"),
+            required_by_extra=data.get("required_by_extra"),
+        )
+
+@dataclass(slots=True, frozen=True)
+class PyPiProject:
+    """Recorte do documento /pypi/<pkg>/json com os campos usados na análise."""
+    name: str
+    version: Optional[str] = None
+    classifiers: List[str] = field(default_factory=list)
+    project_urls: Dict[str, str] = field(default_factory=dict)
+
+    @classmethod
+    def from_json(cls, name: str, data: Dict[str, Any]) -> "PyPiProject":
+        info = data.get("info", {}) or {}
+        return cls(
+            name=info.get("name") or name,
+            version=info.get("version"),
+            classifiers=list(info.get("classifiers") or []),
+            project_urls=dict(info.get("project_urls") or {}),
+        )
+
+@dataclass(slots=True, frozen=True)
+class RepoInfo:
+    """Snapshot dos metadados de repos/<owner>/<repo> usados na análise de depreciação."""
+    full_name: str
+    exists: bool = False
+    archived: bool = False
+    pushed_at: Optional[str] = None   # Ex: "2024-01-31T12:00:00Z"
+    default_branch: Optional[str] = None
+    error: Optional[Any] = None       # Código HTTP ou "timeout" quando a consulta falhou
+
+    @classmethod
+    def from_json(cls, full_name: str, data: Dict[str, Any]) -> "RepoInfo":
+        return cls(
+            full_name=full_name,
+            exists=True,
+            archived=data.get("archived", False),
+            pushed_at=data.get("pushed_at"),
+            default_branch=data.get("default_branch"),
+        )
+
+    def to_json(self) -> Dict[str, Any]:
+        """Os campos de repos/<owner>/<repo> que from_json lê."""
+        return {
+            "full_name": self.full_name,
+            "archived": self.archived,
+            "pushed_at": self.pushed_at,
+            "default_branch": self.default_branch,
+        }
@@ -1,13 +1,14 @@
 import logging
 import os
 import sys
-import csv
 from datetime import datetime, timezone
-from typing import Iterator, Dict, Any
+from typing import Iterator, Dict, Any, Optional
 import pandas as pd
 from pydriller import Repository
 
 from .parsers import parse_dependency_file
+from .parse_memo import ParseMemo
+from .history_sinks import CsvSink
 
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
@@ -47,10 +48,12 @@ def is_dependency_file(filename: str) -> bool:
         
     return False
 
-def extract_dependencies_from_commit(repo_path: str) -> Iterator[Dict[str, Any]]:
+def extract_dependencies_from_commit(repo_path: str, parse_memo: Optional[ParseMemo] = None) -> Iterator[Dict[str, Any]]:
     """
     Generator otimizado e normalizado.
     """
+    parse_memo = parse_memo or ParseMemo()
+
     # - only_no_merge=True: Ignora commits de merge 
     # - order='reverse': Começa do MAIS RECENTE para o mais antigo
     repo_mining = Repository(
@@ -84,7 +87,7 @@ def extract_dependencies_from_commit(repo_path: str) -> Iterator[Dict[str, Any]]
                      logger.warning(f"Arquivo {filename} excede limite seguro ({len(content)/1024/1024:.2f} MB). Pulando.")
                      continue
                 
-                dependencies_objects = parse_dependency_file(filename, content)
+                dependencies_objects = parse_memo.parse(filename, content, parse_dependency_file)
 
                 for dep in dependencies_objects:
                     dep_dict = dep.to_dict()
@@ -119,23 +122,21 @@ def extract_dependencies_from_commit(repo_path: str) -> Iterator[Dict[str, Any]]
             except Exception as e:
                 logger.error(f"Erro de parser: {filename} @ {commit.hash[:7]} -> {e}")
 
-def analyze_repository_stream(repo_path: str, output_csv_path: str) -> pd.DataFrame:
+def analyze_repository_stream(repo_path: str, output_csv_path: str) -> int:
     """
-    Processa e salva ao mesmo tempo.
+    Processa e salva ao mesmo tempo. Retorna o número de registros gravados: o
+    histórico inteiro nunca fica em memória, nem é relido do CSV.
     """
     output_dir = os.path.dirname(output_csv_path)
     if output_dir and not os.path.exists(output_dir):
         os.makedirs(output_dir)
 
-    with open(output_csv_path, mode='w', newline='', encoding='utf-8-sig') as f:
-        writer = csv.DictWriter(f, fieldnames=CSV_HEADERS)
-        writer.writeheader()
-
+    with CsvSink(output_csv_path, encoding='utf-8-sig', fieldnames=CSV_HEADERS) as sink:
         count = 0
         logger.info("Extraindo dependências...")
         
         for record in extract_dependencies_from_commit(repo_path):
-            writer.writerow(record)
+            sink.write(record)
             count += 1
             
             if count % 100 == 0:
@@ -145,15 +146,10 @@ def analyze_repository_stream(repo_path: str, output_csv_path: str) -> pd.DataFr
 
     if count == 0:
         logger.warning("Nenhuma dependência encontrada (verifique se o repo possui arquivos pyproject.toml ou requirements.txt modificados no histórico analisado).")
-        return pd.DataFrame()
+        return 0
 
     logger.info(f"Extração concluída. {count} registros salvos em disco.")
-    
-    try:
-        df = pd.read_csv(output_csv_path, parse_dates=['date_utc'])
-        return df
-    except Exception:
-        return pd.DataFrame()
+    return count
 
 def main():
     if len(sys.argv) < 2:
@@ -165,13 +161,14 @@ def main():
     output_filename = f"{repo_name}_history.csv"
 
     try:
-        df = analyze_repository_stream(repo_path, output_filename)
+        count = analyze_repository_stream(repo_path, output_filename)
         
-        if not df.empty:
+        if count:
             print("\n--- Resumo da Análise ---")
-            print(f"Total de Registros: {len(df)}")
+            print(f"Total de Registros: {count}")
             print(f"Arquivo salvo em: {os.path.abspath(output_filename)}")
-            print(df.head())
+            # Só as primeiras linhas do CSV são lidas para a prévia
+            print(pd.read_csv(output_filename, nrows=5, encoding='utf-8-sig'))
         
     except KeyboardInterrupt:
         logger.info("\nOperação interrompida pelo usuário.")
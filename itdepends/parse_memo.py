@@ -0,0 +1,103 @@
+import threading
+from collections import OrderedDict
+from typing import Callable, List, Optional, Tuple
+
+from .blob_cache import BlobCache, git_blob_sha
+from .models import Dependency
+
+# Manifestos parseados mantidos em memória; os menos usados saem primeiro
+DEFAULT_MAX_ENTRIES = 50_000
+
+Parser = Callable[[str, Optional[str]], List[Dependency]]
+
+class ParseMemo:
+    """
+    Memo do parse de manifestos durante a varredura do histórico, chaveado por
+    (nome do arquivo, SHA do blob): reverts, merges e arquivos copiados entre
+    subprojetos voltam ao mesmo conteúdo e não são parseados de novo.
+
+    Com ``store`` (um BlobCache) o resultado também persiste entre execuções. Em
+    memória ficam no máximo ``max_entries`` manifestos (LRU), pois o modo batch
+    compartilha um único memo entre todos os repositórios.
+    """
+
+    def __init__(self, store: Optional[BlobCache] = None, max_entries: int = DEFAULT_MAX_ENTRIES):
+        self.store = store
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._parsed: "OrderedDict[Tuple[str, str], List[Dependency]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def parse(self, filename: str, content: Optional[str], parser: Parser,
+              sha: Optional[str] = None) -> List[Dependency]:
+        """
+        Dependências de ``content``, chamando ``parser`` só na primeira vez que o
+        blob aparece. ``sha`` evita recalcular o hash quando o git já o informa.
+        Exceções do parser não são memorizadas.
+        """
+        return self._parse(filename, content, parser, sha)[0]
+
+    def view(self) -> "ParseMemoView":
+        return ParseMemoView(self)
+
+    def _remember(self, key: Tuple[str, str], deps: List[Dependency]):
+        with self._lock:
+            self._parsed[key] = deps
+            self._parsed.move_to_end(key)
+            while len(self._parsed) > self.max_entries:
+                self._parsed.popitem(last=False)
+
+    def _parse(self, filename: str, content: Optional[str], parser: Parser,
+               sha: Optional[str] = None) -> Tuple[List[Dependency], Optional[bool]]:
+        """(dependências, se veio do memo); manifestos vazios não são contados."""
+        if not content:
+            return parser(filename, content), None
+
+        sha = sha or git_blob_sha(content.encode("utf-8"))
+        key = (filename, sha)
+
+        with self._lock:
+            deps = self._parsed.get(key)
+            if deps is not None:
+                self._parsed.move_to_end(key)
+
+        if deps is None and self.store is not None:
+            deps = self.store.get_dependencies(sha, filename)
+            if deps is not None:
+                self._remember(key, deps)
+
+        if deps is not None:
+            with self._lock:
+                self.hits += 1
+            return deps, True
+
+        deps = parser(filename, content)
+        with self._lock:
+            self.misses += 1
+        self._remember(key, deps)
+
+        if self.store is not None:
+            self.store.put(sha, content, filename, deps)
+
+        return deps, False
+
+class ParseMemoView:
+    """
+    Uso de um ParseMemo compartilhado por uma única execução: os parses continuam
+    compartilhados, mas ``hits``/``misses`` contam só os desta execução.
+    """
+
+    def __init__(self, memo: ParseMemo):
+        self.memo = memo
+        self.hits = 0
+        self.misses = 0
+
+    def parse(self, filename: str, content: Optional[str], parser: Parser,
+              sha: Optional[str] = None) -> List[Dependency]:
+        deps, hit = self.memo._parse(filename, content, parser, sha)
+        if hit is True:
+            self.hits += 1
+        elif hit is False:
+            self.misses += 1
+        return deps
@@ -1,3 +1,5 @@
+import threading
+
 import pandas as pd
 import plotly.express as px
 from jinja2 import Template
@@ -5,6 +7,8 @@ from typing import Optional
 from pathlib import Path
 from packaging.version import Version
 
+_PLOTLY_LOCK = threading.Lock()
+
 
 def get_template_padrao() -> str:
     """
@@ -359,7 +363,8 @@ def gerar_relatorio_dependencias(
     output_path: str = "relatorio_dependencias.html",
     altura_grafico_timeline: int = 400,
     altura_grafico_barras: int = 380,
-    template_html: Optional[str] = None
+    template_html: Optional[str] = None,
+    resumo=None
 ) -> str:
     """
     Gera um relatório HTML interativo com gráficos de dependências.
@@ -389,6 +394,11 @@ def gerar_relatorio_dependencias(
         Template HTML customizado. Se None, usa o template padrão.
         Use get_template_padrao() para obter o template base.
 
+    resumo : HistorySummary, opcional
+        Resumo calculado em streaming (history_sinks). Quando informado, ``df`` é
+        ignorado: a tabela vem do resumo e a linha do tempo de resumo.timeline(),
+        sem carregar o histórico completo.
+
     Retorna:
     --------
     str
@@ -414,6 +424,9 @@ def gerar_relatorio_dependencias(
     >>> arquivo = gerar_relatorio_dependencias(df, template_html=template)
     """
 
+    if resumo is not None:
+        df = resumo.timeline()
+
     # Validação do DataFrame
     colunas_obrigatorias = ['Data_Commit', 'Hash_Commit', 'Dependencia', 'Versao']
     colunas_faltantes = [col for col in colunas_obrigatorias if col not in df.columns]
@@ -441,8 +454,12 @@ def gerar_relatorio_dependencias(
             "Verifique o formato das datas."
         )
 
-    total_commits = df_trabalho["Hash_Commit"].nunique()
-    total_dependencias = df_trabalho["Dependencia"].nunique()
+    if resumo is not None:
+        total_commits = resumo.total_commits
+        total_dependencias = resumo.total_dependencies
+    else:
+        total_commits = df_trabalho["Hash_Commit"].nunique()
+        total_dependencias = df_trabalho["Dependencia"].nunique()
     ultima_data = df_trabalho["Data_Commit"].max()
     ultima_data_str = ultima_data.strftime("%d/%m/%Y")
 
@@ -468,19 +485,22 @@ def gerar_relatorio_dependencias(
     )
 
 
-    resumo_dep = (
-        df_sorted
-        .groupby("Dependencia")
-        .agg(
-            primeira_versao=("Versao", "first"),
-            ultima_versao=("Versao", "last"),
-            primeiro_commit=("Data_Commit", "min"),
-            ultimo_commit=("Data_Commit", "max"),
-            qtd_versoes=("Versao", "nunique"),
-            qtd_commits=("Hash_Commit", "nunique"),
+    if resumo is not None:
+        resumo_dep = resumo.to_frame()
+    else:
+        resumo_dep = (
+            df_sorted
+            .groupby("Dependencia")
+            .agg(
+                primeira_versao=("Versao", "first"),
+                ultima_versao=("Versao", "last"),
+                primeiro_commit=("Data_Commit", "min"),
+                ultimo_commit=("Data_Commit", "max"),
+                qtd_versoes=("Versao", "nunique"),
+                qtd_commits=("Hash_Commit", "nunique"),
+            )
+            .reset_index()
         )
-        .reset_index()
-    )
 
     resumo_dep["primeiro_commit"] = resumo_dep["primeiro_commit"].dt.date
     resumo_dep["ultimo_commit"] = resumo_dep["ultimo_commit"].dt.date
@@ -499,62 +519,65 @@ def gerar_relatorio_dependencias(
         border=0,
     )
 
-    # -------------------------------------------------------
-    # Gráfico 1 – Linha do tempo das versões
-    # -------------------------------------------------------
-    fig_timeline = px.line(
-        df_sorted,
-        x="Data_Commit",
-        y="Versao",
-        color="Dependencia",
-        title="Linha do tempo de versões por dependência",
-        markers=True,
-        hover_data=["Hash_Commit"],
-    )
+    # O plotly.express não é thread-safe: no modo batch os relatórios são gerados em
+    # paralelo e a montagem das figuras de um pode invalidar a do outro
+    with _PLOTLY_LOCK:
+        # -------------------------------------------------------
+        # Gráfico 1 – Linha do tempo das versões
+        # -------------------------------------------------------
+        fig_timeline = px.line(
+            df_sorted,
+            x="Data_Commit",
+            y="Versao",
+            color="Dependencia",
+            title="Linha do tempo de versões por dependência",
+            markers=True,
+            hover_data=["Hash_Commit"],
+        )
 
-    fig_timeline.update_layout(
-        height=altura_grafico_timeline,
-        autosize=True,
-        margin=dict(l=50, r=30, t=60, b=40),
-        xaxis=dict(automargin=True),
-        yaxis=dict(automargin=True),
-    )
+        fig_timeline.update_layout(
+            height=altura_grafico_timeline,
+            autosize=True,
+            margin=dict(l=50, r=30, t=60, b=40),
+            xaxis=dict(automargin=True),
+            yaxis=dict(automargin=True),
+        )
 
-    fig_timeline.update_yaxes(
-        categoryorder="array",
-        categoryarray=unique_versions,
-    )
+        fig_timeline.update_yaxes(
+            categoryorder="array",
+            categoryarray=unique_versions,
+        )
 
 
-    html_plot_timeline = fig_timeline.to_html(
-        full_html=False,
-        include_plotlyjs="cdn",
-        config={'responsive': True, 'displayModeBar': True}
-    )
+        html_plot_timeline = fig_timeline.to_html(
+            full_html=False,
+            include_plotlyjs="cdn",
+            config={'responsive': True, 'displayModeBar': True}
+        )
 
-    # -------------------------------------------------------
-    # Gráfico 2 – Barras
-    # -------------------------------------------------------
-    fig_bar = px.bar(
-        resumo_dep,
-        x="Dependencia",
-        y="qtd_versoes",
-        title="Quantidade de versões diferentes por dependência",
-    )
+        # -------------------------------------------------------
+        # Gráfico 2 – Barras
+        # -------------------------------------------------------
+        fig_bar = px.bar(
+            resumo_dep,
+            x="Dependencia",
+            y="qtd_versoes",
+            title="Quantidade de versões diferentes por dependência",
+        )
 
-    fig_bar.update_layout(
-        height=altura_grafico_barras,
-        autosize=True,
-        margin=dict(l=50, r=30, t=60, b=80),
-        xaxis=dict(automargin=True),
-        yaxis=dict(automargin=True),
-    )
+        fig_bar.update_layout(
+            height=altura_grafico_barras,
+            autosize=True,
+            margin=dict(l=50, r=30, t=60, b=80),
+            xaxis=dict(automargin=True),
+            yaxis=dict(automargin=True),
+        )
 
-    html_plot_bar = fig_bar.to_html(
-        full_html=False,
-        include_plotlyjs=False,
-        config={'responsive': True, 'displayModeBar': True}
-    )
+        html_plot_bar = fig_bar.to_html(
+            full_html=False,
+            include_plotlyjs=False,
+            config={'responsive': True, 'displayModeBar': True}
+        )
 
     # -------------------------------------------------------
     # Template HTML
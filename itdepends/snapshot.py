@@ -0,0 +1,171 @@
+import json
+import os
+import re
+import sqlite3
+from typing import Iterable, Optional, Tuple
+
+from packaging.utils import canonicalize_name
+
+from .integrations import ResponseCache
+from .integrations.pypi_api import extract_development_status, extract_github_repo
+from .models import PyPiProject, RepoInfo
+from .utils import cache_path
+
+DEFAULT_SNAPSHOT_PATH = cache_path("snapshot.sqlite3")
+
+PYPI_URL_RE = re.compile(r"/pypi/([^/]+)/json$")
+GITHUB_REPO_URL_RE = re.compile(r"/repos/([^/]+/[^/]+)$")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS packages (
+    name TEXT PRIMARY KEY,
+    github_repo TEXT,
+    development_status TEXT,
+    resolved INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS repos (
+    full_name TEXT PRIMARY KEY COLLATE NOCASE,
+    exists_flag INTEGER NOT NULL,
+    archived INTEGER NOT NULL,
+    pushed_at TEXT,
+    default_branch TEXT
+);
+"""
+
+class SnapshotDB:
+    """
+    Snapshot local (SQLite) da saúde dos pacotes, usado no modo offline.
+
+    ``packages`` guarda nome no PyPI -> repositório no GitHub e classificador de
+    Development Status; ``repos`` guarda flag de arquivado e data do último push.
+    As consultas são por chave primária, então não dependem do tamanho do snapshot.
+    """
+
+    def __init__(self, path: str = DEFAULT_SNAPSHOT_PATH):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.path = path
+        self.conn = sqlite3.connect(path)
+        self.conn.executescript(SCHEMA)
+
+    def close(self):
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.conn.commit()
+        self.close()
+
+    # ---------------------------------------------------------------
+    # Escrita
+    # ---------------------------------------------------------------
+
+    def upsert_package(self, name: str, github_repo: Optional[str], development_status: Optional[str],
+                       resolved: bool = True):
+        self.conn.execute(
+            "INSERT OR REPLACE INTO packages (name, github_repo, development_status, resolved) VALUES (?, ?, ?, ?)",
+            (canonicalize_name(name), github_repo, development_status, int(resolved)),
+        )
+
+    def upsert_repo(self, info: RepoInfo):
+        self.conn.execute(
+            "INSERT OR REPLACE INTO repos (full_name, exists_flag, archived, pushed_at, default_branch) "
+            "VALUES (?, ?, ?, ?, ?)",
+            (info.full_name, int(info.exists), int(bool(info.archived)), info.pushed_at, info.default_branch),
+        )
+
+    def import_dump(self, dump_path: str) -> int:
+        """
+        Importa um dump NDJSON, um pacote por linha:
+
+            {"name": "requests", "github_repo": "psf/requests",
+             "development_status": "5 - Production/Stable",
+             "archived": false, "pushed_at": "2024-05-01T10:00:00Z"}
+
+        ``github_repo`` nulo marca pacote sem repositório resolvível; ``archived`` e
+        ``pushed_at`` são opcionais (repositório sem essas chaves é tratado como inexistente).
+        """
+        count = 0
+        with open(dump_path, encoding="utf-8") as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+
+                record = json.loads(line)
+                github_repo = record.get("github_repo")
+
+                self.upsert_package(record["name"], github_repo, record.get("development_status"),
+                                    resolved=bool(github_repo))
+
+                if github_repo and ("archived" in record or "pushed_at" in record):
+                    self.upsert_repo(RepoInfo(
+                        full_name=github_repo,
+                        exists=True,
+                        archived=bool(record.get("archived", False)),
+                        pushed_at=record.get("pushed_at"),
+                        default_branch=record.get("default_branch"),
+                    ))
+                count += 1
+
+        self.conn.commit()
+        return count
+
+    def export_from_cache(self, cache: ResponseCache) -> Tuple[int, int]:
+        """
+        Constrói o snapshot a partir do cache HTTP de uma execução online.
+        Retorna (pacotes, repositórios) gravados.
+        """
+        packages, repos = 0, 0
+
+        for entry in cache.entries():
+            pypi_match = PYPI_URL_RE.search(entry.url)
+            repo_match = GITHUB_REPO_URL_RE.search(entry.url)
+
+            if pypi_match:
+                project = PyPiProject.from_json(pypi_match.group(1), entry.body)
+                success_gh, repo_name = extract_github_repo(project)
+                success_pypi, status = extract_development_status(project)
+                resolved = success_gh and success_pypi
+
+                self.upsert_package(pypi_match.group(1),
+                                    repo_name if resolved else None,
+                                    status if resolved else None,
+                                    resolved=resolved)
+                packages += 1
+
+            elif repo_match:
+                self.upsert_repo(RepoInfo.from_json(repo_match.group(1), entry.body))
+                repos += 1
+
+        self.conn.commit()
+        return packages, repos
+
+    # ---------------------------------------------------------------
+    # Leitura
+    # ---------------------------------------------------------------
+
+    def get_package(self, name: str) -> Optional[Tuple[Optional[str], Optional[str], bool]]:
+        row = self.conn.execute(
+            "SELECT github_repo, development_status, resolved FROM packages WHERE name = ?",
+            (canonicalize_name(name),),
+        ).fetchone()
+
+        if row is None:
+            return None
+        return row[0], row[1], bool(row[2])
+
+    def get_repo(self, full_name: str) -> RepoInfo:
+        row = self.conn.execute(
+            "SELECT full_name, exists_flag, archived, pushed_at, default_branch FROM repos WHERE full_name = ?",
+            (full_name,),
+        ).fetchone()
+
+        if row is None:
+            return RepoInfo(full_name=full_name, error="not_in_snapshot")
+
+        return RepoInfo(full_name=full_name, exists=bool(row[1]), archived=bool(row[2]),
+                        pushed_at=row[3], default_branch=row[4])
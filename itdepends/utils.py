@@ -1,10 +1,21 @@
 import os
 
+CACHE_ROOT = os.environ.get(
+    "ITDEPENDS_CACHE_DIR",
+    os.path.join(os.path.expanduser("~"), ".cache", "itdepends")
+)
+
+def cache_path(*parts):
+    return os.path.join(CACHE_ROOT, *parts)
+
 def create_results_directories(repo_name):
     nested_path = f"results/{repo_name.replace('/', '_')}"
     
     os.makedirs(nested_path, exist_ok=True)
 
+def results_path(repo_name, filename):
+    return f"results/{repo_name.replace('/', '_')}/{filename}"
+
 def save_to_csv(df, output_name, repo_name):
     folder_repo_name = repo_name.replace('/', '_')
     
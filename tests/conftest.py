@@ -0,0 +1,45 @@
+import os
+import subprocess
+import pytest
+
+
+class GitRepoBuilder:
+    """Cria um repositório git real em disco para os testes de histórico e clone."""
+
+    def __init__(self, path):
+        self.path = str(path)
+        os.makedirs(self.path, exist_ok=True)
+        self.git("init", "-q", "-b", "main")
+
+    def git(self, *args):
+        env = dict(os.environ, GIT_CONFIG_GLOBAL=os.devnull, GIT_CONFIG_SYSTEM=os.devnull)
+        result = subprocess.run(["git", "-C", self.path, *args], capture_output=True, text=True, env=env)
+        assert result.returncode == 0, result.stderr
+        return result.stdout.strip()
+
+    def commit(self, files, message="commit", date="2024-01-01T12:00:00+00:00", author="Alice"):
+        """``files``: path -> conteúdo; conteúdo None remove o arquivo."""
+        for path, content in files.items():
+            full_path = os.path.join(self.path, path)
+            if content is None:
+                self.git("rm", "-q", path)
+                continue
+            os.makedirs(os.path.dirname(full_path), exist_ok=True)
+            with open(full_path, "w", encoding="utf-8") as f:
+                f.write(content)
+            self.git("add", path)
+
+        env = dict(os.environ,
+                   GIT_CONFIG_GLOBAL=os.devnull, GIT_CONFIG_SYSTEM=os.devnull,
+                   GIT_AUTHOR_NAME=author, GIT_AUTHOR_EMAIL=f"{author.lower()}@test.com",
+                   GIT_COMMITTER_NAME=author, GIT_COMMITTER_EMAIL=f"{author.lower()}@test.com",
+                   GIT_AUTHOR_DATE=date, GIT_COMMITTER_DATE=date)
+        result = subprocess.run(["git", "-C", self.path, "commit", "-q", "--allow-empty", "-m", message],
+                                capture_output=True, text=True, env=env)
+        assert result.returncode == 0, result.stderr
+        return self.git("rev-parse", "HEAD")
+
+
+@pytest.fixture
+def git_repo(tmp_path):
+    return GitRepoBuilder(tmp_path / "repo")
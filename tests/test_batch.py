@@ -0,0 +1,129 @@
+import threading
+from unittest.mock import MagicMock
+
+import pandas as pd
+import requests
+from click.testing import CliRunner
+
+from itdepends import application, batch
+from itdepends.batch import read_repository_list, run_batch
+from itdepends.cli import cli
+from tests.conftest import GitRepoBuilder
+
+
+def test_read_repository_list_skips_comments_and_duplicates(tmp_path):
+    repos = tmp_path / "repos.txt"
+    repos.write_text("# internos\nowner/a\n\nowner/b  # legado\nowner/a\n", encoding="utf-8")
+
+    assert read_repository_list(str(repos)) == ["owner/a", "owner/b"]
+
+
+def test_run_batch_shares_resources_and_writes_summary(tmp_path, monkeypatch):
+    calls = []
+
+    def fake_run(repo_name, path, since_months, max_months, resources=None, timings=None, **options):
+        calls.append((repo_name, resources, options))
+        if repo_name == "owner/broken":
+            return 1
+        timings.update(history=1.0, records=3, deprecation=2.0, report=0.5)
+        return 0
+
+    monkeypatch.setattr(batch, "run", fake_run)
+    summary_path = tmp_path / "summary.csv"
+
+    summary = run_batch(["owner/a", "owner/broken", "owner/b"], 12, 12, workers=2, summary_path=str(summary_path),
+                        cache_dir=str(tmp_path / "http"), history_backend="git")
+
+    # Um único conjunto de caches e clientes para todos os repositórios
+    assert len({id(resources) for _, resources, _ in calls}) == 1
+    resources = calls[0][1]
+    assert resources.pypi is not None and resources.gh is not None and resources.cache is not None
+    assert all(options == {"history_backend": "git"} for _, _, options in calls)
+
+    assert summary["Repositorio"].tolist() == ["owner/a", "owner/broken", "owner/b"]
+    assert summary["Status"].tolist() == ["ok", "error", "ok"]
+
+    saved = pd.read_csv(summary_path)
+    assert saved.loc[0, "Registros"] == 3
+    assert saved.loc[0, "Depreciacao_s"] == 2.0
+    assert pd.isna(saved.loc[1, "Historico_s"])
+
+
+def test_batch_command_rejects_invalid_names(tmp_path):
+    repos = tmp_path / "repos.txt"
+    repos.write_text("owner/a\ndjango\n", encoding="utf-8")
+
+    result = CliRunner().invoke(cli, ["batch", str(repos)])
+
+    assert result.exit_code == 2
+    assert "Invalid repository names: django" in result.output
+
+
+def test_run_batch_repositories_sharing_a_dependency_with_cache(tmp_path, monkeypatch):
+    """
+    Dois repositórios com a mesma dependência, analisados em paralelo com o cache de
+    respostas ligado: as duas análises gravam (e leem) as mesmas entradas do cache.
+    """
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.delenv("GITHUB_TOKEN", raising=False)
+
+    paths = {}
+    for name, extra in (("owner/a", "flask==3.0.0"), ("owner/b", "click==8.1.0")):
+        repo = GitRepoBuilder(tmp_path / name.replace("/", "_"))
+        repo.commit({"requirements.txt": f"requests==2.31.0\n{extra}\n"})
+        paths[name] = repo.path
+
+    lock = threading.Lock()
+    requested = []
+
+    def fake_get(session, url, headers=None, **kwargs):
+        with lock:
+            requested.append(url)
+        # Segura a resposta para que as duas análises fiquem em voo ao mesmo tempo
+        threading.Event().wait(0.05)
+
+        response = MagicMock(status_code=200, headers={"ETag": '"v1"'})
+        if "pypi.org" in url:
+            package = url.rstrip("/").split("/")[-2]
+            response.json.return_value = {"info": {
+                "name": package,
+                "classifiers": ["Development Status :: 5 - Production/Stable"],
+                "project_urls": {"Source": f"https://github.com/example/{package}"},
+            }}
+        else:
+            response.json.return_value = {"archived": False, "pushed_at": "2099-01-01T00:00:00Z",
+                                          "default_branch": "main"}
+        return response
+
+    monkeypatch.setattr(requests.Session, "get", fake_get)
+    # run_batch clona pelo nome; aqui cada repositório já tem um clone local
+    monkeypatch.setattr(batch, "run", lambda repo_name, path, *args, **kwargs:
+                        application.run(repo_name, paths[repo_name], *args, **kwargs))
+
+    summary = run_batch(list(paths), 120, 12, workers=2, summary_path=str(tmp_path / "summary.csv"),
+                        cache_dir=str(tmp_path / "http"), history_backend="git")
+
+    assert summary["Status"].tolist() == ["ok", "ok"]
+    # A dependência comum é buscada uma única vez, no PyPI e no GitHub
+    assert requested.count("https://pypi.org/pypi/requests/json") == 1
+    assert requested.count("https://api.github.com/repos/example/requests") == 1
+
+    for name in paths:
+        deprecation = pd.read_csv(tmp_path / "results" / name.replace("/", "_") / "deprecation.csv")
+        assert "requests" in deprecation["Nome"].tolist()
+
+
+def test_run_stops_when_cancelled(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    repo = GitRepoBuilder(tmp_path / "repo")
+    repo.commit({"requirements.txt": "requests==2.31.0\n"})
+    cancel = threading.Event()
+    cancel.set()
+    timings = {}
+
+    status = application.run("owner/repo", repo.path, 120, 12, history_backend="git", timings=timings,
+                             cancel=cancel)
+
+    assert status == 1
+    assert timings["error"] == "analysis cancelled"
+    assert "records" not in timings
@@ -0,0 +1,114 @@
+import os
+import time
+import pytest
+
+from itdepends.blob_cache import BlobCache, git_blob_sha
+from itdepends.deprecation import get_dependency_files, parse_manifest
+from itdepends.parsers import parse_dependency_file
+
+
+def test_git_blob_sha_matches_git(git_repo):
+    git_repo.commit({"requirements.txt": "requests==2.0\n"})
+
+    expected = git_repo.git("rev-parse", "HEAD:requirements.txt")
+
+    assert git_blob_sha(b"requests==2.0\n") == expected
+
+
+def test_put_and_get_roundtrip_with_parsed_dependencies(tmp_path):
+    cache = BlobCache(str(tmp_path))
+    content = "requests[security]>=2.0; python_version > '3.8'\n"
+    deps = parse_dependency_file("requirements.txt", content)
+
+    cache.put("abc123", content, "requirements.txt", deps)
+
+    assert cache.get("abc123") == content
+    assert cache.get_dependencies("abc123", "requirements.txt") == deps
+    assert cache.get_dependencies("abc123", "pyproject.toml") is None
+    assert cache.get("missing") is None
+
+
+def test_lru_eviction_respects_size_cap(tmp_path):
+    cache = BlobCache(str(tmp_path), max_bytes=800)
+
+    for i, sha in enumerate(["aa01", "bb02", "cc03"]):
+        cache.put(sha, "x" * 200)
+        os.utime(cache._path(sha), (1000 + i, 1000 + i))
+
+    # Acesso recente protege "aa01" da remoção
+    cache.get("aa01")
+    cache.put("dd04", "y" * 200)
+
+    assert cache.get("bb02") is None
+    assert cache.get("aa01") is not None
+    assert cache.get("dd04") is not None
+    assert cache.total_bytes() <= 800
+
+
+
+def test_eviction_goes_to_low_water_mark_without_walking_again(tmp_path, monkeypatch):
+    cache = BlobCache(str(tmp_path), max_bytes=2000)
+    cache.put("0000", "x" * 150)
+
+    # O índice já está montado: os próximos puts e remoções não percorrem o diretório
+    monkeypatch.setattr("itdepends.blob_cache.os.walk", lambda *args: pytest.fail("unexpected os.walk"))
+
+    real_remove = os.remove
+    evictions = []
+
+    def remove(path):
+        evictions[-1] += 1
+        real_remove(path)
+
+    monkeypatch.setattr("itdepends.blob_cache.os.remove", remove)
+
+    for i in range(1, 60):
+        evictions.append(0)
+        cache.put(f"{i:04x}", "x" * 150)
+        if evictions[-1]:
+            # Cada estouro libera até 80% do limite
+            assert cache.total_bytes() <= 2000 * 0.8
+
+    rounds = [count for count in evictions if count]
+    assert len(rounds) < len(evictions) // 2
+    assert all(count > 1 for count in rounds)
+
+    on_disk = sum(path.stat().st_size for path in tmp_path.rglob("*.json"))
+    assert on_disk == cache.total_bytes() <= 2000
+
+
+def test_parse_manifest_reuses_cached_parse(tmp_path, monkeypatch):
+    cache = BlobCache(str(tmp_path))
+    file = {"name": "requirements.txt", "content": "flask==3.0\n", "sha": "f00d"}
+
+    first = parse_manifest(file, cache)
+
+    monkeypatch.setattr("itdepends.deprecation.parse_dependency_file",
+                        lambda **kwargs: pytest.fail("unexpected parse"))
+
+    assert parse_manifest(file, cache) == first
+
+
+def test_unchanged_remote_manifests_are_not_downloaded_again(tmp_path, monkeypatch):
+    from itdepends.integrations import GitHubClient
+
+    cache = BlobCache(str(tmp_path))
+    downloads = []
+
+    monkeypatch.setattr(GitHubClient, "get_default_branch_name", lambda self, repo: "main")
+    monkeypatch.setattr(GitHubClient, "get_file_tree", lambda self, repo, branch: [
+        {"path": "requirements.txt", "sha": "1111", "url": "blob-url-1"},
+        {"path": "docs/README.md", "sha": "2222", "url": "blob-url-2"},
+    ])
+
+    def fake_contents(self, url):
+        downloads.append(url)
+        return "requests==2.0\n"
+
+    monkeypatch.setattr(GitHubClient, "get_file_contents", fake_contents)
+
+    first = get_dependency_files("owner/repo", blob_cache=cache)
+    second = get_dependency_files("owner/repo", blob_cache=cache)
+
+    assert first == second == [{"name": "requirements.txt", "content": "requests==2.0\n", "sha": "1111"}]
+    assert downloads == ["blob-url-1"]
@@ -0,0 +1,70 @@
+from datetime import datetime, timezone
+
+from itdepends.change_events import (ChangeEventLog, EVENT_ADDED, EVENT_CHANGED, EVENT_REMOVED,
+                                     analyze_repository_git_events)
+from itdepends.parsers import parse_dependency_file
+
+
+def parse(content):
+    return parse_dependency_file("requirements.txt", content)
+
+
+def test_only_semantic_changes_generate_events():
+    log = ChangeEventLog("owner/repo")
+
+    first = log.update("c1", "Alice", "2024-01-01", "requirements.txt", parse("requests==2.0\nflask>=1.0\n"))
+    reformatted = log.update("c2", "Alice", "2024-01-02", "requirements.txt",
+                             parse("# deps\nflask>=1.0\n\nrequests==2.0\n"))
+    bumped = log.update("c3", "Bob", "2024-01-03", "requirements.txt", parse("requests==2.1\n"))
+
+    assert [(e["Dependencia"], e["Evento"]) for e in first] == [("requests", EVENT_ADDED), ("flask", EVENT_ADDED)]
+    assert reformatted == []
+    assert [(e["Dependencia"], e["Evento"], e["Versao_Anterior"], e["Versao"]) for e in bumped] == [
+        ("requests", EVENT_CHANGED, "2.0", "2.1"),
+        ("flask", EVENT_REMOVED, "1.0", None),
+    ]
+    assert bumped[0]["Especificador_Anterior"] == "==2.0"
+
+
+def test_paths_are_tracked_independently_and_renames_keep_state():
+    log = ChangeEventLog("owner/repo")
+    log.update("c1", "A", "d", "requirements.txt", parse("a==1\n"))
+
+    other_path = log.update("c2", "A", "d", "docs/requirements.txt", parse("a==1\n"))
+    renamed = log.update("c3", "A", "d", "docs/requirements-docs.txt", parse("a==1\n"),
+                         old_path="docs/requirements.txt")
+    deleted = log.update("c4", "A", "d", "requirements.txt", None)
+
+    assert [e["Evento"] for e in other_path] == [EVENT_ADDED]
+    assert renamed == []
+    assert [(e["Dependencia"], e["Evento"]) for e in deleted] == [("a", EVENT_REMOVED)]
+
+
+def test_git_event_log_from_history(git_repo):
+    git_repo.commit({"requirements.txt": "requests==2.0\n"})
+    git_repo.commit({"requirements.txt": "requests==2.0\n# pinned\n"}, date="2024-02-01T12:00:00+00:00")
+    git_repo.commit({"requirements.txt": "requests==2.1\n"}, date="2024-03-01T12:00:00+00:00")
+    git_repo.commit({"requirements.txt": None}, date="2024-04-01T12:00:00+00:00")
+
+    events = analyze_repository_git_events(git_repo.path, "owner/repo")
+
+    assert events[["Evento", "Versao_Anterior", "Versao"]].fillna("").values.tolist() == [
+        [EVENT_ADDED, "", "2.0"],
+        [EVENT_CHANGED, "2.0", "2.1"],
+        [EVENT_REMOVED, "2.1", ""],
+    ]
+
+
+def test_baseline_seeds_state_before_window(git_repo):
+    baseline = git_repo.commit({"requirements.txt": "requests==2.0\nflask>=1.0\n"}, date="2024-01-01T12:00:00+00:00")
+    bump = git_repo.commit({"requirements.txt": "requests==2.1\nflask>=1.0\n"}, date="2024-03-01T12:00:00+00:00")
+    since = datetime(2024, 2, 1, tzinfo=timezone.utc)
+
+    events = analyze_repository_git_events(git_repo.path, "owner/repo", since=since, baseline=True)
+
+    # O estado de antes da janela entra como "added"; a mudança na janela é comparada com ele
+    assert events[["Hash_Commit", "Dependencia", "Evento"]].values.tolist() == [
+        [baseline, "requests", EVENT_ADDED],
+        [baseline, "flask", EVENT_ADDED],
+        [bump, "requests", EVENT_CHANGED],
+    ]
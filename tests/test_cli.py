@@ -12,4 +12,24 @@ def test_correct_repo_name():
 
     valid = parse_repo_name(name)
 
-    assert valid == True
\ No newline at end of file
+    assert valid == True
+
+def test_repository_name_routes_to_analyze_command():
+    from click.testing import CliRunner
+    from itdepends.cli import cli
+
+    result = CliRunner().invoke(cli, ["django/django", "--offline"])
+
+    assert result.exit_code == 2
+    assert "--offline requires --path" in result.output
+
+def test_events_mode_rejects_jobs_and_incremental():
+    from click.testing import CliRunner
+    from itdepends.cli import cli
+
+    for extra, message in ((["--jobs", "4"], "cannot be combined with --jobs"),
+                           (["--incremental"], "cannot be combined with --incremental")):
+        result = CliRunner().invoke(cli, ["django/django", "--history_mode", "events", *extra])
+
+        assert result.exit_code == 2
+        assert message in result.output
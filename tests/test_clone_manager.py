@@ -0,0 +1,196 @@
+import os
+import subprocess
+from contextlib import ExitStack
+from datetime import datetime
+
+import pandas as pd
+import pytest
+
+from itdepends.application import history_records
+from itdepends.clone_manager import (clone_repository, is_partial_clone, local_repository, MirrorCache,
+                                     SharedObjectStore)
+from itdepends.file_lock import FileLock, LockTimeout
+from itdepends.dependency_query import dependency_timeline
+from itdepends.git_history import analyze_repository_git_history
+from itdepends.history_sampling import iter_baseline_history_records
+from itdepends.parse_memo import ParseMemo
+
+
+@pytest.fixture
+def remote(git_repo, tmp_path):
+    for month in range(1, 7):
+        git_repo.commit({"requirements.txt": f"requests==2.{month}\n", "data.bin": "x" * 1000 * month},
+                        date=f"2024-0{month}-01T12:00:00+00:00")
+
+    bare = tmp_path / "remote.git"
+    subprocess.run(["git", "clone", "-q", "--bare", git_repo.path, str(bare)], check=True)
+    # O que o GitHub habilita para clones parciais
+    subprocess.run(["git", "-C", str(bare), "config", "uploadpack.allowFilter", "true"], check=True)
+    subprocess.run(["git", "-C", str(bare), "config", "uploadpack.allowAnySHA1InWant", "true"], check=True)
+
+    git_repo.url = f"file://{bare}"
+    return git_repo
+
+
+def has_object(repo_path, sha):
+    env = dict(os.environ, GIT_NO_LAZY_FETCH="1")
+    result = subprocess.run(["git", "-C", repo_path, "cat-file", "-e", sha], capture_output=True, env=env)
+    return result.returncode == 0
+
+
+def test_partial_shallow_clone_mines_same_history(remote, tmp_path):
+    since = datetime(2024, 3, 15)
+    clone = clone_repository(remote.url, str(tmp_path / "clone.git"), since=since)
+
+    assert is_partial_clone(clone)
+    assert os.path.exists(os.path.join(clone, "shallow"))
+
+    result = analyze_repository_git_history(clone, "owner/repo", since=since)
+    expected = analyze_repository_git_history(remote.path, "owner/repo", since=since)
+
+    pd.testing.assert_frame_equal(result, expected)
+    assert result["Versao"].tolist() == ["2.4", "2.5", "2.6"]
+
+    # Só os blobs dos manifestos foram buscados
+    data_blob = remote.git("rev-parse", "HEAD:data.bin")
+    assert not has_object(clone, data_blob)
+
+
+def test_shallow_clone_keeps_baseline_commit(remote, tmp_path):
+    since = datetime(2024, 3, 15)
+    clone = clone_repository(remote.url, str(tmp_path / "clone.git"), since=since)
+
+    result = list(iter_baseline_history_records(clone, "owner/repo", since))
+
+    assert result == list(iter_baseline_history_records(remote.path, "owner/repo", since))
+    assert [record["Versao"] for record in result] == ["2.3"]
+
+
+def test_pickaxe_on_partial_clone_prefetches_manifest_blobs(remote, tmp_path, monkeypatch):
+    clone = clone_repository(remote.url, str(tmp_path / "clone.git"))
+    expected = dependency_timeline(remote.path, "owner/repo", "requests")
+
+    # Um blob que faltasse ao -G faria o git buscá-lo sob demanda; aqui isso vira erro
+    monkeypatch.setenv("GIT_NO_LAZY_FETCH", "1")
+    result = dependency_timeline(clone, "owner/repo", "requests")
+
+    pd.testing.assert_frame_equal(result, expected)
+    assert result["Versao"].tolist() == ["2.1", "2.2", "2.3", "2.4", "2.5", "2.6"]
+
+
+def test_window_without_commits_falls_back_to_tip(remote, tmp_path):
+    clone = clone_repository(remote.url, str(tmp_path / "clone.git"), since=datetime(2030, 1, 1))
+
+    head = subprocess.run(["git", "-C", clone, "rev-parse", "HEAD"], capture_output=True, text=True).stdout.strip()
+    assert head == remote.git("rev-parse", "HEAD")
+    assert analyze_repository_git_history(clone, "owner/repo", since=datetime(2030, 1, 1)).empty
+
+
+def test_temporary_clone_is_removed(remote):
+    with local_repository(None, remote.url) as clone:
+        assert is_partial_clone(clone)
+
+    assert not os.path.exists(clone)
+
+
+def test_mirror_is_reused_and_fetches_new_commits(remote, tmp_path):
+    cache = MirrorCache(str(tmp_path / "mirrors"))
+    since = datetime(2024, 3, 15)
+
+    with cache.checkout("owner/repo", remote.url, since=since) as mirror:
+        first = analyze_repository_git_history(mirror, "owner/repo", since=since)
+
+    new_commit = remote.commit({"requirements.txt": "requests==3.0\n"}, date="2024-07-01T12:00:00+00:00")
+    subprocess.run(["git", "-C", remote.path, "push", "-q", remote.url[len("file://"):], "main"], check=True)
+
+    with local_repository(None, remote.url, since=since, mirror_cache=cache, repo_name="owner/repo") as clone:
+        assert clone == mirror
+        head = subprocess.run(["git", "-C", clone, "rev-parse", "HEAD"], capture_output=True, text=True).stdout
+        assert head.strip() == new_commit
+        second = analyze_repository_git_history(clone, "owner/repo", since=since)
+
+    assert os.path.exists(mirror)
+    assert second["Versao"].tolist() == first["Versao"].tolist() + ["3.0"]
+
+
+
+def test_pydriller_backend_mines_a_complete_mirror(remote, tmp_path):
+    cache = MirrorCache(str(tmp_path / "mirrors"))
+    since = datetime(2024, 3, 15)
+
+    # Um espelho parcial, deixado por uma execução com a engine git
+    with cache.checkout("owner/repo", remote.url, since=since) as mirror:
+        expected = analyze_repository_git_history(mirror, "owner/repo", since=since)
+        assert is_partial_clone(mirror)
+
+    with ExitStack() as stack:
+        records = pd.DataFrame(list(history_records(stack, "owner/repo", None, remote.url, since, 3, "pydriller", 1,
+                                                    None, "snapshot", None, ParseMemo(), mirror_cache=cache)))
+        assert os.path.exists(cache.path("owner/repo") + ".lock")
+
+    assert not is_partial_clone(cache.path("owner/repo"))
+    assert records["Versao"].tolist() == expected["Versao"].tolist() == ["2.4", "2.5", "2.6"]
+
+
+def test_mirror_waits_for_lock(remote, tmp_path):
+    cache = MirrorCache(str(tmp_path / "mirrors"), lock_timeout=0.3)
+    os.makedirs(cache.directory)
+
+    with FileLock(cache.path("owner/repo") + ".lock"):
+        with pytest.raises(LockTimeout):
+            with cache.checkout("owner/repo", remote.url):
+                pass
+
+
+def test_least_recently_used_mirrors_are_evicted(remote, tmp_path):
+    cache = MirrorCache(str(tmp_path / "mirrors"))
+
+    for name in ("owner/old", "owner/busy", "owner/new"):
+        with cache.checkout(name, remote.url):
+            pass
+    os.utime(cache.path("owner/old"), (0, 0))
+    os.utime(cache.path("owner/busy"), (1, 1))
+
+    cache.max_bytes = 1
+    with FileLock(cache.path("owner/busy") + ".lock"):
+        cache.evict(keep=cache.path("owner/new"))
+
+    assert not os.path.exists(cache.path("owner/old"))
+    assert os.path.exists(cache.path("owner/busy"))
+    assert os.path.exists(cache.path("owner/new"))
+
+
+def count_packed_objects(repo_path):
+    output = subprocess.run(["git", "-C", repo_path, "count-objects", "-v"], capture_output=True, text=True).stdout
+    stats = dict(line.split(": ") for line in output.splitlines())
+    return int(stats["count"]) + int(stats["in-pack"])
+
+
+def test_fork_mirror_stores_only_its_own_objects(remote, tmp_path):
+    fork = tmp_path / "fork.git"
+    subprocess.run(["git", "clone", "-q", "--bare", remote.url, str(fork)], check=True)
+    subprocess.run(["git", "-C", str(fork), "config", "uploadpack.allowFilter", "true"], check=True)
+    subprocess.run(["git", "-C", str(fork), "config", "uploadpack.allowAnySHA1InWant", "true"], check=True)
+    remote.commit({"requirements.txt": "requests==3.0\n"}, date="2024-07-01T12:00:00+00:00")
+    subprocess.run(["git", "-C", remote.path, "push", "-q", str(fork), "main"], check=True)
+
+    store = SharedObjectStore(str(tmp_path / "objects"))
+    cache = MirrorCache(str(tmp_path / "mirrors"), shared_store=store)
+    since = datetime(2024, 3, 15)
+
+    with cache.checkout("owner/repo", remote.url, since=since):
+        pass
+    with cache.checkout("fork/repo", f"file://{fork}", since=since) as mirror:
+        result = analyze_repository_git_history(mirror, "fork/repo", since=since)
+
+    with open(os.path.join(mirror, "objects", "info", "alternates")) as f:
+        assert f.read().strip() == os.path.join(store.path, "objects")
+
+    with local_repository(None, f"file://{fork}", since=since) as standalone:
+        expected = analyze_repository_git_history(standalone, "fork/repo", since=since)
+        standalone_objects = count_packed_objects(standalone)
+
+    # Commits e árvores em comum ficam só no store; o espelho guarda o que é do fork e os blobs lidos
+    assert count_packed_objects(mirror) < standalone_objects / 2
+    pd.testing.assert_frame_equal(result, expected)
+    assert result["Versao"].tolist() == ["2.4", "2.5", "2.6", "3.0"]
@@ -0,0 +1,75 @@
+import pandas as pd
+import pytest
+
+from itdepends.columnar import (REPORT_COLUMNS, deprecation_schema, find_result_file, load_history_columns,
+                                save_to_parquet)
+from itdepends.deprecation import DEPRECATION_COLUMNS, deprecation_row
+from itdepends.history_sinks import OUTPUT_PARQUET, open_history_sink, stream_history
+from itdepends.report import gerar_relatorio_dependencias
+
+pa = pytest.importorskip("pyarrow")
+pq = pytest.importorskip("pyarrow.parquet")
+
+RECORDS = [
+    {"Origem": "o/r", "Hash_Commit": "c1", "Autor": "Alice", "Data_Commit": "2024-01-01T10:00:00-03:00",
+     "file": "requirements.txt", "Dependencia": "requests", "Versao": "2.0"},
+    {"Origem": "o/r", "Hash_Commit": "c2", "Autor": "Alice", "Data_Commit": "2024-02-01T10:00:00+00:00",
+     "file": "requirements.txt", "Dependencia": "requests", "Versao": "2.1"},
+]
+
+
+def write_parquet(tmp_path, records=RECORDS, batch_size=1):
+    sink, path = open_history_sink(OUTPUT_PARQUET, str(tmp_path / "history"))
+    sink.batch_size = batch_size
+    with sink:
+        stream_history(iter(records), [sink])
+    return path
+
+
+def test_parquet_history_has_typed_and_dictionary_columns(tmp_path):
+    schema = pq.read_schema(write_parquet(tmp_path))
+
+    assert schema.field("Data_Commit").type == pa.timestamp("us", tz="UTC")
+    for column in ("Dependencia", "Hash_Commit", "Autor"):
+        assert pa.types.is_dictionary(schema.field(column).type)
+    assert schema.field("Versao").type == pa.string()
+
+
+def test_report_load_projects_only_report_columns(tmp_path):
+    df = load_history_columns(write_parquet(tmp_path))
+
+    assert list(df.columns) == REPORT_COLUMNS
+    assert df["Data_Commit"].iloc[0] == pd.Timestamp("2024-01-01T13:00:00", tz="UTC")
+    assert df["Versao"].tolist() == ["2.0", "2.1"]
+
+
+def test_report_renders_from_parquet_history(tmp_path):
+    df = load_history_columns(write_parquet(tmp_path))
+    output = tmp_path / "report.html"
+
+    gerar_relatorio_dependencias(df, pd.DataFrame({"Nome": ["requests"]}), output_path=str(output))
+
+    assert output.exists()
+
+
+def test_deprecation_results_saved_as_parquet(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    # Mesmas linhas de run_deprecation_pipeline, com um pacote que não foi resolvido no PyPI
+    df = pd.DataFrame([
+        deprecation_row("requests", False, "psf/requests", False, "5"),
+        deprecation_row("oldlib", True, "someone/oldlib", True, None),
+        deprecation_row("not-on-pypi", False, None, False, False),
+    ], columns=DEPRECATION_COLUMNS)
+
+    path = save_to_parquet(df, "deprecation", "owner/repo", deprecation_schema(df.columns))
+
+    assert find_result_file(str(tmp_path / "results" / "owner_repo"), "deprecation").endswith(".parquet")
+
+    schema = pq.read_schema(path)
+    assert schema.field("Status (PyPi)").type == pa.string()
+    assert schema.field("Arquivado").type == pa.bool_()
+
+    saved = pq.read_table(path).to_pydict()
+    assert saved["Status (PyPi)"] == ["5", None, None]
+    assert saved["Github_encontrado"] == ["psf/requests", "someone/oldlib", None]
+    assert saved["Arquivado"] == [False, True, False]
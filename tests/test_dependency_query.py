@@ -0,0 +1,77 @@
+import os
+import re
+import subprocess
+
+from click.testing import CliRunner
+
+from itdepends.change_events import EVENT_ADDED, EVENT_CHANGED, EVENT_REMOVED
+from itdepends.cli import cli
+from itdepends.dependency_query import dependency_timeline, pickaxe_pattern
+from itdepends.parse_memo import ParseMemo
+
+
+def build_history(git_repo):
+    commits = [
+        git_repo.commit({"requirements.txt": "requests==2.0\nurllib3==1.26\n"}, date="2024-01-01T12:00:00+00:00"),
+        git_repo.commit({"requirements.txt": "requests==2.1\nurllib3==1.26\n"}, date="2024-02-01T12:00:00+00:00"),
+        # Mesmo pacote, outra grafia e um comentário: nada muda para o urllib3
+        git_repo.commit({"requirements.txt": "requests==2.1\n# urllib3 pinned\nURLLIB3==1.26\n"},
+                        date="2024-03-01T12:00:00+00:00"),
+        git_repo.commit({"pyproject.toml": '[project]\ndependencies = ["urllib3>=2.0"]\n'},
+                        date="2024-04-01T12:00:00+00:00"),
+        git_repo.commit({"requirements.txt": "requests==2.2\nurllib3-secure-extra==1.0\n"},
+                        date="2024-05-01T12:00:00+00:00"),
+    ]
+    return commits
+
+
+def test_pickaxe_pattern_matches_equivalent_spellings():
+    pattern = re.compile(pickaxe_pattern("zope.interface"), re.IGNORECASE)
+
+    assert pattern.search("Zope-Interface>=5")
+    assert pattern.search('"zope_interface",')
+    assert not pattern.search("zope.interfaces==1")
+
+
+def test_timeline_reads_only_commits_that_change_the_dependency(git_repo):
+    first, second, third, fourth, fifth = build_history(git_repo)
+    memo = ParseMemo()
+
+    timeline = dependency_timeline(git_repo.path, "owner/repo", "urllib3", parse_memo=memo)
+
+    assert timeline[["Hash_Commit", "file", "Evento", "Versao_Anterior", "Versao"]].fillna("").values.tolist() == [
+        [first, "requirements.txt", EVENT_ADDED, "", "1.26"],
+        [fourth, "pyproject.toml", EVENT_ADDED, "", "2.0"],
+        [fifth, "requirements.txt", EVENT_REMOVED, "1.26", ""],
+    ]
+    # O commit que só muda requests nunca é lido
+    assert second not in timeline["Hash_Commit"].tolist()
+    assert memo.misses == 5
+
+
+def test_version_change_and_file_removal(git_repo):
+    git_repo.commit({"requirements.txt": "urllib3>=1.0\n"})
+    changed = git_repo.commit({"requirements.txt": "urllib3>=2.0\n"}, date="2024-02-01T12:00:00+00:00")
+    removed = git_repo.commit({"requirements.txt": None}, date="2024-03-01T12:00:00+00:00")
+
+    timeline = dependency_timeline(git_repo.path, "owner/repo", "urllib3")
+
+    assert timeline[["Hash_Commit", "Evento", "Versao"]].fillna("").values.tolist()[1:] == [
+        [changed, EVENT_CHANGED, "2.0"],
+        [removed, EVENT_REMOVED, ""],
+    ]
+    assert timeline.loc[1, "Especificador_Anterior"] == ">=1.0"
+
+
+def test_history_command_saves_timeline(git_repo, tmp_path, monkeypatch):
+    build_history(git_repo)
+    monkeypatch.chdir(tmp_path)
+
+    result = CliRunner().invoke(cli, ["history", "owner/repo", "--dep", "URLLib3", "--path", git_repo.path])
+
+    assert result.exit_code == 0, result.output
+    assert "3 changes saved" in result.output
+    assert f"requirements.txt  {EVENT_ADDED}: - -> 1.26" in result.output
+    assert f"requirements.txt  {EVENT_REMOVED}: 1.26 -> -" in result.output
+    assert "nan" not in result.output
+    assert os.path.exists(tmp_path / "results" / "owner_repo" / "dependency_urllib3.csv")
@@ -0,0 +1,241 @@
+import json
+import re
+import threading
+import time
+import pytest
+import pandas as pd
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from itdepends.deprecation import DEPRECATION_COLUMNS, check_deprecation, deprecation_row, run_deprecation_pipeline
+from itdepends.integrations import GitHubClient, PyPiClient
+
+
+# --------------------------------------------------------------------
+# Servidor local que imita PyPI e GitHub
+# --------------------------------------------------------------------
+
+PYPI_DOCS = {
+    "requests": {"info": {
+        "classifiers": ["Development Status :: 5 - Production/Stable"],
+        "project_urls": {"Source": "https://github.com/psf/requests"},
+    }},
+    "oldlib": {"info": {
+        "classifiers": ["Development Status :: 7 - Inactive"],
+        "project_urls": {"Homepage": "https://github.com/someone/oldlib"},
+    }},
+    "nourls": {"info": {"classifiers": ["License :: OSI Approved"]}},
+}
+
+GITHUB_REPOS = {
+    "psf/requests": {"archived": False, "pushed_at": "2099-01-01T00:00:00Z", "default_branch": "main"},
+    "someone/oldlib": {"archived": True, "pushed_at": "2015-01-01T00:00:00Z", "default_branch": "master"},
+    # Responde no REST mas vem null no GraphQL, forçando o fallback
+    "flaky/graphql": {"archived": True, "pushed_at": "2099-01-01T00:00:00Z", "default_branch": "main",
+                      "graphql_error": True},
+}
+
+GRAPHQL_ALIAS_RE = re.compile(r'(r\d+): repository\(owner: ("[^"]*"), name: ("[^"]*")\)')
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        server = self.server
+        with server.lock:
+            server.in_flight += 1
+            server.max_in_flight = max(server.max_in_flight, server.in_flight)
+            server.requests.append(self.path)
+
+        time.sleep(server.delay)
+
+        body = None
+        if self.path.startswith("/pypi/") and self.path.endswith("/json"):
+            body = PYPI_DOCS.get(self.path.split("/")[2])
+        elif self.path.startswith("/repos/"):
+            body = GITHUB_REPOS.get(self.path[len("/repos/"):])
+
+        with server.lock:
+            server.in_flight -= 1
+
+        if body is None:
+            self.send_response(404)
+            self.end_headers()
+            return
+
+        payload = json.dumps(body).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def do_POST(self):
+        server = self.server
+        with server.lock:
+            server.requests.append(self.path)
+
+        length = int(self.headers.get("Content-Length", 0))
+        query = json.loads(self.rfile.read(length))["query"]
+
+        data = {}
+        for alias, owner, name in GRAPHQL_ALIAS_RE.findall(query):
+            repo = GITHUB_REPOS.get(f"{json.loads(owner)}/{json.loads(name)}")
+            if repo is None or repo.get("graphql_error"):
+                data[alias] = None
+                continue
+            data[alias] = {
+                "isArchived": repo["archived"],
+                "pushedAt": repo["pushed_at"],
+                "defaultBranchRef": {"name": repo["default_branch"]},
+            }
+
+        payload = json.dumps({"data": data}).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def stand_in_server():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StandInHandler)
+    server.lock = threading.Lock()
+    server.in_flight = 0
+    server.max_in_flight = 0
+    server.requests = []
+    server.delay = 0.05
+    server.url = f"http://127.0.0.1:{server.server_address[1]}"
+
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture(autouse=True)
+def no_token(monkeypatch):
+    monkeypatch.delenv("GITHUB_TOKEN", raising=False)
+
+
+def make_clients(server, token=None):
+    pypi = PyPiClient(base_url=f"{server.url}/pypi/")
+    gh = GitHubClient(token=token, api_url=server.url)
+    return pypi, gh
+
+
+# --------------------------------------------------------------------
+# Tests pipeline assíncrono
+# --------------------------------------------------------------------
+
+def test_pipeline_returns_expected_table(stand_in_server):
+    pypi, gh = make_clients(stand_in_server)
+
+    df = run_deprecation_pipeline(["requests", "oldlib", "nourls", "missing"], 6,
+                                  concurrency=4, pypi=pypi, gh=gh)
+
+    assert list(df.columns) == DEPRECATION_COLUMNS
+    assert list(df["Nome"]) == ["requests", "oldlib", "nourls", "missing"]
+
+    rows = df.set_index("Nome")
+    assert rows.loc["requests", "Github_encontrado"] == "psf/requests"
+    assert rows.loc["requests", "Status (PyPi)"] == "5 - Production/Stable"
+    assert not rows.loc["requests", "Arquivado"]
+    assert not rows.loc["requests", "Inativo"]
+
+    assert rows.loc["oldlib", "Arquivado"]
+    assert rows.loc["oldlib", "Inativo"]
+
+    assert pd.isna(rows.loc["nourls", "Github_encontrado"])
+    assert rows.loc["missing", "Status (PyPi)"] == False
+
+
+def test_pipeline_matches_sequential_checks(stand_in_server):
+    pypi, gh = make_clients(stand_in_server)
+    names = ["requests", "oldlib", "nourls", "missing"]
+
+    expected = []
+    for name in names:
+        archived, repo, inactive, status, available = check_deprecation(name, 6, pypi=pypi, gh=gh)
+        expected.append(deprecation_row(name, archived, repo, inactive, status))
+
+    pypi.clear_project_cache()
+    gh.clear_repo_cache()
+
+    df = run_deprecation_pipeline(names, 6, concurrency=3, pypi=pypi, gh=gh)
+
+    pd.testing.assert_frame_equal(df, pd.DataFrame(expected))
+
+
+def test_pipeline_respects_per_host_concurrency(stand_in_server):
+    names = [f"pkg{i}" for i in range(12)]
+    pypi, gh = make_clients(stand_in_server)
+
+    run_deprecation_pipeline(names, 6, concurrency=3, pypi=pypi, gh=gh)
+
+    assert len(stand_in_server.requests) == 12
+    assert 1 < stand_in_server.max_in_flight <= 3
+
+
+def test_pipeline_empty_dependency_list():
+    df = run_deprecation_pipeline([], 6, concurrency=2, pypi=PyPiClient(), gh=GitHubClient())
+
+    assert df.empty
+    assert list(df.columns) == DEPRECATION_COLUMNS
+
+
+# --------------------------------------------------------------------
+# Tests lote GraphQL
+# --------------------------------------------------------------------
+
+def test_graphql_batch_matches_rest_values(stand_in_server):
+    _, gh = make_clients(stand_in_server, token="test-token")
+    names = ["psf/requests", "someone/oldlib"]
+
+    rest = {name: gh.get_repo_info(name) for name in names}
+    gh.clear_repo_cache()
+
+    batch = gh.get_repo_info_batch(names, batch_size=10)
+
+    assert batch == rest
+    assert stand_in_server.requests.count("/graphql") == 1
+
+
+def test_graphql_batch_chunks_and_falls_back_to_rest(stand_in_server):
+    _, gh = make_clients(stand_in_server, token="test-token")
+
+    batch = gh.get_repo_info_batch(["psf/requests", "someone/oldlib", "flaky/graphql", "nobody/missing"],
+                                   batch_size=2)
+
+    assert stand_in_server.requests.count("/graphql") == 2
+    assert "/repos/flaky/graphql" in stand_in_server.requests
+    assert batch["flaky/graphql"].archived is True
+    assert batch["nobody/missing"].exists is False
+
+
+def test_graphql_batch_without_token_uses_rest(stand_in_server):
+    _, gh = make_clients(stand_in_server)
+
+    batch = gh.get_repo_info_batch(["psf/requests"])
+
+    assert "/graphql" not in stand_in_server.requests
+    assert batch["psf/requests"].default_branch == "main"
+
+
+def test_pipeline_with_graphql_matches_rest_pipeline(stand_in_server):
+    names = ["requests", "oldlib", "nourls", "missing"]
+
+    pypi, gh = make_clients(stand_in_server)
+    rest_df = run_deprecation_pipeline(names, 6, concurrency=2, pypi=pypi, gh=gh)
+
+    stand_in_server.requests.clear()
+
+    pypi, gh = make_clients(stand_in_server, token="test-token")
+    graphql_df = run_deprecation_pipeline(names, 6, concurrency=2, pypi=pypi, gh=gh, graphql_batch_size=10)
+
+    pd.testing.assert_frame_equal(rest_df, graphql_df)
+    assert stand_in_server.requests.count("/graphql") == 1
+    assert not any(path.startswith("/repos/") for path in stand_in_server.requests)
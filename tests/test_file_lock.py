@@ -0,0 +1,95 @@
+import os
+import time
+
+import pytest
+
+from itdepends.file_lock import FileLock, LockTimeout
+
+
+def age(path, seconds):
+    past = time.time() - seconds
+    os.utime(path, (past, past))
+
+
+def test_stale_lock_is_taken_over(tmp_path):
+    path = str(tmp_path / "repo.lock")
+    with open(path, "w") as f:
+        f.write("12345 dead")
+    age(path, 120)
+
+    with FileLock(path, timeout=0, stale_after=60) as lock:
+        assert lock._owned()
+
+    assert not os.path.exists(path)
+    assert os.listdir(tmp_path) == []
+
+
+def test_lock_recreated_during_takeover_is_given_back(tmp_path, monkeypatch):
+    path = str(tmp_path / "repo.lock")
+    owner = FileLock(path, stale_after=60).acquire()
+
+    # Outro processo achou o lock abandonado, mas o dono o recriou antes do rename
+    monkeypatch.setattr(FileLock, "_is_stale", lambda self, stale_path=None: stale_path is None)
+
+    with pytest.raises(LockTimeout):
+        FileLock(path, timeout=0.3, poll_interval=0.05, stale_after=60).acquire()
+
+    monkeypatch.undo()
+    assert owner._owned()
+    assert sorted(os.listdir(tmp_path)) == ["repo.lock"]
+    owner.release()
+
+
+def test_fresh_lock_is_not_deleted_when_another_lock_took_its_place(tmp_path, monkeypatch):
+    path = str(tmp_path / "repo.lock")
+    owner = FileLock(path, stale_after=60).acquire()
+    checks = []
+
+    def is_stale(self, stale_path=None):
+        if stale_path is None:
+            return True
+        # Um terceiro processo cria o lock entre o rename e a nova checagem
+        if not checks:
+            with open(path, "w") as f:
+                f.write("999 third")
+        checks.append(stale_path)
+        return False
+
+    monkeypatch.setattr(FileLock, "_is_stale", is_stale)
+
+    with pytest.raises(LockTimeout):
+        FileLock(path, timeout=0, stale_after=60).acquire()
+
+    monkeypatch.undo()
+    with open(checks[0]) as f:
+        assert f.read() == owner._token
+    with open(path) as f:
+        assert f.read() == "999 third"
+    owner.release()
+
+
+def test_held_lock_is_refreshed_and_never_looks_stale(tmp_path):
+    path = str(tmp_path / "repo.lock")
+
+    with FileLock(path, stale_after=0.3) as lock:
+        keeper = lock._keeper
+        age(path, 10)
+        time.sleep(0.5)
+        assert time.time() - os.path.getmtime(path) < 0.3
+
+        with pytest.raises(LockTimeout):
+            FileLock(path, timeout=0.2, poll_interval=0.05, stale_after=0.3).acquire()
+
+    assert not keeper.is_alive()
+
+
+def test_release_keeps_a_lock_taken_over_by_another_process(tmp_path):
+    path = str(tmp_path / "repo.lock")
+    lock = FileLock(path, stale_after=None).acquire()
+
+    with open(path, "w") as f:
+        f.write("999 other")
+    lock.release()
+
+    with open(path) as f:
+        assert f.read() == "999 other"
@@ -0,0 +1,100 @@
+from datetime import datetime, timezone
+
+import pandas as pd
+from pydriller import Repository
+
+from itdepends.git_history import analyze_repository_git_history, iter_manifest_changes, list_manifest_commits
+from itdepends.history import analyze_repository_commit_history
+from itdepends.history_jobs import mine_history_parallel, split_commits
+
+
+def build_history(git_repo):
+    git_repo.commit({"requirements.txt": "requests==2.0\nflask>=1.0\n", "README.md": "x"},
+                    date="2023-01-01T10:00:00+02:00")
+    git_repo.commit({"pyproject.toml": '[project]\ndependencies = ["numpy>=1.20"]\n'},
+                    date="2023-02-01T10:00:00+00:00", author="Bob")
+    git_repo.commit({"tests/requirements.txt": "pytest==7.0\n"}, date="2023-03-01T10:00:00+00:00")
+    git_repo.commit({"src/app.py": "print('hi')\n"}, date="2023-03-15T10:00:00+00:00")
+
+    git_repo.git("checkout", "-q", "-b", "feature")
+    git_repo.commit({"requirements.txt": "requests==2.1\nflask>=1.0\n"}, date="2023-04-01T10:00:00+00:00")
+    git_repo.git("checkout", "-q", "main")
+    git_repo.commit({"docs/requirements-docs.txt": "sphinx==5.0\n"}, date="2023-04-02T10:00:00+00:00")
+    git_repo.git("-c", "user.name=M", "-c", "user.email=m@test.com",
+                 "merge", "-q", "--no-ff", "-m", "merge", "feature")
+
+    git_repo.git("mv", "docs/requirements-docs.txt", "docs/requirements.txt")
+    git_repo.commit({}, date="2023-05-01T10:00:00+00:00")
+    git_repo.commit({"requirements.txt": None}, date="2023-06-01T10:00:00+00:00")
+    git_repo.commit({"requirements.txt": "django\n"}, date="2023-07-01T10:00:00+00:00")
+
+
+def pydriller_history(path, since=None):
+    repo = Repository(path, since=since, only_modifications_with_file_types=['.txt', '.toml', '.pip'])
+    return analyze_repository_commit_history(repo, "owner/repo")
+
+
+def test_git_backend_matches_pydriller_records(git_repo):
+    build_history(git_repo)
+
+    expected = pydriller_history(git_repo.path)
+    result = analyze_repository_git_history(git_repo.path, "owner/repo")
+
+    assert not result.empty
+    pd.testing.assert_frame_equal(result, expected)
+
+
+def test_git_backend_matches_pydriller_since_date(git_repo):
+    build_history(git_repo)
+    since = datetime(2023, 4, 1, tzinfo=timezone.utc)
+
+    expected = pydriller_history(git_repo.path, since)
+    result = analyze_repository_git_history(git_repo.path, "owner/repo", since=since)
+
+    pd.testing.assert_frame_equal(result, expected)
+    assert result["Data_Commit"].min() >= "2023-04-01"
+
+
+def test_manifest_changes_skip_deletes_and_test_dirs(git_repo):
+    git_repo.commit({"requirements.txt": "a==1\n", "tests/requirements.txt": "b==1\n"})
+    git_repo.commit({"requirements.txt": None}, date="2024-02-01T12:00:00+00:00")
+
+    changes = list(iter_manifest_changes(git_repo.path))
+
+    assert [change.path for change in changes] == ["requirements.txt"]
+    assert changes[0].author_date == "2024-01-01T12:00:00+00:00"
+
+
+def test_empty_history_returns_empty_frame(git_repo):
+    git_repo.commit({"README.md": "x"})
+
+    assert analyze_repository_git_history(git_repo.path, "owner/repo").empty
+
+
+def test_partitioned_commits_reproduce_serial_output(git_repo):
+    build_history(git_repo)
+
+    commits = list_manifest_commits(git_repo.path)
+    serial = analyze_repository_git_history(git_repo.path, "owner/repo")
+
+    parts = [analyze_repository_git_history(git_repo.path, "owner/repo", commits=chunk)
+             for chunk in split_commits(commits, 3)]
+    merged = pd.concat([part for part in parts if not part.empty], ignore_index=True)
+
+    pd.testing.assert_frame_equal(merged, serial)
+
+
+def test_split_commits_is_contiguous_and_balanced():
+    chunks = split_commits(list("abcdefg"), 3)
+
+    assert chunks == [["a", "b", "c"], ["d", "e"], ["f", "g"]]
+    assert split_commits(["a"], 8) == [["a"]]
+
+
+def test_parallel_mining_matches_serial_run(git_repo):
+    build_history(git_repo)
+
+    expected = pydriller_history(git_repo.path)
+    result = mine_history_parallel(git_repo.path, "owner/repo", jobs=2)
+
+    pd.testing.assert_frame_equal(result, expected)
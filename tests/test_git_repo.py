@@ -0,0 +1,59 @@
+import pytest
+
+from itdepends.deprecation import get_local_dependency_files
+from itdepends.git_repo import CatFileBatch, GitError, iter_tree_files, list_tree, resolve_default_branch, run_git
+
+
+def test_local_manifests_come_from_committed_tree(git_repo):
+    git_repo.commit({
+        "requirements.txt": "requests==2.0\n",
+        "pkg/pyproject.toml": "[project]\n",
+        "README.md": "# readme\n",
+    })
+
+    # Alterações não commitadas não fazem parte do HEAD
+    with open(f"{git_repo.path}/requirements.txt", "w") as f:
+        f.write("dirty==1.0\n")
+
+    files = get_local_dependency_files(git_repo.path)
+
+    assert sorted((f["name"], f["content"]) for f in files) == [
+        ("pyproject.toml", "[project]\n"),
+        ("requirements.txt", "requests==2.0\n"),
+    ]
+
+
+def test_default_branch_prefers_origin_head(git_repo, tmp_path):
+    first = git_repo.commit({"requirements.txt": "a==1\n"})
+    git_repo.git("checkout", "-q", "-b", "feature")
+    git_repo.commit({"requirements.txt": "a==2\n"})
+
+    assert resolve_default_branch(git_repo.path) != first
+
+    git_repo.git("update-ref", "refs/remotes/origin/main", first)
+    git_repo.git("symbolic-ref", "refs/remotes/origin/HEAD", "refs/remotes/origin/main")
+
+    assert resolve_default_branch(git_repo.path) == first
+
+
+def test_cat_file_batch_reads_many_objects_from_one_process(git_repo):
+    git_repo.commit({"a.txt": "alpha", "b.txt": "beta\n"})
+    entries = dict((path, sha) for sha, path in list_tree(git_repo.path, "HEAD"))
+
+    with CatFileBatch(git_repo.path) as cat_file:
+        assert cat_file.read_text(entries["a.txt"]) == "alpha"
+        assert cat_file.read_text(entries["b.txt"]) == "beta\n"
+        assert cat_file.read("0" * 40) is None
+
+
+def test_iter_tree_files_filters_by_name(git_repo):
+    git_repo.commit({"x/requirements.txt": "a\n", "x/other.txt": "b\n"})
+
+    files = list(iter_tree_files(git_repo.path, "HEAD", {"requirements.txt"}))
+
+    assert [(path, content) for sha, path, content in files] == [("x/requirements.txt", "a\n")]
+
+
+def test_run_git_raises_on_failure(tmp_path):
+    with pytest.raises(GitError):
+        run_git(str(tmp_path), "rev-parse", "--verify", "does-not-exist")
@@ -3,6 +3,8 @@ from unittest.mock import MagicMock, patch
 from datetime import datetime, timezone, timedelta
 
 from itdepends.integrations import GitHubClient
+from itdepends.integrations.github_api import is_archived, is_inactive, repo_exists
+from itdepends.models import RepoInfo
 
 
 # --------------------------------------------------------------------
@@ -152,4 +154,174 @@ def test_verify_archived_missing_key(monkeypatch):
     mock_data = {}
     monkeypatch.setattr(client, "do_safe_request", lambda url: (mock_data, None))
 
-    assert client.verify_archived("owner/repo") is False
\ No newline at end of file
+    assert client.verify_archived("owner/repo") is False
+
+
+# --------------------------------------------------------------------
+# Tests get_repo_info
+# --------------------------------------------------------------------
+
+def test_get_repo_info_single_request_for_all_checks(monkeypatch):
+    client = GitHubClient()
+
+    calls = []
+    def fake_request(url):
+        calls.append(url)
+        return {"archived": True, "pushed_at": "2020-01-01T00:00:00Z", "default_branch": "main"}, None
+
+    monkeypatch.setattr(client, "do_safe_request", fake_request)
+
+    assert client.verify_repo_existance("owner/repo") is True
+    assert client.verify_archived("owner/repo") is True
+    assert client.verify_inactivity("owner/repo") is True
+    assert client.get_default_branch_name("owner/repo") == "main"
+    assert len(calls) == 1
+
+
+def test_get_repo_info_not_found_is_memoized(monkeypatch):
+    client = GitHubClient()
+
+    monkeypatch.setattr(client, "do_safe_request", lambda url: (None, 404))
+    info = client.get_repo_info("owner/missing")
+
+    monkeypatch.setattr(client, "do_safe_request", lambda url: pytest.fail("unexpected request"))
+
+    assert client.get_repo_info("owner/missing") is info
+    assert repo_exists(info) is False
+    assert info.error == 404
+
+
+def test_get_repo_info_transient_errors_are_not_memoized(monkeypatch):
+    client = GitHubClient()
+
+    monkeypatch.setattr(client, "do_safe_request", lambda url: (None, "timeout"))
+    assert client.get_repo_info("owner/repo").error == "timeout"
+
+    monkeypatch.setattr(client, "do_safe_request", lambda url: ({"archived": False}, None))
+    assert client.get_repo_info("owner/repo").exists is True
+
+
+def test_pure_checks_over_repo_info():
+    now = datetime(2024, 12, 1, tzinfo=timezone.utc)
+    recent = RepoInfo("owner/repo", exists=True, pushed_at="2024-10-15T00:00:00Z")
+    stale = RepoInfo("owner/repo", exists=True, archived=True, pushed_at="2023-01-01T00:00:00Z")
+
+    assert is_inactive(recent, max_months=6, now=now) is False
+    assert is_inactive(stale, max_months=6, now=now) is True
+    assert is_archived(stale) is True
+    assert is_archived(recent) is False
+
+
+# --------------------------------------------------------------------
+# Tests iter_archive_files
+# --------------------------------------------------------------------
+
+def make_tarball(files):
+    import io
+    import tarfile
+
+    buffer = io.BytesIO()
+    with tarfile.open(fileobj=buffer, mode="w:gz") as archive:
+        for name, content in files.items():
+            data = content.encode("utf-8")
+            info = tarfile.TarInfo(name)
+            info.size = len(data)
+            archive.addfile(info, io.BytesIO(data))
+    buffer.seek(0)
+    return buffer
+
+
+def test_iter_archive_files_streams_only_manifests(monkeypatch):
+    client = GitHubClient()
+
+    resp = make_response(200)
+    resp.headers = {}
+    resp.raw = make_tarball({
+        "owner-repo-abc123/requirements.txt": "requests==2.0\n",
+        "owner-repo-abc123/pkg/pyproject.toml": "[project]\n",
+        "owner-repo-abc123/README.md": "# readme\n",
+        "owner-repo-abc123/src/main.py": "print()\n",
+    })
+
+    requested = []
+    def fake_get(url, headers=None, stream=False):
+        requested.append((url, stream))
+        return resp
+
+    monkeypatch.setattr(client.session, "get", fake_get)
+
+    files = list(client.iter_archive_files("owner/repo", "main", {"requirements.txt", "pyproject.toml"}))
+
+    assert files == [
+        ("requirements.txt", "requests==2.0\n"),
+        ("pkg/pyproject.toml", "[project]\n"),
+    ]
+    assert requested == [("https://api.github.com/repos/owner/repo/tarball/main", True)]
+    resp.close.assert_called_once()
+
+
+def test_iter_archive_files_http_error(monkeypatch):
+    client = GitHubClient()
+
+    resp = make_response(404)
+    resp.headers = {}
+    monkeypatch.setattr(client.session, "get", lambda url, headers=None, stream=False: resp)
+
+    with pytest.raises(Exception):
+        list(client.iter_archive_files("owner/repo", "main", {"requirements.txt"}))
+
+
+def test_get_repo_info_concurrent_misses_share_one_request(monkeypatch):
+    import threading
+    from concurrent.futures import ThreadPoolExecutor
+
+    client = GitHubClient()
+    calls = []
+
+    def slow_request(url):
+        calls.append(url)
+        threading.Event().wait(0.2)
+        return {"archived": False, "default_branch": "main"}, None
+
+    monkeypatch.setattr(client, "do_safe_request", slow_request)
+
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        infos = list(executor.map(client.get_repo_info, ["owner/repo"] * 4))
+
+    assert len(calls) == 1
+    assert all(info is infos[0] for info in infos)
+
+
+def test_get_repo_info_memo_expires_with_cache_ttl(tmp_path, monkeypatch):
+    from itdepends.integrations import ResponseCache
+
+    client = GitHubClient(cache=ResponseCache(str(tmp_path), ttl=60))
+    now = [0.0]
+    client.repo_memo._clock = lambda: now[0]
+
+    calls = []
+    def fake_request(url):
+        calls.append(url)
+        return {"archived": len(calls) > 1}, None
+
+    monkeypatch.setattr(client, "do_safe_request", fake_request)
+
+    assert client.get_repo_info("owner/repo").archived is False
+    now[0] = 59
+    assert client.get_repo_info("owner/repo").archived is False
+    # Num worker que fica no ar por dias, o arquivamento aparece depois do TTL
+    now[0] = 61
+    assert client.get_repo_info("owner/repo").archived is True
+    assert len(calls) == 2
+
+
+def test_get_repo_info_not_found_is_not_shared_between_tokens(monkeypatch):
+    anonymous = GitHubClient(token=None)
+    authenticated = GitHubClient(token="secret")
+
+    # Repositório privado: 404 sem token, visível com ele
+    monkeypatch.setattr(anonymous, "do_safe_request", lambda url: (None, 404))
+    monkeypatch.setattr(authenticated, "do_safe_request", lambda url: ({"archived": False}, None))
+
+    assert anonymous.get_repo_info("owner/private").exists is False
+    assert authenticated.get_repo_info("owner/private").exists is True
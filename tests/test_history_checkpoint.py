@@ -0,0 +1,71 @@
+from datetime import datetime, timezone
+
+import pandas as pd
+
+from itdepends.git_history import analyze_repository_git_history
+from itdepends.history_checkpoint import HistoryCheckpoint, mine_history_incremental
+
+
+def full_history(git_repo, since=None):
+    return analyze_repository_git_history(git_repo.path, "owner/repo", since=since).astype(str)
+
+
+def test_rerun_mines_only_new_commits(git_repo, tmp_path):
+    checkpoint = HistoryCheckpoint(str(tmp_path / "history"))
+    git_repo.commit({"requirements.txt": "requests==2.0\n"}, date="2024-01-01T12:00:00+00:00")
+    git_repo.commit({"pyproject.toml": '[project]\ndependencies = ["numpy>=1.20"]\n'},
+                    date="2024-02-01T12:00:00+00:00")
+
+    df, mined = mine_history_incremental(git_repo.path, "owner/repo", None, 12, checkpoint)
+    assert mined == 2
+
+    git_repo.commit({"requirements.txt": "requests==2.1\n"}, date="2024-03-01T12:00:00+00:00")
+
+    df, mined = mine_history_incremental(git_repo.path, "owner/repo", None, 12, checkpoint)
+
+    assert mined == 1
+    pd.testing.assert_frame_equal(df, full_history(git_repo))
+    assert df["Versao"].tolist() == ["2.0", "1.20", "2.1"]
+
+    _, mined = mine_history_incremental(git_repo.path, "owner/repo", None, 12, checkpoint)
+    assert mined == 0
+
+
+def test_rewritten_history_triggers_full_rebuild(git_repo, tmp_path):
+    checkpoint = HistoryCheckpoint(str(tmp_path / "history"))
+    first = git_repo.commit({"requirements.txt": "requests==2.0\n"})
+    git_repo.commit({"requirements.txt": "requests==3.0\n"}, date="2024-02-01T12:00:00+00:00")
+    mine_history_incremental(git_repo.path, "owner/repo", None, 12, checkpoint)
+
+    # force-push: o HEAD salvo deixa de ser ancestral
+    git_repo.git("reset", "-q", "--hard", first)
+    git_repo.commit({"requirements.txt": "flask==1.0\n"}, date="2024-03-01T12:00:00+00:00")
+
+    df, mined = mine_history_incremental(git_repo.path, "owner/repo", None, 12, checkpoint)
+
+    assert mined == 2
+    assert df["Dependencia"].tolist() == ["requests", "flask"]
+
+
+def test_changed_window_triggers_full_rebuild(git_repo, tmp_path):
+    checkpoint = HistoryCheckpoint(str(tmp_path / "history"))
+    git_repo.commit({"requirements.txt": "requests==2.0\n"}, date="2023-01-01T12:00:00+00:00")
+    git_repo.commit({"requirements.txt": "requests==3.0\n"}, date="2024-02-01T12:00:00+00:00")
+    mine_history_incremental(git_repo.path, "owner/repo", None, 12, checkpoint)
+
+    since = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    df, mined = mine_history_incremental(git_repo.path, "owner/repo", since, 6, checkpoint)
+
+    assert mined == 1
+    pd.testing.assert_frame_equal(df, full_history(git_repo, since))
+
+
+def test_checkpoint_round_trips_empty_history(git_repo, tmp_path):
+    checkpoint = HistoryCheckpoint(str(tmp_path / "history"))
+    git_repo.commit({"README.md": "x"})
+
+    df, _ = mine_history_incremental(git_repo.path, "owner/repo", None, 12, checkpoint)
+    meta, saved = checkpoint.load("owner/repo")
+
+    assert df.empty and saved.empty
+    assert meta["since_months"] == 12
@@ -0,0 +1,101 @@
+from contextlib import ExitStack
+from datetime import datetime, timezone
+
+import pandas as pd
+import pytest
+
+from itdepends.application import history_records
+from itdepends.history_sampling import baseline_point, iter_sampled_history_records, sample_commits
+from itdepends.parse_memo import ParseMemo
+
+
+def build_history(git_repo):
+    first = git_repo.commit({"requirements.txt": "requests==1.0\n"}, date="2024-01-05T12:00:00+00:00")
+    second = git_repo.commit({"requirements.txt": "requests==2.0\n", "tests/requirements.txt": "pytest==7.0\n"},
+                             date="2024-01-20T12:00:00+00:00")
+    git_repo.git("tag", "v1")
+    third = git_repo.commit({"README.md": "docs\n"}, date="2024-02-10T12:00:00+00:00")
+    fourth = git_repo.commit({"pyproject.toml": '[project]\ndependencies = ["numpy>=1.20"]\n'},
+                             date="2024-03-01T12:00:00+00:00", author="Bob")
+    git_repo.git("tag", "v2")
+    return first, second, third, fourth
+
+
+def sampled(git_repo, mode, **kwargs):
+    return pd.DataFrame(list(iter_sampled_history_records(git_repo.path, "owner/repo", mode, progress=False,
+                                                          **kwargs)))
+
+
+def test_month_samples_last_commit_of_each_month(git_repo):
+    first, second, third, fourth = build_history(git_repo)
+
+    points = sample_commits(git_repo.path, "month")
+    assert [(point.commit_hash, point.label) for point in points] == [
+        (second, "2024-01"), (third, "2024-02"), (fourth, "2024-03")]
+
+    result = sampled(git_repo, "month")
+    # Cada amostra traz o estado completo dos manifestos, sem os de diretórios de teste
+    assert result[["Hash_Commit", "file", "Dependencia", "Versao"]].values.tolist() == [
+        [second, "requirements.txt", "requests", "2.0"],
+        [third, "requirements.txt", "requests", "2.0"],
+        [fourth, "pyproject.toml", "numpy", "1.20"],
+        [fourth, "requirements.txt", "requests", "2.0"],
+    ]
+    assert result.columns.tolist() == ["Origem", "Hash_Commit", "Autor", "Data_Commit", "file", "Dependencia",
+                                       "Versao"]
+
+
+def test_tags_and_weeks(git_repo):
+    first, second, third, fourth = build_history(git_repo)
+
+    tags = sample_commits(git_repo.path, "tags")
+    assert [(point.commit_hash, point.label) for point in tags] == [(second, "v1"), (fourth, "v2")]
+
+    weeks = sample_commits(git_repo.path, "week")
+    assert [point.commit_hash for point in weeks] == [first, second, third, fourth]
+    assert weeks[0].label == "2024-W01"
+
+
+def test_last_manifest_commits_and_since(git_repo):
+    first, second, third, fourth = build_history(git_repo)
+
+    assert [point.commit_hash for point in sample_commits(git_repo.path, "last", last=2)] == [second, fourth]
+
+    since = datetime(2024, 2, 1, tzinfo=timezone.utc)
+    assert [point.commit_hash for point in sample_commits(git_repo.path, "month", since=since)] == [third, fourth]
+
+
+def test_unchanged_blobs_are_parsed_once(git_repo):
+    build_history(git_repo)
+    memo = ParseMemo()
+
+    sampled(git_repo, "week", parse_memo=memo)
+
+    # requirements.txt em 2 versões e o pyproject.toml: 3 blobs para 5 manifestos lidos
+    assert memo.misses == 3
+    assert memo.hits == 2
+
+
+def test_unknown_mode(git_repo):
+    build_history(git_repo)
+
+    with pytest.raises(ValueError):
+        sample_commits(git_repo.path, "daily")
+
+
+def test_baseline_records_state_at_last_commit_before_window(git_repo):
+    first, second, third, fourth = build_history(git_repo)
+    since = datetime(2024, 2, 20, tzinfo=timezone.utc)
+
+    assert baseline_point(git_repo.path, since).commit_hash == third
+    assert baseline_point(git_repo.path, datetime(2023, 1, 1, tzinfo=timezone.utc)) is None
+
+    with ExitStack() as stack:
+        records = pd.DataFrame(list(history_records(stack, "owner/repo", git_repo.path, None, since, 1, "git", 1,
+                                                    None, "snapshot", None, ParseMemo(), baseline=True)))
+
+    # requests não muda na janela, mas aparece pelo baseline
+    assert records[["Hash_Commit", "Dependencia", "Versao"]].values.tolist() == [
+        [third, "requests", "2.0"],
+        [fourth, "numpy", "1.20"],
+    ]
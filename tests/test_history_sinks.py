@@ -0,0 +1,152 @@
+import csv
+import json
+import sqlite3
+
+import pandas as pd
+import pytest
+
+from itdepends.columnar import REPORT_COLUMNS, find_result_file, load_history_columns
+from itdepends.history_sinks import (CsvSink, HistorySink, HistorySummary, NdjsonSink, OUTPUT_PARQUET, SqliteSink,
+                                     iter_frame_records, open_history_sink, stream_history)
+from itdepends.report import gerar_relatorio_dependencias
+
+RECORDS = [
+    {"Hash_Commit": "c1", "Data_Commit": "2024-01-01T10:00:00+00:00", "Dependencia": "requests", "Versao": "2.0"},
+    {"Hash_Commit": "c1", "Data_Commit": "2024-01-01T10:00:00+00:00", "Dependencia": "flask", "Versao": "1.0"},
+    {"Hash_Commit": "c2", "Data_Commit": "2024-02-01T10:00:00-03:00", "Dependencia": "requests", "Versao": "2.0"},
+    {"Hash_Commit": "c3", "Data_Commit": "2024-03-01T10:00:00+00:00", "Dependencia": "requests", "Versao": "2.10"},
+    {"Hash_Commit": "c4", "Data_Commit": "2024-04-01T10:00:00+00:00", "Dependencia": "requests", "Versao": "2.10"},
+]
+
+
+def grouped_summary(records):
+    # Mesmo groupby de gerar_relatorio_dependencias
+    df = pd.DataFrame(records)
+    df["Data_Commit"] = pd.to_datetime(df["Data_Commit"], format="mixed", utc=True)
+    return (
+        df.sort_values(["Dependencia", "Data_Commit"])
+        .groupby("Dependencia")
+        .agg(
+            primeira_versao=("Versao", "first"),
+            ultima_versao=("Versao", "last"),
+            primeiro_commit=("Data_Commit", "min"),
+            ultimo_commit=("Data_Commit", "max"),
+            qtd_versoes=("Versao", "nunique"),
+            qtd_commits=("Hash_Commit", "nunique"),
+        )
+        .reset_index()
+    )
+
+
+def test_one_pass_summary_matches_report_groupby():
+    summary = HistorySummary()
+    stream_history(iter(RECORDS), [summary])
+
+    result = summary.to_frame()
+    expected = grouped_summary(RECORDS)
+
+    pd.testing.assert_frame_equal(result, expected, check_dtype=False)
+    assert (summary.total_commits, summary.total_dependencies) == (4, 2)
+
+
+def test_summary_timeline_keeps_only_version_changes_and_last_point():
+    summary = HistorySummary()
+    stream_history(iter(RECORDS), [summary])
+
+    timeline = summary.timeline()
+    requests = timeline[timeline["Dependencia"] == "requests"]
+
+    assert requests["Hash_Commit"].tolist() == ["c1", "c3", "c4"]
+
+
+def test_summary_ignores_records_without_version():
+    summary = HistorySummary()
+    summary.write({"Hash_Commit": "c9", "Data_Commit": "2024-01-01", "Dependencia": "x", "Versao": None})
+
+    assert summary.total_dependencies == 0
+
+
+def test_file_sinks_write_every_record(tmp_path):
+    paths = {"csv": tmp_path / "h.csv", "ndjson": tmp_path / "h.ndjson", "sqlite": tmp_path / "h.sqlite3"}
+
+    with CsvSink(str(paths["csv"])) as csv_sink, NdjsonSink(str(paths["ndjson"])) as ndjson_sink, \
+            SqliteSink(str(paths["sqlite"]), batch_size=2) as sqlite_sink:
+        count = stream_history(iter(RECORDS), [csv_sink, ndjson_sink, sqlite_sink])
+
+    assert count == len(RECORDS)
+
+    with open(paths["csv"], newline="") as f:
+        assert list(csv.DictReader(f)) == RECORDS
+
+    with open(paths["ndjson"]) as f:
+        assert [json.loads(line) for line in f] == RECORDS
+
+    with sqlite3.connect(paths["sqlite"]) as conn:
+        rows = conn.execute('SELECT Hash_Commit, Versao FROM history').fetchall()
+    assert rows == [(r["Hash_Commit"], r["Versao"]) for r in RECORDS]
+
+
+def test_csv_sink_with_fieldnames_writes_header_for_empty_stream(tmp_path):
+    path = tmp_path / "empty.csv"
+
+    with CsvSink(str(path), fieldnames=["a", "b"]):
+        pass
+
+    assert path.read_text().strip() == "a,b"
+
+
+def test_parquet_sink_round_trip(tmp_path):
+    pytest.importorskip("pyarrow")
+
+    sink, path = open_history_sink(OUTPUT_PARQUET, str(tmp_path / "history"))
+    with sink:
+        stream_history(iter(RECORDS), [sink])
+
+    assert pd.read_parquet(path)["Versao"].tolist() == [r["Versao"] for r in RECORDS]
+
+
+def test_report_renders_from_streamed_summary(tmp_path):
+    summary = HistorySummary()
+    stream_history(iter(RECORDS), [summary])
+    output = tmp_path / "report.html"
+
+    gerar_relatorio_dependencias(None, pd.DataFrame({"Nome": ["requests"]}), output_path=str(output),
+                                 resumo=summary)
+
+    assert "requests" in output.read_text(encoding="utf-8")
+
+
+@pytest.mark.parametrize("output_format", ["ndjson", "sqlite"])
+def test_saved_history_in_every_format_is_found_and_loaded(tmp_path, output_format):
+    records = RECORDS + [{"Hash_Commit": "c5", "Data_Commit": "2024-05-01T10:00:00+00:00",
+                          "Dependencia": "flask", "Versao": None}]
+    sink, path = open_history_sink(output_format, str(tmp_path / "history"))
+    with sink:
+        stream_history(iter(records), [sink])
+
+    assert find_result_file(str(tmp_path), "history") == path
+
+    df = load_history_columns(path)
+    assert list(df.columns) == REPORT_COLUMNS
+    assert df["Versao"].tolist()[:4] == ["2.0", "1.0", "2.0", "2.10"]
+    assert df["Versao"].isna().tolist() == [False] * 5 + [True]
+
+
+@pytest.mark.parametrize("output_format", ["ndjson", "sqlite"])
+def test_empty_saved_history_loads_as_empty_frame(tmp_path, output_format):
+    sink, path = open_history_sink(output_format, str(tmp_path / "history"))
+    with sink:
+        stream_history(iter([]), [sink])
+
+    assert load_history_columns(path).columns.tolist() == REPORT_COLUMNS
+
+
+def test_history_sink_requires_write():
+    with pytest.raises(TypeError):
+        HistorySink()
+
+
+def test_frame_records_match_to_dict():
+    df = pd.DataFrame(RECORDS)
+
+    assert list(iter_frame_records(df)) == df.to_dict("records")
@@ -0,0 +1,149 @@
+import os
+import time
+import pytest
+from unittest.mock import MagicMock
+
+from itdepends.integrations import GitHubClient, PyPiClient, ResponseCache
+from itdepends.integrations.http_cache import CacheEntry, cached_get
+
+
+# --------------------------------------------------------------------
+# Helpers
+# --------------------------------------------------------------------
+
+def make_response(status_code=200, json_data=None, headers=None):
+    resp = MagicMock()
+    resp.status_code = status_code
+    resp.json.return_value = json_data or {}
+    resp.headers = headers or {}
+    return resp
+
+
+class FakeSession:
+    """Sessão que devolve respostas pré-definidas e registra as chamadas."""
+    def __init__(self, *responses):
+        self.responses = list(responses)
+        self.calls = []
+
+    def get(self, url, headers=None):
+        self.calls.append((url, headers))
+        return self.responses.pop(0)
+
+
+# --------------------------------------------------------------------
+# Tests cached_get
+# --------------------------------------------------------------------
+
+def test_cached_get_stores_body_and_validators(tmp_path):
+    cache = ResponseCache(str(tmp_path), ttl=3600)
+    session = FakeSession(make_response(200, {"ok": True}, {"ETag": '"abc"', "Last-Modified": "Mon"}))
+
+    data, err = cached_get(session, "http://example.com/a", cache)
+
+    assert data == {"ok": True}
+    assert err is None
+
+    entry = cache.get("http://example.com/a")
+    assert entry.body == {"ok": True}
+    assert entry.etag == '"abc"'
+    assert entry.last_modified == "Mon"
+
+
+def test_cached_get_fresh_entry_skips_network(tmp_path):
+    cache = ResponseCache(str(tmp_path), ttl=3600)
+    cache.set("http://example.com/a", None, {"cached": 1}, etag='"abc"')
+    session = FakeSession()
+
+    data, err = cached_get(session, "http://example.com/a", cache)
+
+    assert data == {"cached": 1}
+    assert session.calls == []
+    assert cache.hits == 1
+
+
+def test_cached_get_revalidates_stale_entry_with_304(tmp_path):
+    cache = ResponseCache(str(tmp_path), ttl=0)
+    cache.set("http://example.com/a", None, {"cached": 1}, etag='"abc"')
+    session = FakeSession(make_response(304))
+
+    data, err = cached_get(session, "http://example.com/a", cache)
+
+    assert data == {"cached": 1}
+    assert err is None
+    assert session.calls[0][1] == {"If-None-Match": '"abc"'}
+    assert cache.revalidated == 1
+
+
+def test_cached_get_stale_entry_replaced_on_200(tmp_path):
+    cache = ResponseCache(str(tmp_path), ttl=10)
+    old = CacheEntry(url="http://example.com/a", body={"v": 1}, etag='"old"', stored_at=time.time() - 60)
+    cache._write(cache._entry_path("http://example.com/a", None), old)
+
+    session = FakeSession(make_response(200, {"v": 2}, {"ETag": '"new"'}))
+
+    data, err = cached_get(session, "http://example.com/a", cache)
+
+    assert data == {"v": 2}
+    assert cache.get("http://example.com/a").etag == '"new"'
+
+
+def test_cached_get_errors_are_not_cached(tmp_path):
+    cache = ResponseCache(str(tmp_path), ttl=3600)
+    session = FakeSession(make_response(404))
+
+    data, err = cached_get(session, "http://example.com/a", cache)
+
+    assert data is None
+    assert err == 404
+    assert cache.get("http://example.com/a") is None
+
+
+def test_cache_is_keyed_by_identity(tmp_path):
+    cache = ResponseCache(str(tmp_path), ttl=3600)
+    cache.set("http://example.com/a", "token-a", {"who": "a"})
+
+    assert cache.get("http://example.com/a", "token-a").body == {"who": "a"}
+    assert cache.get("http://example.com/a", "token-b") is None
+    assert cache.get("http://example.com/a") is None
+
+
+
+def test_concurrent_writes_of_the_same_entry(tmp_path):
+    from concurrent.futures import ThreadPoolExecutor
+
+    cache = ResponseCache(str(tmp_path), ttl=3600)
+
+    def write(i):
+        cache.set("http://example.com/a", None, {"n": i})
+
+    # Com um nome temporário por processo, um os.replace levava o arquivo do outro
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        list(executor.map(write, range(200)))
+
+    assert cache.get("http://example.com/a").body["n"] in range(200)
+    leftovers = [name for _, _, files in os.walk(tmp_path) for name in files if name.endswith(".tmp")]
+    assert leftovers == []
+
+# --------------------------------------------------------------------
+# Tests integração com os clientes
+# --------------------------------------------------------------------
+
+def test_github_client_identity_depends_on_token(tmp_path):
+    anonymous = GitHubClient(token=None, cache=ResponseCache(str(tmp_path)))
+    authenticated = GitHubClient(token="secret", cache=ResponseCache(str(tmp_path)))
+
+    assert authenticated.cache_identity is not None
+    assert "secret" not in authenticated.cache_identity
+    assert anonymous.cache_identity != authenticated.cache_identity
+
+
+def test_pypi_client_uses_cache(tmp_path, monkeypatch):
+    client = PyPiClient(cache=ResponseCache(str(tmp_path), ttl=3600))
+    responses = FakeSession(make_response(200, {"info": {}}, {"ETag": '"x"'}))
+    monkeypatch.setattr(client.session, "get", responses.get)
+
+    first, _ = client.do_safe_request("https://pypi.org/pypi/pkg/json")
+    second, _ = client.do_safe_request("https://pypi.org/pypi/pkg/json")
+
+    assert first == second == {"info": {}}
+    assert len(responses.calls) == 1
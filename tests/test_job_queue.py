@@ -0,0 +1,189 @@
+import sqlite3
+import threading
+import time
+
+from itdepends import job_queue
+from itdepends.job_queue import JobQueue, JOB_DONE, JOB_FAILED, JOB_PENDING, JOB_RUNNING, run_worker
+
+
+def test_enqueue_ignores_known_repositories_unless_requeued(tmp_path):
+    queue = JobQueue(str(tmp_path / "queue.sqlite3"))
+
+    assert queue.enqueue(["owner/a", "owner/b"]) == 2
+    assert queue.enqueue(["owner/a", "owner/c"]) == 1
+
+    job = queue.lease("w1")
+    queue.complete(job)
+
+    assert queue.enqueue([job.repo_name]) == 0
+    assert queue.enqueue([job.repo_name], requeue=True) == 1
+    assert queue.counts() == {JOB_PENDING: 3, JOB_RUNNING: 0, JOB_DONE: 0, JOB_FAILED: 0}
+
+
+def test_concurrent_workers_never_lease_the_same_job(tmp_path):
+    path = str(tmp_path / "queue.sqlite3")
+    JobQueue(path).enqueue([f"owner/repo{i}" for i in range(40)])
+    leased = []
+
+    def drain(worker):
+        # Uma conexão por worker, como processos diferentes no mesmo volume
+        queue = JobQueue(path)
+        while (job := queue.lease(worker)) is not None:
+            leased.append(job.repo_name)
+            queue.complete(job)
+
+    threads = [threading.Thread(target=drain, args=(f"w{i}",)) for i in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert sorted(leased) == sorted(f"owner/repo{i}" for i in range(40))
+    assert JobQueue(path).counts()[JOB_DONE] == 40
+
+
+def test_expired_lease_is_taken_over_and_stale_owner_cannot_complete(tmp_path):
+    queue = JobQueue(str(tmp_path / "queue.sqlite3"))
+    queue.enqueue(["owner/a"])
+
+    crashed = queue.lease("w1", lease_seconds=0.01)
+    time.sleep(0.05)
+    resumed = queue.lease("w2")
+
+    assert resumed.repo_name == "owner/a"
+    assert resumed.attempts == 2
+    assert not queue.heartbeat(crashed)
+    assert not queue.complete(crashed)
+    assert queue.complete(resumed)
+
+
+def test_failures_are_retried_until_max_attempts(tmp_path):
+    queue = JobQueue(str(tmp_path / "queue.sqlite3"), max_attempts=2, retry_delay=0)
+    queue.enqueue(["owner/a"])
+
+    queue.fail(queue.lease("w1"), "boom")
+    assert queue.counts()[JOB_PENDING] == 1
+
+    queue.fail(queue.lease("w1"), "boom again")
+    assert queue.lease("w1") is None
+    assert queue.failures() == [("owner/a", 2, "boom again")]
+
+
+def test_restarted_worker_releases_its_unfinished_jobs(tmp_path):
+    queue = JobQueue(str(tmp_path / "queue.sqlite3"))
+    queue.enqueue(["owner/a", "owner/b"])
+    queue.lease("host-1")
+
+    assert queue.release("host-1") == 1
+    assert queue.counts()[JOB_PENDING] == 2
+
+
+def test_run_worker_drains_queue(tmp_path, monkeypatch):
+    queue = JobQueue(str(tmp_path / "queue.sqlite3"), max_attempts=1)
+    queue.enqueue(["owner/a", "owner/broken", "owner/b"])
+    analyzed = []
+
+    def fake_run(repo_name, path, since_months, max_months, resources=None, **options):
+        analyzed.append(repo_name)
+        return 1 if repo_name == "owner/broken" else 0
+
+    monkeypatch.setattr(job_queue, "run", fake_run)
+
+    processed = run_worker(queue, 12, 12, worker_id="w1", exit_when_empty=True, cache_dir=None)
+
+    assert processed == 3
+    assert analyzed == ["owner/a", "owner/broken", "owner/b"]
+    assert queue.counts() == {JOB_PENDING: 0, JOB_RUNNING: 0, JOB_DONE: 2, JOB_FAILED: 1}
+
+
+def test_lease_keeper_survives_transient_database_errors(tmp_path, monkeypatch):
+    queue = JobQueue(str(tmp_path / "queue.sqlite3"))
+    queue.enqueue(["owner/a"])
+    job = queue.lease("w1", lease_seconds=0.3)
+
+    heartbeat = queue.heartbeat
+    calls = []
+
+    def flaky_heartbeat(job, lease_seconds):
+        calls.append(time.time())
+        if len(calls) == 1:
+            raise sqlite3.OperationalError("database is locked")
+        return heartbeat(job, lease_seconds)
+
+    monkeypatch.setattr(queue, "heartbeat", flaky_heartbeat)
+
+    with job_queue.LeaseKeeper(queue, job, lease_seconds=0.3) as keeper:
+        time.sleep(0.5)
+        assert keeper._thread.is_alive()
+
+    assert len(calls) >= 3
+    assert not keeper.lost
+    assert queue.complete(job)
+
+
+def test_lease_keeper_gives_up_after_repeated_errors(tmp_path, monkeypatch):
+    queue = JobQueue(str(tmp_path / "queue.sqlite3"))
+    queue.enqueue(["owner/a"])
+    job = queue.lease("w1", lease_seconds=0.15)
+
+    def locked(job, lease_seconds):
+        raise sqlite3.OperationalError("database is locked")
+
+    monkeypatch.setattr(queue, "heartbeat", locked)
+
+    with job_queue.LeaseKeeper(queue, job, lease_seconds=0.15) as keeper:
+        time.sleep(0.4)
+
+    assert keeper.lost
+
+
+def test_run_worker_reports_results_it_could_not_record(tmp_path, monkeypatch, capsys):
+    queue = JobQueue(str(tmp_path / "queue.sqlite3"))
+    queue.enqueue(["owner/a"])
+
+    def run_after_release(repo_name, path, since_months, max_months, resources=None, **options):
+        # O job voltou para a fila enquanto este worker analisava
+        queue.release("w1")
+        return 0
+
+    monkeypatch.setattr(job_queue, "run", run_after_release)
+
+    run_worker(queue, 12, 12, worker_id="w1", max_jobs=1, cache_dir=None)
+
+    assert "owner/a finished, but the job no longer belongs to this worker" in capsys.readouterr().err
+    assert queue.counts()[JOB_PENDING] == 1
+
+
+def test_run_worker_records_the_analysis_error(tmp_path, monkeypatch):
+    queue = JobQueue(str(tmp_path / "queue.sqlite3"), max_attempts=1)
+    queue.enqueue(["owner/a"])
+
+    def failing_run(repo_name, path, since_months, max_months, resources=None, timings=None, **options):
+        timings["error"] = "GitError: repository not found"
+        return 1
+
+    monkeypatch.setattr(job_queue, "run", failing_run)
+
+    run_worker(queue, 12, 12, worker_id="w1", max_jobs=1, cache_dir=None)
+
+    assert queue.failures() == [("owner/a", 1, "GitError: repository not found")]
+
+
+def test_run_worker_abandons_the_analysis_when_the_lease_is_lost(tmp_path, monkeypatch, capsys):
+    queue = JobQueue(str(tmp_path / "queue.sqlite3"))
+    queue.enqueue(["owner/a"])
+    monkeypatch.setattr(queue, "heartbeat", lambda job, lease_seconds: False)
+    cancelled = []
+
+    def long_run(repo_name, path, since_months, max_months, resources=None, cancel=None, **options):
+        cancelled.append(cancel.wait(timeout=5))
+        return 1
+
+    monkeypatch.setattr(job_queue, "run", long_run)
+
+    run_worker(queue, 12, 12, worker_id="w1", max_jobs=1, lease_seconds=0.15, cache_dir=None)
+
+    assert cancelled == [True]
+    assert "lease of owner/a was lost; analysis abandoned" in capsys.readouterr().err
+    # O resultado fica com o novo dono: o job não é concluído nem dado como falho por este worker
+    assert queue.counts()[JOB_RUNNING] == 1
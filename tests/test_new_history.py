@@ -201,22 +201,26 @@ def test_analyze_repository_stream_integration(mock_extract, tmp_path):
         }
     ])
 
-    df = analyze_repository_stream("repo/dummy", str(output_csv))
+    # O histórico gravado não é relido para montar o retorno
+    with patch("itdepends.new_history.pd.read_csv", side_effect=AssertionError("CSV re-read")):
+        count = analyze_repository_stream("repo/dummy", str(output_csv))
 
     assert os.path.exists(output_csv)
-    assert len(df) == 2 
+    assert count == 2
+    df = pd.read_csv(output_csv, encoding="utf-8-sig")
+    assert len(df) == 2
     assert df.iloc[0]["dep_name"] == "pandas"
     assert df.iloc[1]["dep_category"] == "dev"
 
 @patch("itdepends.new_history.extract_dependencies_from_commit")
 def test_analyze_repository_stream_empty(mock_extract, tmp_path):
-    """Se o repo não tiver nada, deve retornar DF vazio e não criar CSV inválido"""
+    """Se o repo não tiver nada, deve retornar zero registros e não criar CSV inválido"""
     output_csv = tmp_path / "empty.csv"
     mock_extract.return_value = iter([])
 
-    df = analyze_repository_stream("repo/empty", str(output_csv))
+    count = analyze_repository_stream("repo/empty", str(output_csv))
 
-    assert df.empty
+    assert count == 0
     assert os.path.exists(output_csv)
 
 @patch("itdepends.new_history.Repository")
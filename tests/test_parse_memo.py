@@ -0,0 +1,96 @@
+import pytest
+
+from itdepends.blob_cache import BlobCache, git_blob_sha
+from itdepends.git_history import analyze_repository_git_history
+from itdepends.parse_memo import ParseMemo
+from itdepends.parsers import parse_dependency_file
+
+
+class CountingParser:
+    def __init__(self):
+        self.calls = 0
+
+    def __call__(self, filename, content):
+        self.calls += 1
+        return parse_dependency_file(filename, content)
+
+
+def test_same_blob_is_parsed_once_per_filename():
+    memo = ParseMemo()
+    parser = CountingParser()
+
+    first = memo.parse("requirements.txt", "requests==2.0\n", parser)
+    again = memo.parse("requirements.txt", "requests==2.0\n", parser)
+    other_name = memo.parse("dev-requirements.txt", "requests==2.0\n", parser)
+
+    assert parser.calls == 2
+    assert [dep.name for dep in again] == [dep.name for dep in first] == ["requests"]
+    assert len(other_name) == 1
+    assert (memo.hits, memo.misses) == (1, 2)
+
+
+def test_parser_errors_are_not_memoized():
+    memo = ParseMemo()
+
+    def broken(filename, content):
+        raise ValueError("boom")
+
+    with pytest.raises(ValueError):
+        memo.parse("requirements.txt", "a==1\n", broken)
+
+    assert memo.parse("requirements.txt", "a==1\n", parse_dependency_file)[0].name == "a"
+
+
+def test_store_reuses_parses_across_runs(tmp_path):
+    store = BlobCache(str(tmp_path / "blobs"))
+    content = "flask>=1.0\n"
+    ParseMemo(store).parse("requirements.txt", content, parse_dependency_file)
+
+    parser = CountingParser()
+    memo = ParseMemo(BlobCache(str(tmp_path / "blobs")))
+    deps = memo.parse("requirements.txt", content, parser, sha=git_blob_sha(content.encode()))
+
+    assert parser.calls == 0
+    assert deps[0].name == "flask"
+    assert memo.hits == 1
+
+
+def test_history_walk_reuses_reverted_manifests(git_repo):
+    git_repo.commit({"requirements.txt": "requests==2.0\n"})
+    git_repo.commit({"requirements.txt": "requests==2.1\n"}, date="2024-02-01T12:00:00+00:00")
+    git_repo.commit({"requirements.txt": "requests==2.0\n"}, date="2024-03-01T12:00:00+00:00")
+
+    memo = ParseMemo()
+    df = analyze_repository_git_history(git_repo.path, "owner/repo", parse_memo=memo)
+
+    assert df["Versao"].tolist() == ["2.0", "2.1", "2.0"]
+    assert (memo.hits, memo.misses) == (1, 2)
+
+
+def test_memory_holds_at_most_max_entries():
+    memo = ParseMemo(max_entries=2)
+    parser = CountingParser()
+
+    memo.parse("requirements.txt", "a==1\n", parser)
+    memo.parse("requirements.txt", "b==1\n", parser)
+    memo.parse("requirements.txt", "a==1\n", parser)
+    memo.parse("requirements.txt", "c==1\n", parser)
+
+    assert len(memo._parsed) == 2
+    # "b" foi o menos usado e saiu; "a" continua no memo
+    memo.parse("requirements.txt", "a==1\n", parser)
+    memo.parse("requirements.txt", "b==1\n", parser)
+    assert parser.calls == 4
+
+
+def test_views_count_only_their_own_parses():
+    memo = ParseMemo()
+    first, second = memo.view(), memo.view()
+
+    first.parse("requirements.txt", "a==1\n", parse_dependency_file)
+    second.parse("requirements.txt", "a==1\n", parse_dependency_file)
+    second.parse("requirements.txt", "b==1\n", parse_dependency_file)
+
+    assert (first.hits, first.misses) == (0, 1)
+    assert (second.hits, second.misses) == (1, 1)
+    assert (memo.hits, memo.misses) == (1, 2)
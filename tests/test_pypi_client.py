@@ -182,4 +182,111 @@ def test_get_github_repo_network_error(monkeypatch):
     ok, err = client.get_github_repo_name("mypkg")
 
     assert ok is False
-    assert err == "timeout"
\ No newline at end of file
+    assert err == "timeout"
+
+
+# ---------------------------
+# Tests get_project
+# ---------------------------
+
+def test_get_project_is_fetched_once_for_both_checks(monkeypatch):
+    client = PyPiClient()
+
+    mock_data = {
+        "info": {
+            "name": "mypkg",
+            "classifiers": ["Development Status :: 4 - Beta"],
+            "project_urls": {"Source": "https://github.com/owner/mypkg"}
+        }
+    }
+
+    calls = []
+    def fake_request(url):
+        calls.append(url)
+        return mock_data, None
+
+    monkeypatch.setattr(client, "do_safe_request", fake_request)
+
+    assert client.get_github_repo_name("mypkg") == (True, "owner/mypkg")
+    assert client.verify_development_status("mypkg") == (True, "4 - Beta")
+    assert len(calls) == 1
+
+
+def test_get_project_memo_is_scoped_to_the_client(monkeypatch):
+    first = PyPiClient()
+    second = PyPiClient()
+    calls = []
+
+    def fake_request(url):
+        calls.append(url)
+        return {"info": {"name": "My_Pkg"}}, None
+
+    monkeypatch.setattr(first, "do_safe_request", fake_request)
+    monkeypatch.setattr(second, "do_safe_request", fake_request)
+
+    project, _ = first.get_project("My_Pkg")
+    assert first.get_project("my-pkg")[0] is project
+
+    second.get_project("my-pkg")
+    assert len(calls) == 2
+
+
+def test_get_project_memo_expires_with_cache_ttl(tmp_path, monkeypatch):
+    from itdepends.integrations import ResponseCache
+
+    client = PyPiClient(cache=ResponseCache(str(tmp_path), ttl=60))
+    now = [0.0]
+    client.project_memo._clock = lambda: now[0]
+
+    calls = []
+    def fake_request(url):
+        calls.append(url)
+        return {"info": {"version": str(len(calls))}}, None
+
+    monkeypatch.setattr(client, "do_safe_request", fake_request)
+
+    client.get_project("mypkg")
+    now[0] = 59
+    client.get_project("mypkg")
+    now[0] = 61
+    client.get_project("mypkg")
+    assert len(calls) == 2
+
+    client.clear_project_cache()
+    client.get_project("mypkg")
+    assert len(calls) == 3
+
+
+def test_get_project_errors_are_not_memoized(monkeypatch):
+    client = PyPiClient()
+
+    monkeypatch.setattr(client, "do_safe_request", lambda url: (None, "timeout"))
+    assert client.get_project("mypkg") == (None, "timeout")
+
+    monkeypatch.setattr(client, "do_safe_request", lambda url: ({"info": {}}, None))
+    project, err = client.get_project("mypkg")
+
+    assert err is None
+    assert project.name == "mypkg"
+
+
+def test_get_project_concurrent_misses_share_one_request(monkeypatch):
+    import threading
+    from concurrent.futures import ThreadPoolExecutor
+
+    client = PyPiClient()
+    calls = []
+
+    def slow_request(url):
+        calls.append(url)
+        # Segura a busca até as demais threads chegarem ao memo vazio
+        threading.Event().wait(0.2)
+        return {"info": {"name": "my-pkg"}}, None
+
+    monkeypatch.setattr(client, "do_safe_request", slow_request)
+
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        results = list(executor.map(client.get_project, ["my-pkg", "My_Pkg", "MY.PKG", "my-pkg"]))
+
+    assert len(calls) == 1
+    assert all(project is results[0][0] for project, _ in results)
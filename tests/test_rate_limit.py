@@ -0,0 +1,186 @@
+import pytest
+from unittest.mock import MagicMock
+
+from itdepends.integrations import GitHubClient
+from itdepends.integrations.rate_limit import RESOURCE_GRAPHQL, RateLimitScheduler, parse_tokens
+
+
+# --------------------------------------------------------------------
+# Helpers
+# --------------------------------------------------------------------
+
+class FakeClock:
+    def __init__(self, now=1000.0):
+        self.now = now
+        self.sleeps = []
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+def make_response(status_code=200, json_data=None, remaining=None, limit=5000, reset=None, retry_after=None,
+                  resource=None):
+    resp = MagicMock()
+    resp.status_code = status_code
+    resp.json.return_value = json_data or {}
+    resp.headers = {}
+    if resource is not None:
+        resp.headers["X-RateLimit-Resource"] = resource
+    if remaining is not None:
+        resp.headers["X-RateLimit-Remaining"] = str(remaining)
+        resp.headers["X-RateLimit-Limit"] = str(limit)
+    if reset is not None:
+        resp.headers["X-RateLimit-Reset"] = str(reset)
+    if retry_after is not None:
+        resp.headers["Retry-After"] = str(retry_after)
+    return resp
+
+
+def make_scheduler(tokens, clock):
+    return RateLimitScheduler(tokens, clock=clock, sleep=clock.sleep)
+
+
+# --------------------------------------------------------------------
+# Tests RateLimitScheduler
+# --------------------------------------------------------------------
+
+def test_parse_tokens_accepts_comma_separated_list():
+    assert parse_tokens("a, b,,c") == ["a", "b", "c"]
+    assert parse_tokens(None) == []
+
+
+def test_acquire_prefers_token_with_most_quota():
+    clock = FakeClock()
+    scheduler = make_scheduler(["tok-a", "tok-b"], clock)
+
+    quota_a, quota_b = scheduler.quotas
+    scheduler.update(quota_a, make_response(remaining=10, reset=2000))
+    scheduler.update(quota_b, make_response(remaining=4000, reset=2000))
+
+    assert scheduler.acquire() is quota_b
+    assert quota_b.remaining == 3999
+
+
+def test_exhausted_token_is_skipped_without_sleeping():
+    clock = FakeClock()
+    scheduler = make_scheduler(["tok-a", "tok-b"], clock)
+
+    quota_a, quota_b = scheduler.quotas
+    limited = scheduler.update(quota_a, make_response(403, remaining=0, reset=5000))
+    scheduler.update(quota_b, make_response(remaining=1, reset=5000))
+
+    assert limited is True
+    assert scheduler.acquire() is quota_b
+    assert clock.sleeps == []
+
+
+def test_sleeps_until_reset_only_when_every_token_is_exhausted():
+    clock = FakeClock()
+    scheduler = make_scheduler(["tok-a", "tok-b"], clock)
+
+    quota_a, quota_b = scheduler.quotas
+    scheduler.update(quota_a, make_response(403, remaining=0, reset=1300))
+    scheduler.update(quota_b, make_response(403, remaining=0, reset=1100))
+
+    assert scheduler.acquire() is quota_b
+    assert clock.sleeps == [100]
+
+
+def test_retry_after_blocks_token():
+    clock = FakeClock()
+    scheduler = make_scheduler(["tok-a"], clock)
+
+    quota = scheduler.quotas[0]
+    assert scheduler.update(quota, make_response(429, retry_after=30)) is True
+
+    scheduler.acquire()
+    assert clock.sleeps == [30]
+
+
+def test_low_quota_paces_requests_until_reset():
+    clock = FakeClock()
+    scheduler = make_scheduler(["tok-a"], clock)
+
+    quota = scheduler.quotas[0]
+    scheduler.update(quota, make_response(remaining=11, limit=5000, reset=1100))
+
+    scheduler.acquire()
+    scheduler.acquire()
+
+    assert len(clock.sleeps) == 1
+    assert clock.sleeps[0] == pytest.approx(10)
+
+
+def test_status_masks_tokens():
+    scheduler = make_scheduler(["secret-token-1234"], FakeClock())
+    scheduler.acquire()
+
+    status = scheduler.status()
+
+    assert status[0]["token"] == "...1234"
+    assert status[0]["requests"] == 1
+
+
+def test_graphql_quota_is_tracked_apart_from_core():
+    clock = FakeClock()
+    scheduler = make_scheduler(["tok-a"], clock)
+    core = scheduler.quotas[0]
+    scheduler.update(core, make_response(remaining=100, reset=2000))
+
+    graphql = scheduler.acquire(RESOURCE_GRAPHQL)
+    scheduler.update(graphql, make_response(remaining=4000, reset=2000, resource="graphql"))
+
+    assert graphql is not core
+    assert (core.remaining, graphql.remaining) == (100, 4000)
+
+    # Um limite secundário do GraphQL faz esperar só as consultas GraphQL
+    assert scheduler.update(graphql, make_response(403, retry_after=60, resource="graphql")) is True
+    assert scheduler.acquire() is core
+    assert clock.sleeps == []
+
+    scheduler.acquire(RESOURCE_GRAPHQL)
+    assert clock.sleeps == [60]
+    assert scheduler.slept_seconds == 60
+
+
+def test_headers_of_another_resource_update_that_resource():
+    scheduler = make_scheduler(["tok-a"], FakeClock())
+    core = scheduler.acquire()
+
+    scheduler.update(core, make_response(remaining=29, limit=30, reset=2000, resource="search"))
+
+    assert core.remaining is None
+    search = [q for q in scheduler.status() if q["resource"] == "search"]
+    assert search[0]["remaining"] == 29
+
+
+# --------------------------------------------------------------------
+# Tests integração com GitHubClient
+# --------------------------------------------------------------------
+
+def test_github_client_rotates_token_after_rate_limit(monkeypatch):
+    client = GitHubClient(token="tok-aaaa,tok-bbbb")
+    client.scheduler = make_scheduler(client.tokens, FakeClock())
+
+    sent = []
+    responses = [
+        make_response(403, remaining=0, reset=5000),
+        make_response(200, {"archived": True}, remaining=4999, reset=5000),
+    ]
+
+    def fake_get(url, headers=None):
+        sent.append(headers["Authorization"])
+        return responses.pop(0)
+
+    monkeypatch.setattr(client.session, "get", fake_get)
+
+    info = client.get_repo_info("owner/repo")
+
+    assert info.archived is True
+    assert sent[0] != sent[1]
+    assert "Authorization" not in client.session.headers
+    assert [q["rate_limited"] for q in client.rate_limit_status()].count(1) == 1
@@ -0,0 +1,116 @@
+import json
+import pytest
+import pandas as pd
+from unittest.mock import MagicMock
+
+from itdepends.deprecation import DEPRECATION_COLUMNS, offline_deprecation_analysis
+from itdepends.integrations import GitHubClient, ResponseCache
+from itdepends.snapshot import SnapshotDB
+
+
+@pytest.fixture
+def snapshot(tmp_path):
+    db = SnapshotDB(str(tmp_path / "snapshot.sqlite3"))
+    yield db
+    db.close()
+
+
+def write_dump(path, records):
+    with open(path, "w", encoding="utf-8") as f:
+        for record in records:
+            f.write(json.dumps(record) + "\n")
+
+
+# --------------------------------------------------------------------
+# Tests import / export
+# --------------------------------------------------------------------
+
+def test_import_dump(snapshot, tmp_path):
+    dump = tmp_path / "dump.jsonl"
+    write_dump(dump, [
+        {"name": "Requests", "github_repo": "psf/requests", "development_status": "5 - Production/Stable",
+         "archived": False, "pushed_at": "2024-05-01T10:00:00Z"},
+        {"name": "nourl", "github_repo": None},
+    ])
+
+    assert snapshot.import_dump(str(dump)) == 2
+
+    assert snapshot.get_package("requests") == ("psf/requests", "5 - Production/Stable", True)
+    assert snapshot.get_package("nourl") == (None, None, False)
+    assert snapshot.get_package("unknown") is None
+
+    info = snapshot.get_repo("PSF/Requests")
+    assert info.exists is True
+    assert info.pushed_at == "2024-05-01T10:00:00Z"
+
+
+def test_export_from_cache(snapshot, tmp_path):
+    cache = ResponseCache(str(tmp_path / "http"))
+    cache.set("https://pypi.org/pypi/flask/json", None, {"info": {
+        "classifiers": ["Development Status :: 5 - Production/Stable"],
+        "project_urls": {"Source": "https://github.com/pallets/flask"},
+    }})
+    cache.set("https://api.github.com/repos/pallets/flask", "abc", {
+        "archived": True, "pushed_at": "2020-01-01T00:00:00Z", "default_branch": "main",
+    })
+    cache.set("https://api.github.com/repos/pallets/flask/git/trees/main?recursive=1", None, {"tree": []})
+
+    assert snapshot.export_from_cache(cache) == (1, 1)
+
+    assert snapshot.get_package("flask") == ("pallets/flask", "5 - Production/Stable", True)
+    assert snapshot.get_repo("pallets/flask").archived is True
+
+
+
+def test_export_from_cache_after_graphql_run(snapshot, tmp_path, monkeypatch):
+    cache = ResponseCache(str(tmp_path / "http"))
+    gh = GitHubClient(token="test-token", cache=cache)
+
+    response = MagicMock(status_code=200, headers={})
+    response.json.return_value = {"data": {"r0": {
+        "isArchived": True, "pushedAt": "2020-01-01T00:00:00Z", "defaultBranchRef": {"name": "main"},
+    }}}
+    monkeypatch.setattr(gh.session, "post", lambda url, json=None, headers=None: response)
+
+    gh.get_repo_info_batch(["pallets/flask"], fallback=False)
+
+    # O lote GraphQL não passa por repos/<owner>/<repo>, mas o export precisa encontrá-lo
+    assert snapshot.export_from_cache(cache) == (0, 1)
+
+    info = snapshot.get_repo("pallets/flask")
+    assert info.exists is True
+    assert info.archived is True
+    assert info.pushed_at == "2020-01-01T00:00:00Z"
+    assert info.default_branch == "main"
+
+# --------------------------------------------------------------------
+# Tests análise offline
+# --------------------------------------------------------------------
+
+def test_offline_deprecation_analysis(snapshot, tmp_path, git_repo):
+    dump = tmp_path / "dump.jsonl"
+    write_dump(dump, [
+        {"name": "requests", "github_repo": "psf/requests", "development_status": "5 - Production/Stable",
+         "archived": False, "pushed_at": "2099-01-01T00:00:00Z"},
+        {"name": "oldlib", "github_repo": "someone/oldlib", "development_status": "7 - Inactive",
+         "archived": True, "pushed_at": "2015-01-01T00:00:00Z"},
+    ])
+    snapshot.import_dump(str(dump))
+
+    git_repo.commit({
+        "requirements.txt": "requests==2.0\noldlib\n",
+        "sub/pyproject.toml": '[project]\ndependencies = ["unknown-pkg"]\n',
+    })
+
+    df = offline_deprecation_analysis(git_repo.path, 6, snapshot)
+
+    assert list(df.columns) == DEPRECATION_COLUMNS
+    rows = df.set_index("Nome")
+
+    assert set(rows.index) == {"requests", "oldlib", "unknown-pkg"}
+    assert rows.loc["requests", "Github_encontrado"] == "psf/requests"
+    assert not rows.loc["requests", "Inativo"]
+    assert rows.loc["oldlib", "Arquivado"]
+    assert rows.loc["oldlib", "Inativo"]
+    assert pd.isna(rows.loc["unknown-pkg", "Github_encontrado"])
+    assert rows.loc["unknown-pkg", "Status (PyPi)"] == False